@@ -15,6 +15,27 @@ class Settings:
     # ==================== CONFIGURACIÓN DE HUBSPOT ====================
     HUBSPOT_TOKEN: str = os.getenv('HUBSPOT_TOKEN', '')
     HUBSPOT_API_BASE_URL: str = 'https://api.hubapi.com'
+    # Tasa inicial del limitador (se ajusta con los headers X-HubSpot-RateLimit-*)
+    HUBSPOT_RATE_LIMIT_PER_SECOND: float = float(os.getenv('HUBSPOT_RATE_LIMIT_PER_SECOND', '10'))
+    # La API de búsqueda tiene un límite propio (~5 req/s) y no devuelve headers
+    HUBSPOT_SEARCH_RATE_LIMIT_PER_SECOND: float = float(os.getenv('HUBSPOT_SEARCH_RATE_LIMIT_PER_SECOND', '4'))
+    # Resolución masiva de cédulas: 'search' (operador IN, 100 cédulas por búsqueda) o
+    # 'batch_read' (lectura por no__de_cedula como propiedad única, límite de tasa general)
+    HUBSPOT_CEDULA_LOOKUP: str = os.getenv('HUBSPOT_CEDULA_LOOKUP', 'search').strip().lower()
+    # Actualizaciones por /batch/update (hasta 100 contactos por llamada); false = una llamada por contacto
+    HUBSPOT_BATCH_UPDATE: bool = os.getenv('HUBSPOT_BATCH_UPDATE', 'true').lower() == 'true'
+    # Las actualizaciones (batch/update o por contacto) envían solo las propiedades que difieren
+    # del valor actual en HubSpot (leído con batch/read)
+    HUBSPOT_DIFF_UPDATES: bool = os.getenv('HUBSPOT_DIFF_UPDATES', 'true').lower() == 'true'
+    # Peticiones de escritura simultáneas (contactos individuales o lotes batch/*); 1 = secuencial
+    WRITER_MAX_WORKERS: int = int(os.getenv('WRITER_MAX_WORKERS', '4'))
+    # Reintentos ante 429/5xx (mismas variables que la lectura; respeta Retry-After)
+    HUBSPOT_MAX_RETRIES: int = int(os.getenv('HUBSPOT_MAX_RETRIES', '5'))
+    HUBSPOT_RETRY_BACKOFF: float = float(os.getenv('HUBSPOT_RETRY_BACKOFF', '1'))
+    HUBSPOT_RETRY_BUDGET: int = int(os.getenv('HUBSPOT_RETRY_BUDGET', '100'))
+    # run_full_sync.py: 'insert_update' (INSERT y luego UPDATE) o 'upsert' (batch/upsert por no__de_cedula;
+    # las filas solo de HB_INSERT con contacto existente se omiten, no se sobrescriben)
+    SYNC_WRITE_MODE: str = os.getenv('SYNC_WRITE_MODE', 'insert_update').strip().lower()
     
     # ==================== CONFIGURACIÓN DE SQL SERVER ====================
     SQL_SERVER: str = os.getenv('SQL_SERVER', '')
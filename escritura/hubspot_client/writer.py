@@ -2,8 +2,13 @@
 """
 Cliente para escribir datos en HubSpot usando la API oficial v3
 """
+import random
+import threading
 import time
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from hubspot import HubSpot
 from hubspot.crm.contacts import SimplePublicObjectInput, BatchInputSimplePublicObjectBatchInputForCreate
 from hubspot.crm.contacts.exceptions import ApiException
@@ -11,9 +16,43 @@ from hubspot.crm.contacts.exceptions import ApiException
 from config.settings import settings
 from utils.logger import get_logger
 from utils.security import validate_cedula, sanitize_string, mask_sensitive_data
+from utils.rate_limiter import get_rate_limiter, DEFAULT_BUCKET, SEARCH_BUCKET
 from .field_mapper import HubSpotFieldMapper
 from .field_mapper_insert import HubSpotInsertFieldMapper
 
+# Entradas por llamada de batch/read y valores por filtro IN de la búsqueda
+BATCH_READ_SIZE = 100
+
+# Mensaje de las actualizaciones omitidas por no tener cambios (process_updates las cuenta aparte)
+UNCHANGED_MESSAGE = "Sin cambios en HubSpot (no se envía)"
+
+# 429 (límite de tasa) y 5xx transitorios se reintentan; el resto de errores no
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_BACKOFF_MAX = 60.0
+
+
+def _retry_delay(attempt: int, headers: Optional[Any] = None) -> float:
+    """
+    Segundos a esperar antes del reintento número `attempt` (1, 2, ...)
+
+    Respeta Retry-After si HubSpot lo envía (segundos o fecha HTTP); si no,
+    usa backoff exponencial con jitter para no sincronizar hilos concurrentes.
+    """
+    retry_after = headers.get('Retry-After') if headers else None
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_BACKOFF_MAX)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                return min(max(delay, 0.0), RETRY_BACKOFF_MAX)
+            except (TypeError, ValueError):
+                pass
+
+    backoff = min(settings.HUBSPOT_RETRY_BACKOFF * (2 ** (attempt - 1)), RETRY_BACKOFF_MAX)
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
 class HubSpotWriter:
     """Cliente para escribir contactos en HubSpot"""
 
@@ -24,10 +63,76 @@ class HubSpotWriter:
         self.insert_field_mapper = HubSpotInsertFieldMapper()  # Para INSERT
         self.batch_size = min(settings.BATCH_SIZE, 100)  # HubSpot limita a 100 por batch
         self.dry_run = dry_run  # Modo de prueba sin escribir datos
+        # Peticiones simultáneas a HubSpot (todas comparten el limitador de tasa)
+        self.max_workers = max(1, settings.WRITER_MAX_WORKERS)
+        # Reintentos ante 429/5xx usados en esta ejecución (acotados por HUBSPOT_RETRY_BUDGET)
+        self.retries_used = 0
+        self._retry_lock = threading.Lock()
+        # Cédula → ID de contacto resuelto en esta ejecución (resolve_contact_ids_by_cedula)
+        self.contact_ids_by_cedula: Dict[str, Optional[str]] = {}
+        # Limitador compartido: reemplaza las pausas fijas entre peticiones
+        self.rate_limiter = get_rate_limiter(
+            settings.HUBSPOT_RATE_LIMIT_PER_SECOND,
+            settings.HUBSPOT_SEARCH_RATE_LIMIT_PER_SECOND
+        )
 
         if self.dry_run:
             self.logger.info("🧪 MODO DRY-RUN ACTIVADO - No se escribirán datos reales")
 
+    def _take_retry_budget(self) -> bool:
+        """Consume un reintento del presupuesto de la ejecución; False si está agotado"""
+        with self._retry_lock:
+            if self.retries_used >= settings.HUBSPOT_RETRY_BUDGET:
+                return False
+            self.retries_used += 1
+            return True
+
+    def _call_api(self, api, method: str, bucket: str = DEFAULT_BUCKET, **kwargs):
+        """
+        Ejecuta una llamada del SDK de HubSpot respetando el limitador de tasa
+
+        Espera un turno en el bucket indicado y, tras la respuesta (o el error),
+        ajusta el limitador con los headers X-HubSpot-RateLimit-* de esa misma
+        respuesta (método *_with_http_info del SDK; api_client.last_response
+        se comparte entre hilos). Los 429 y 5xx se reintentan hasta
+        HUBSPOT_MAX_RETRIES veces respetando Retry-After, mientras quede
+        presupuesto de reintentos (HUBSPOT_RETRY_BUDGET).
+
+        Args:
+            api: API del SDK (ej: crm.contacts.basic_api)
+            method: Nombre del método a invocar (ej: 'update')
+            bucket: Bucket del limitador ('default' o 'search')
+            **kwargs: Argumentos del método
+
+        Returns:
+            Respuesta del SDK
+
+        Raises:
+            ApiException: Errores no reintentables o que persisten tras los reintentos
+        """
+        call = getattr(api, f"{method}_with_http_info")
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(bucket)
+            try:
+                response, _, headers = call(**kwargs)
+            except ApiException as e:
+                self.rate_limiter.update_from_headers(e.headers)
+                if e.status not in RETRY_STATUS_CODES:
+                    raise
+                attempt += 1
+                if attempt > settings.HUBSPOT_MAX_RETRIES or not self._take_retry_budget():
+                    raise
+                delay = _retry_delay(attempt, e.headers)
+                self.logger.warning(
+                    f"🔁 HTTP {e.status} en {method}, reintento {attempt}/{settings.HUBSPOT_MAX_RETRIES} en {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+
+            self.rate_limiter.update_from_headers(headers)
+            return response
+
     def test_connection(self) -> bool:
         """
         Prueba la conexión con HubSpot
@@ -39,7 +144,7 @@ class HubSpotWriter:
             self.logger.info("🧪 Probando conexión con HubSpot...")
 
             # Intentar obtener información básica de la cuenta
-            response = self.hubspot_client.crm.contacts.basic_api.get_page(limit=1)
+            response = self._call_api(self.hubspot_client.crm.contacts.basic_api, 'get_page', limit=1)
 
             self.logger.info("✅ Conexión con HubSpot exitosa")
             return True
@@ -103,7 +208,8 @@ class HubSpotWriter:
                 "limit": 1
             }
 
-            response = self.hubspot_client.crm.contacts.search_api.do_search(
+            response = self._call_api(
+                self.hubspot_client.crm.contacts.search_api, 'do_search', bucket=SEARCH_BUCKET,
                 public_object_search_request=search_request
             )
 
@@ -193,7 +299,8 @@ class HubSpotWriter:
             )
 
             # Ejecutar búsqueda
-            search_response = self.hubspot_client.crm.contacts.search_api.do_search(
+            search_response = self._call_api(
+                self.hubspot_client.crm.contacts.search_api, 'do_search', bucket=SEARCH_BUCKET,
                 public_object_search_request=search_request
             )
 
@@ -209,6 +316,245 @@ class HubSpotWriter:
             self.logger.error(f"Error buscando contacto por cédula {cedula}: {e}")
             return None
 
+    def run_concurrently(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Aplica fn a cada elemento con hasta max_workers peticiones en curso
+
+        Los resultados se devuelven en el orden de items (no en el orden en
+        que terminan), de modo que el reporte por registro es determinista.
+        El ritmo real lo fija el limitador de tasa compartido.
+
+        Args:
+            fn: Función a aplicar; debe capturar sus propios errores por registro
+            items: Elementos a procesar
+
+        Returns:
+            Lista de resultados de fn en el mismo orden que items
+        """
+        workers = min(self.max_workers, len(items))
+        if workers <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hubspot-writer") as executor:
+            return list(executor.map(fn, items))
+
+    def group_rows_by_cedula(self, rows: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Agrupa las posiciones de las filas por cédula, en orden de primera aparición
+
+        Las filas de una misma cédula se procesan juntas y en orden dentro de
+        un grupo; los grupos pueden ir en paralelo sin escribir dos veces el
+        mismo contacto al mismo tiempo.
+
+        Args:
+            rows: Filas de SQL Server
+
+        Returns:
+            Lista de grupos de posiciones
+        """
+        groups: Dict[Any, List[int]] = {}
+        for index, row in enumerate(rows):
+            cedula = self.normalize_cedula(row.get('no__de_cedula')) if isinstance(row, dict) else None
+            # Filas sin cédula válida: grupo propio (solo se registran como inválidas)
+            groups.setdefault(cedula or ('invalid', index), []).append(index)
+        return list(groups.values())
+
+    def run_grouped(self, fn: Callable[[Dict[str, Any]], Any], rows: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Procesa filas en paralelo por grupos de cédula y devuelve los resultados en el orden de rows
+        """
+        results: List[Any] = [None] * len(rows)
+
+        def process_group(group: List[int]) -> None:
+            for index in group:
+                results[index] = fn(rows[index])
+
+        self.run_concurrently(process_group, self.group_rows_by_cedula(rows))
+        return results
+
+    def normalize_cedula(self, cedula: Any) -> Optional[str]:
+        """
+        Sanitiza y valida una cédula con el mismo criterio que las búsquedas
+
+        Args:
+            cedula: Cédula tal como viene de SQL Server
+
+        Returns:
+            Cédula sanitizada o None si es inválida
+        """
+        if not cedula:
+            return None
+        cedula_clean = sanitize_string(str(cedula), max_length=20)
+        if not cedula_clean or not validate_cedula(cedula_clean):
+            return None
+        return cedula_clean
+
+    def resolve_contact_ids_by_cedula(self, cedulas: List[Any]) -> Dict[str, str]:
+        """
+        Resuelve muchas cédulas a IDs de contacto con pocas llamadas a HubSpot
+
+        Reemplaza una búsqueda por fila (find_contact_by_cedula) por una
+        búsqueda con operador IN de hasta 100 cédulas, o por batch/read con
+        idProperty=no__de_cedula (settings.HUBSPOT_CEDULA_LOOKUP), pidiendo
+        solo la propiedad no__de_cedula. Los resultados quedan en
+        contact_ids_by_cedula para toda la ejecución: las cédulas ya
+        resueltas (encontradas o no) no se vuelven a consultar.
+
+        Args:
+            cedulas: Cédulas a resolver (se sanitizan, validan y deduplican)
+
+        Returns:
+            Diccionario cédula sanitizada → ID de contacto (solo las encontradas)
+        """
+        # Cédulas por resolver sin repetir, en orden de aparición (dict para búsquedas O(1))
+        pending_cedulas: Dict[str, None] = {}
+        invalid = 0
+        for cedula in cedulas:
+            cedula_clean = self.normalize_cedula(cedula)
+            if not cedula_clean:
+                invalid += 1
+            elif cedula_clean not in self.contact_ids_by_cedula:
+                pending_cedulas.setdefault(cedula_clean)
+        pending = list(pending_cedulas)
+
+        if invalid:
+            self.logger.warning(f"⚠️ {invalid} cédulas inválidas o vacías omitidas de la resolución")
+
+        if pending and self.dry_run:
+            self.logger.info(f"🧪 [DRY-RUN] Resolución simulada de {len(pending)} cédulas (sin contactos existentes)")
+            self.contact_ids_by_cedula.update({cedula: None for cedula in pending})
+            pending = []
+
+        if pending:
+            use_batch_read = settings.HUBSPOT_CEDULA_LOOKUP == 'batch_read'
+            chunks = [pending[i:i + BATCH_READ_SIZE] for i in range(0, len(pending), BATCH_READ_SIZE)]
+            self.logger.info(
+                f"🔍 Resolviendo {len(pending)} cédulas en {len(chunks)} llamadas "
+                f"({'batch/read' if use_batch_read else 'búsqueda IN'})"
+            )
+            failed = 0
+            for chunk in chunks:
+                try:
+                    found = self._read_contacts_by_cedula(chunk) if use_batch_read else self._search_contacts_by_cedula(chunk)
+                except Exception as e:
+                    # Sin resolver: get_contact_id_by_cedula las busca una a una
+                    failed += len(chunk)
+                    self.logger.error(f"❌ Error resolviendo un lote de {len(chunk)} cédulas: {e}")
+                    continue
+                for cedula in chunk:
+                    self.contact_ids_by_cedula[cedula] = found.get(cedula)
+
+            resolved = sum(1 for cedula in pending if self.contact_ids_by_cedula.get(cedula))
+            self.logger.info(
+                f"✅ Cédulas resueltas: {resolved} encontradas, "
+                f"{len(pending) - resolved - failed} sin contacto, {failed} pendientes por error"
+            )
+
+        return {
+            cedula: contact_id
+            for cedula, contact_id in self.contact_ids_by_cedula.items()
+            if contact_id
+        }
+
+    def get_contact_id_by_cedula(self, cedula: Any) -> Optional[str]:
+        """
+        ID del contacto de una cédula usando el mapa resuelto en bloque
+
+        Las cédulas que no pasaron por resolve_contact_ids_by_cedula (o cuyo
+        lote falló) se buscan individualmente con find_contact_by_cedula.
+
+        Args:
+            cedula: Número de cédula del contacto
+
+        Returns:
+            ID del contacto en HubSpot o None si no existe
+        """
+        cedula_clean = self.normalize_cedula(cedula)
+        if cedula_clean and cedula_clean in self.contact_ids_by_cedula:
+            return self.contact_ids_by_cedula[cedula_clean]
+
+        contact = self.find_contact_by_cedula(cedula_clean or str(cedula))
+        if contact and cedula_clean:
+            self.contact_ids_by_cedula[cedula_clean] = contact.id
+        return contact.id if contact else None
+
+    def _search_contacts_by_cedula(self, cedulas: List[str]) -> Dict[str, str]:
+        """
+        Busca hasta 100 cédulas en una búsqueda con operador IN (paginando si hay más resultados)
+
+        Args:
+            cedulas: Cédulas ya sanitizadas
+
+        Returns:
+            Diccionario cédula → ID de contacto de las encontradas
+
+        Raises:
+            ApiException: Si la búsqueda falla; se propaga para no tratar
+                contactos existentes como inexistentes
+        """
+        from hubspot.crm.contacts import PublicObjectSearchRequest, Filter, FilterGroup
+
+        found: Dict[str, str] = {}
+        after = None
+        while True:
+            search_request = PublicObjectSearchRequest(
+                filter_groups=[
+                    FilterGroup(filters=[
+                        Filter(property_name="no__de_cedula", operator="IN", values=cedulas)
+                    ])
+                ],
+                properties=["no__de_cedula"],
+                limit=BATCH_READ_SIZE,
+                after=after
+            )
+            response = self._call_api(
+                self.hubspot_client.crm.contacts.search_api, 'do_search', bucket=SEARCH_BUCKET,
+                public_object_search_request=search_request
+            )
+
+            for contact in response.results or []:
+                cedula = (contact.properties or {}).get('no__de_cedula')
+                if cedula in found:
+                    self.logger.warning(f"⚠️ Cédula {mask_sensitive_data(cedula, visible_chars=2)} duplicada en HubSpot (IDs {found[cedula]}, {contact.id}); se usa la primera")
+                elif cedula:
+                    found[cedula] = contact.id
+
+            paging = getattr(response, 'paging', None)
+            next_page = getattr(paging, 'next', None) if paging else None
+            if not next_page or not next_page.after:
+                return found
+            after = next_page.after
+
+    def _read_contacts_by_cedula(self, cedulas: List[str]) -> Dict[str, str]:
+        """
+        Lee hasta 100 contactos por cédula con batch/read (idProperty=no__de_cedula)
+
+        Requiere que no__de_cedula sea una propiedad de valor único en HubSpot;
+        las cédulas sin contacto vuelven como errores de la respuesta multi-estado.
+
+        Args:
+            cedulas: Cédulas ya sanitizadas
+
+        Returns:
+            Diccionario cédula → ID de contacto de las encontradas
+        """
+        from hubspot.crm.contacts import BatchReadInputSimplePublicObjectId, SimplePublicObjectId
+
+        batch_read_input = BatchReadInputSimplePublicObjectId(
+            properties=["no__de_cedula"],
+            id_property="no__de_cedula",
+            inputs=[SimplePublicObjectId(id=cedula) for cedula in cedulas]
+        )
+        response = self._call_api(
+            self.hubspot_client.crm.contacts.batch_api, 'read',
+            batch_read_input_simple_public_object_id=batch_read_input,
+            archived=False
+        )
+        return {
+            (contact.properties or {}).get('no__de_cedula'): contact.id
+            for contact in response.results or []
+            if (contact.properties or {}).get('no__de_cedula')
+        }
+
     def create_contact(self, contact_data: Dict[str, Any]) -> Optional[str]:
         """
         Crea un nuevo contacto en HubSpot
@@ -248,7 +594,8 @@ class HubSpotWriter:
             simple_public_object_input = SimplePublicObjectInput(properties=hubspot_properties)
 
             # Crear contacto
-            response = self.hubspot_client.crm.contacts.basic_api.create(
+            response = self._call_api(
+                self.hubspot_client.crm.contacts.basic_api, 'create',
                 simple_public_object_input=simple_public_object_input
             )
 
@@ -321,7 +668,8 @@ class HubSpotWriter:
             simple_public_object_input = SimplePublicObjectInput(properties=hubspot_properties)
 
             # Actualizar contacto
-            response = self.hubspot_client.crm.contacts.basic_api.update(
+            response = self._call_api(
+                self.hubspot_client.crm.contacts.basic_api, 'update',
                 contact_id=contact_id,
                 simple_public_object_input=simple_public_object_input
             )
@@ -336,6 +684,384 @@ class HubSpotWriter:
             self.logger.error(f"❌ Error inesperado al actualizar contacto {contact_id}: {str(e)}")
             return False
 
+    def update_contacts_batch(self, updates: List[Tuple[str, Dict[str, Any]]],
+                              force_all_properties: bool = True) -> List[Tuple[bool, str]]:
+        """
+        Actualiza muchos contactos con /crm/v3/objects/contacts/batch/update
+
+        Envía hasta batch_size (máx. 100) contactos por llamada. Con una
+        respuesta multi-estado (207) solo los contactos ausentes de los
+        resultados quedan como fallidos; los exitosos no se reenvían. Si
+        HubSpot rechaza el lote completo por un error de validación (4xx),
+        el lote se divide en mitades hasta aislar los contactos inválidos.
+
+        Args:
+            updates: Pares (ID de contacto, propiedades ya mapeadas a HubSpot)
+            force_all_properties: Si True, fuerza la asignación de TODAS las propiedades personalizadas
+
+        Returns:
+            Lista (éxito, mensaje) en el mismo orden que updates
+        """
+        outcomes, pending = self._prepare_updates(updates, force_all_properties)
+        self._write_batches('update', pending, outcomes)
+        return outcomes
+
+    def update_contacts_individually(self, updates: List[Tuple[str, Dict[str, Any]]],
+                                     force_all_properties: bool = True) -> List[Tuple[bool, str]]:
+        """
+        Actualiza muchos contactos con una llamada basic/update por contacto
+
+        Misma preparación y detección de cambios que update_contacts_batch
+        (los valores actuales se leen en bloque con batch/read), pero cada
+        contacto se envía por separado, con hasta max_workers en paralelo y
+        las entradas de un mismo contacto en orden.
+
+        Args:
+            updates: Pares (ID de contacto, propiedades ya mapeadas a HubSpot)
+            force_all_properties: Si True, fuerza la asignación de TODAS las propiedades personalizadas
+
+        Returns:
+            Lista (éxito, mensaje) en el mismo orden que updates
+        """
+        outcomes, pending = self._prepare_updates(updates, force_all_properties)
+
+        def send(item: Tuple[int, str, Dict[str, Any]]) -> None:
+            index, contact_id, properties = item
+            # Las propiedades ya pasaron por _ensure_all_custom_properties y por la detección de cambios
+            if self.update_contact(contact_id, properties, already_mapped=True, force_all_properties=False):
+                outcomes[index] = (True, f"Contacto {contact_id} actualizado exitosamente")
+            else:
+                outcomes[index] = (False, f"Falló la actualización del contacto {contact_id}")
+
+        groups: Dict[str, List[Tuple[int, str, Dict[str, Any]]]] = {}
+        for item in pending:
+            groups.setdefault(item[1], []).append(item)
+        self.run_concurrently(lambda group: [send(item) for item in group], list(groups.values()))
+        return outcomes
+
+    def update_contacts(self, updates: List[Tuple[str, Dict[str, Any]]],
+                        force_all_properties: bool = True) -> List[Tuple[bool, str]]:
+        """
+        Actualiza muchos contactos con batch/update o, con HUBSPOT_BATCH_UPDATE=false, uno por uno
+
+        Returns:
+            Lista (éxito, mensaje) en el mismo orden que updates
+        """
+        if settings.HUBSPOT_BATCH_UPDATE:
+            return self.update_contacts_batch(updates, force_all_properties=force_all_properties)
+        return self.update_contacts_individually(updates, force_all_properties=force_all_properties)
+
+    def _prepare_updates(self, updates: List[Tuple[str, Dict[str, Any]]], force_all_properties: bool
+                         ) -> Tuple[List[Optional[Tuple[bool, str]]], List[Tuple[int, str, Dict[str, Any]]]]:
+        """
+        Valida las actualizaciones y, con HUBSPOT_DIFF_UPDATES, deja solo las propiedades que cambiaron
+
+        Args:
+            updates: Pares (ID de contacto, propiedades ya mapeadas a HubSpot)
+            force_all_properties: Si True, fuerza la asignación de TODAS las propiedades personalizadas
+
+        Returns:
+            Tupla (resultados por posición, completos para las entradas inválidas
+            o sin cambios; tuplas pendientes (posición, ID de contacto, propiedades))
+        """
+        outcomes: List[Optional[Tuple[bool, str]]] = [None] * len(updates)
+        pending: List[Tuple[int, str, Dict[str, Any]]] = []
+
+        for index, (contact_id, properties) in enumerate(updates):
+            contact_id = sanitize_string(str(contact_id), max_length=50) if contact_id else ''
+            if not contact_id or not isinstance(properties, dict):
+                outcomes[index] = (False, "Contact ID o propiedades inválidas")
+                continue
+            hubspot_properties = properties.copy()
+            if force_all_properties:
+                hubspot_properties = self._ensure_all_custom_properties(hubspot_properties)
+            pending.append((index, contact_id, hubspot_properties))
+
+        if settings.HUBSPOT_DIFF_UPDATES and pending and not self.dry_run:
+            pending = self._drop_unchanged_properties(pending, outcomes)
+        return outcomes, pending
+
+    def _drop_unchanged_properties(self, pending: List[Tuple[int, str, Dict[str, Any]]],
+                                   outcomes: List[Optional[Tuple]]) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Compara cada actualización con los valores actuales del contacto en HubSpot
+
+        Los contactos sin diferencias quedan como exitosos sin escribirse; el
+        resto conserva solo las propiedades que cambiaron. Los contactos cuyo
+        valor actual no se pudo leer se envían completos. Si un contacto
+        aparece varias veces, cada entrada se compara con el valor que dejan
+        las anteriores (la última prevalece, como al enviarlas en orden).
+
+        Args:
+            pending: Tuplas (posición en la entrada, ID de contacto, propiedades)
+            outcomes: Resultados por posición (se completan para los contactos sin cambios)
+
+        Returns:
+            Tuplas pendientes de envío con solo las propiedades modificadas
+        """
+        property_names = sorted({name for _, _, properties in pending for name in properties})
+        snapshot = self.read_contacts_snapshot([contact_id for _, contact_id, _ in pending], property_names)
+
+        changed_pending = []
+        sent_properties = 0
+        for index, contact_id, properties in pending:
+            if contact_id not in snapshot:
+                changed_pending.append((index, contact_id, properties))
+                sent_properties += len(properties)
+                continue
+            changes = self.changed_properties(snapshot[contact_id], properties)
+            snapshot[contact_id].update(properties)
+            if not changes:
+                outcomes[index] = (True, UNCHANGED_MESSAGE)
+                continue
+            changed_pending.append((index, contact_id, changes))
+            sent_properties += len(changes)
+
+        total_properties = sum(len(properties) for _, _, properties in pending)
+        self.logger.info(
+            f"🔎 Detección de cambios: {len(pending) - len(changed_pending)} contactos sin cambios, "
+            f"{len(changed_pending)} por actualizar ({sent_properties}/{total_properties} propiedades)"
+        )
+        return changed_pending
+
+    def read_contacts_snapshot(self, contact_ids: List[str], properties: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Lee los valores actuales de muchos contactos con batch/read (100 por llamada)
+
+        Args:
+            contact_ids: IDs de contacto en HubSpot
+            properties: Propiedades a leer
+
+        Returns:
+            Diccionario ID de contacto → propiedades actuales; los lotes que
+            fallan se omiten (sus contactos se actualizan sin comparar)
+        """
+        from hubspot.crm.contacts import BatchReadInputSimplePublicObjectId, SimplePublicObjectId
+
+        def read_chunk(chunk: List[str]) -> list:
+            batch_read_input = BatchReadInputSimplePublicObjectId(
+                properties=properties,
+                inputs=[SimplePublicObjectId(id=contact_id) for contact_id in chunk]
+            )
+            try:
+                response = self._call_api(
+                    self.hubspot_client.crm.contacts.batch_api, 'read',
+                    batch_read_input_simple_public_object_id=batch_read_input,
+                    archived=False
+                )
+            except Exception as e:
+                self.logger.warning(f"⚠️ No se pudieron leer los valores actuales de {len(chunk)} contactos: {e}")
+                return []
+            return response.results or []
+
+        unique_ids = list(dict.fromkeys(contact_ids))
+        chunks = [unique_ids[start:start + BATCH_READ_SIZE] for start in range(0, len(unique_ids), BATCH_READ_SIZE)]
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        for results in self.run_concurrently(read_chunk, chunks):
+            for contact in results:
+                snapshot[str(contact.id)] = contact.properties or {}
+        return snapshot
+
+    @staticmethod
+    def _comparable_value(value: Any) -> Any:
+        """
+        Normaliza un valor de propiedad para compararlo con el valor actual de HubSpot
+
+        Vacío y None son equivalentes; los booleanos se comparan sin
+        mayúsculas y los números por valor ('5' == '5.0').
+        """
+        if value is None:
+            return ''
+        text = str(value).strip()
+        if text.lower() in ('true', 'false'):
+            return text.lower()
+        if text[:1] in ('+', '0') and text[1:2].isdigit():
+            # Teléfonos y códigos con ceros a la izquierda se comparan como texto
+            return text
+        try:
+            number = Decimal(text)
+            if number.is_finite():
+                return number.normalize()
+        except InvalidOperation:
+            pass
+        return text
+
+    def changed_properties(self, current: Dict[str, Any], desired: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Propiedades de desired cuyo valor difiere del valor actual en HubSpot
+
+        Args:
+            current: Propiedades actuales del contacto (batch/read)
+            desired: Propiedades mapeadas desde SQL Server
+
+        Returns:
+            Subconjunto de desired que se debe enviar (vacío si no hay cambios)
+        """
+        return {
+            name: value
+            for name, value in desired.items()
+            if self._comparable_value(value) != self._comparable_value(current.get(name))
+        }
+
+    def upsert_contacts_batch(self, contacts: List[Dict[str, Any]]) -> List[Tuple[bool, str, bool]]:
+        """
+        Crea o actualiza muchos contactos con /crm/v3/objects/contacts/batch/upsert
+
+        Usa no__de_cedula (propiedad de valor único) como idProperty: HubSpot
+        crea el contacto si la cédula no existe y lo actualiza si existe, sin
+        búsqueda previa y sin carrera entre la verificación y la creación.
+        Mismo manejo de lotes y errores parciales que update_contacts_batch.
+
+        Args:
+            contacts: Propiedades ya mapeadas a HubSpot (deben incluir no__de_cedula)
+
+        Returns:
+            Lista (éxito, mensaje, creado) en el mismo orden que contacts;
+            creado es True si HubSpot creó el contacto en lugar de actualizarlo
+        """
+        outcomes: List[Optional[Tuple[bool, str, bool]]] = [None] * len(contacts)
+        pending: List[Tuple[int, str, Dict[str, Any]]] = []
+
+        for index, properties in enumerate(contacts):
+            cedula = self.normalize_cedula(properties.get('no__de_cedula')) if isinstance(properties, dict) else None
+            if not cedula:
+                outcomes[index] = (False, "Cédula inválida o faltante", False)
+                continue
+            hubspot_properties = properties.copy()
+            hubspot_properties['no__de_cedula'] = cedula
+            pending.append((index, cedula, hubspot_properties))
+
+        self._write_batches('upsert', pending, outcomes)
+        return outcomes
+
+    def _write_batches(self, operation: str, pending: List[Tuple[int, str, Dict[str, Any]]],
+                       outcomes: List[Optional[Tuple]]) -> None:
+        """
+        Divide los contactos en lotes de batch_size y los envía con batch/update o batch/upsert
+
+        Args:
+            operation: 'update' (clave = ID de contacto) o 'upsert' (clave = cédula)
+            pending: Tuplas (posición en la entrada, clave, propiedades)
+            outcomes: Resultados por posición (se completan en el lugar)
+        """
+        # HubSpot rechaza claves repetidas en un mismo lote: una clave repetida abre un lote nuevo
+        chunks: List[List[Tuple[int, str, Dict[str, Any]]]] = []
+        chunk_keys = set()
+        for item in pending:
+            if not chunks or len(chunks[-1]) >= self.batch_size or item[1] in chunk_keys:
+                chunks.append([])
+                chunk_keys = set()
+            chunks[-1].append(item)
+            chunk_keys.add(item[1])
+        # Una clave repetida en cualquier parte de la entrada (aunque caiga en lotes distintos)
+        repeated = len({key for _, key, _ in pending}) != len(pending)
+
+        if not chunks:
+            return
+        self.logger.info(f"🔄 Enviando {len(pending)} contactos en {len(chunks)} llamadas batch/{operation}")
+        if repeated:
+            # Con claves repetidas el orden entre lotes importa: se envían en secuencia
+            for chunk in chunks:
+                self._write_chunk(operation, chunk, outcomes)
+        else:
+            # Cada lote completa posiciones distintas de outcomes
+            self.run_concurrently(lambda chunk: self._write_chunk(operation, chunk, outcomes), chunks)
+
+    def _write_chunk(self, operation: str, chunk: List[Tuple[int, str, Dict[str, Any]]],
+                     outcomes: List[Optional[Tuple]]) -> None:
+        """
+        Envía un lote de batch/update o batch/upsert y registra el resultado de cada contacto
+
+        Cada entrada lleva su posición como objectWriteTraceId para asociar
+        resultados y errores de una respuesta multi-estado con su contacto.
+
+        Args:
+            operation: 'update' o 'upsert'
+            chunk: Tuplas (posición en la entrada, clave, propiedades)
+            outcomes: Resultados por posición (se completan en el lugar); con
+                upsert se agrega un tercer valor: True si el contacto fue creado
+        """
+        from hubspot.crm.contacts import (
+            BatchInputSimplePublicObjectBatchInput, SimplePublicObjectBatchInput,
+            BatchInputSimplePublicObjectBatchInputUpsert, SimplePublicObjectBatchInputUpsert
+        )
+
+        label = 'contacto' if operation == 'update' else 'cédula'
+        # Valor extra de cada resultado de upsert (creado); update no lo lleva
+        extra = (False,) if operation == 'upsert' else ()
+        if self.dry_run:
+            self.logger.info(f"🧪 [DRY-RUN] Lote batch/{operation} que se enviaría - Contactos: {len(chunk)}")
+            for index, key, _ in chunk:
+                outcomes[index] = (True, f"[DRY-RUN] {label.capitalize()} {key} se enviaría con batch/{operation}") + extra
+            return
+
+        try:
+            if operation == 'upsert':
+                response = self._call_api(
+                    self.hubspot_client.crm.contacts.batch_api, 'upsert',
+                    batch_input_simple_public_object_batch_input_upsert=BatchInputSimplePublicObjectBatchInputUpsert(inputs=[
+                        SimplePublicObjectBatchInputUpsert(
+                            id=key, id_property='no__de_cedula', properties=properties,
+                            object_write_trace_id=str(index)
+                        )
+                        for index, key, properties in chunk
+                    ])
+                )
+            else:
+                response = self._call_api(
+                    self.hubspot_client.crm.contacts.batch_api, 'update',
+                    batch_input_simple_public_object_batch_input=BatchInputSimplePublicObjectBatchInput(inputs=[
+                        SimplePublicObjectBatchInput(id=key, properties=properties, object_write_trace_id=str(index))
+                        for index, key, properties in chunk
+                    ])
+                )
+        except ApiException as e:
+            if 400 <= (e.status or 0) < 500 and e.status != 429 and len(chunk) > 1:
+                # Error de validación o conflicto de algún contacto: dividir para aislarlo
+                middle = len(chunk) // 2
+                self.logger.warning(f"⚠️ Lote de {len(chunk)} rechazado ({e.status}); dividiendo en lotes de {middle} y {len(chunk) - middle}")
+                self._write_chunk(operation, chunk[:middle], outcomes)
+                self._write_chunk(operation, chunk[middle:], outcomes)
+                return
+            self.logger.error(f"❌ Error de API en batch/{operation} ({len(chunk)} contactos): {e.status} {e.reason}")
+            for index, key, _ in chunk:
+                outcomes[index] = (False, f"Error de API en {label} {key}: {e.status} {e.reason} {e.body or ''}".strip()) + extra
+            return
+        except Exception as e:
+            self.logger.error(f"❌ Error inesperado en batch/{operation}: {str(e)}")
+            for index, key, _ in chunk:
+                outcomes[index] = (False, f"Error inesperado en {label} {key}: {str(e)}") + extra
+            return
+
+        # Resultados por objectWriteTraceId; sin él, por ID (update) o cédula (upsert)
+        results = {}
+        for result in response.results or []:
+            trace_id = getattr(result, 'object_write_trace_id', None)
+            if trace_id is None:
+                trace_id = str(result.id) if operation == 'update' else (result.properties or {}).get('no__de_cedula')
+            results[trace_id] = result
+
+        errors = {}
+        for error in getattr(response, 'errors', None) or []:
+            for values in (error.context or {}).values():
+                for value in values or []:
+                    errors[str(value)] = error.message
+
+        failed = 0
+        for index, key, _ in chunk:
+            result = results.get(str(index)) or results.get(key)
+            if result is None:
+                failed += 1
+                reason = errors.get(str(index)) or errors.get(key) or 'sin resultado en la respuesta del lote'
+                outcomes[index] = (False, f"Falló batch/{operation} de {label} {key}: {reason}") + extra
+            elif operation == 'upsert':
+                created = bool(getattr(result, 'new', False))
+                outcomes[index] = (True, f"Contacto {key} {'creado' if created else 'actualizado'} (ID: {result.id})", created)
+            else:
+                outcomes[index] = (True, f"Contacto {key} actualizado exitosamente")
+
+        self.logger.info(f"✅ Lote batch/{operation} completado - Exitosos: {len(chunk) - failed}, Fallidos: {failed}")
+
     def create_contacts_batch(self, contacts_data: List[Dict[str, Any]]) -> Tuple[int, int]:
         """
         Crea múltiples contactos en lote
@@ -377,7 +1103,8 @@ class HubSpotWriter:
         try:
             # Crear lote
             batch_input_request = BatchInputSimplePublicObjectBatchInputForCreate(inputs=batch_inputs)
-            response = self.hubspot_client.crm.contacts.batch_api.create(
+            response = self._call_api(
+                self.hubspot_client.crm.contacts.batch_api, 'create',
                 batch_input_simple_public_object_batch_input_for_create=batch_input_request
             )
 
@@ -394,6 +1121,94 @@ class HubSpotWriter:
             self.logger.error(f"❌ Error inesperado en creación por lotes: {str(e)}")
             return 0, len(batch_inputs)
 
+    def process_upserts(self, insert_data: List[Dict[str, Any]],
+                        update_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Procesa INSERT y UPDATE en una sola pasada con batch/upsert por no__de_cedula
+
+        Mapea cada fila con su mapper (HB_INSERT → insert_field_mapper,
+        HB_UPDATE → field_mapper con todas las propiedades personalizadas) y
+        combina por cédula las filas presentes en ambas consultas; las
+        propiedades de UPDATE prevalecen. Igual que process_inserts, las
+        cédulas que solo vienen en HB_INSERT y ya existen en HubSpot se
+        omiten (se resuelven en bloque con resolve_contact_ids_by_cedula);
+        el resto va a batch/upsert, que crea o actualiza según la cédula.
+
+        Args:
+            insert_data: Filas de HB_INSERT.sql
+            update_data: Filas de HB_UPDATE.sql
+
+        Returns:
+            Diccionario con estadísticas de la operación
+        """
+        contacts: Dict[str, Dict[str, Any]] = {}
+        stats = {
+            'total': len(insert_data) + len(update_data),
+            'processed': 0,
+            'created': 0,
+            'updated': 0,
+            'skipped_existing': 0,
+            'invalid': 0,
+            'errors': 0,
+            'error_details': []
+        }
+        update_cedulas = set()
+
+        for rows, mapper, force_all in (
+            (insert_data, self.insert_field_mapper, False),
+            (update_data, self.field_mapper, True)
+        ):
+            for row in rows:
+                cedula = self.normalize_cedula(row.get('no__de_cedula')) if isinstance(row, dict) else None
+                hubspot_properties = mapper.map_contact_data(row) if cedula else None
+                if not hubspot_properties:
+                    stats['invalid'] += 1
+                    continue
+                if force_all:
+                    hubspot_properties = self._ensure_all_custom_properties(hubspot_properties)
+                    update_cedulas.add(cedula)
+                contacts.setdefault(cedula, {}).update(hubspot_properties)
+
+        # Solo INSERT: no sobrescribir contactos existentes con los valores de alta
+        insert_only = [cedula for cedula in contacts if cedula not in update_cedulas]
+        if insert_only:
+            self.resolve_contact_ids_by_cedula(insert_only)
+            for cedula in insert_only:
+                # get_contact_id_by_cedula busca una a una las de lotes fallidos
+                if self.get_contact_id_by_cedula(cedula):
+                    stats['skipped_existing'] += 1
+                    del contacts[cedula]
+            if stats['skipped_existing']:
+                self.logger.info(f"⏭️ {stats['skipped_existing']} contactos de HB_INSERT YA EXISTEN en HubSpot; se omiten")
+
+        self.logger.info(
+            f"🚀 Iniciando UPSERT de {len(contacts)} contactos únicos "
+            f"({len(insert_data)} filas INSERT + {len(update_data)} filas UPDATE, {stats['invalid']} inválidas)"
+        )
+
+        outcomes = self.upsert_contacts_batch(list(contacts.values()))
+        for cedula, (success, message, created) in zip(contacts, outcomes):
+            stats['processed'] += 1
+            if not success:
+                stats['errors'] += 1
+                stats['error_details'].append(f"Cédula {cedula}: {message}")
+            elif created:
+                stats['created'] += 1
+            else:
+                stats['updated'] += 1
+
+        self.logger.info("🎉 Proceso UPSERT completado:")
+        self.logger.info(f"   📊 Total procesados: {stats['processed']}")
+        self.logger.info(f"   ✅ Contactos creados: {stats['created']}")
+        self.logger.info(f"   🔄 Contactos actualizados: {stats['updated']}")
+        self.logger.info(f"   ⏭️ Omitidos (INSERT de contactos existentes): {stats['skipped_existing']}")
+        self.logger.info(f"   ❌ Inválidos: {stats['invalid']}")
+        self.logger.info(f"   ❌ Errores: {stats['errors']}")
+        for error in stats['error_details'][:10]:
+            self.logger.warning(f"   {error}")
+
+        return stats
+
     def process_inserts(self, insert_data: List[Dict[str, Any]]) -> Dict[str, int]:
         """
         Procesa todos los datos de INSERT usando la estrategia exitosa
@@ -419,64 +1234,18 @@ class HubSpotWriter:
             'error_details': []
         }
 
-        # Procesar contacto por contacto para verificación precisa
-        for i, contact_data in enumerate(insert_data, 1):
-            cedula = str(contact_data.get('no__de_cedula', 'N/A'))
-
-            self.logger.info(f"🔍 Verificando {i}/{total_contacts}: Cédula {cedula}")
-
-            try:
-                # 1. Validar que tiene cédula
-                if not cedula or cedula == 'N/A':
-                    stats['invalid'] += 1
-                    error_msg = f"Contacto sin cédula válida"
-                    stats['error_details'].append(f"Registro {i}: {error_msg}")
-                    self.logger.warning(f"   ❌ {error_msg}")
-                    continue
-
-                # 2. Mapear datos usando INSERT mapper
-                hubspot_properties = self.insert_field_mapper.map_contact_data(contact_data)
-
-                if not hubspot_properties:
-                    stats['invalid'] += 1
-                    error_msg = f"No se pudieron mapear datos para cédula {cedula}"
-                    stats['error_details'].append(error_msg)
-                    self.logger.warning(f"   ❌ {error_msg}")
-                    continue
-
-                # 3. Verificar si YA EXISTE en HubSpot (CLAVE DE LA SEPARACIÓN)
-                existing_contact = self.find_contact_by_cedula(cedula)
-
-                if existing_contact:
-                    stats['already_exists'] += 1
-                    self.logger.info(f"   ⚠️ Contacto {cedula} YA EXISTE en HubSpot (ID: {existing_contact.id}) - Omitiendo INSERT")
-                    continue
-
-                # 4. NO EXISTE → Crear nuevo contacto
-                self.logger.debug(f"   📝 Creando nuevo contacto con {len(hubspot_properties)} propiedades")
-
-                success = self._create_single_contact(hubspot_properties)
-
-                if success:
-                    stats['created'] += 1
-                    self.logger.info(f"   ✅ Contacto {cedula} creado exitosamente")
-                else:
-                    stats['errors'] += 1
-                    error_msg = f"Falló la creación del contacto {cedula}"
-                    stats['error_details'].append(error_msg)
-                    self.logger.warning(f"   ❌ {error_msg}")
-
-            except Exception as e:
-                stats['errors'] += 1
-                error_msg = f"Error procesando contacto {cedula}: {str(e)}"
-                stats['error_details'].append(error_msg)
-                self.logger.error(f"   ❌ {error_msg}")
+        # Resolver todas las cédulas en bloque (búsqueda IN de 100) en lugar de una búsqueda por contacto
+        self.resolve_contact_ids_by_cedula([contact.get('no__de_cedula') for contact in insert_data])
 
-            stats['processed'] += 1
+        # Verificar y crear contacto por contacto, con hasta max_workers en paralelo
+        outcomes = self.run_grouped(self._process_insert_row, insert_data)
 
-            # Pequeña pausa entre contactos para no sobrecargar la API
-            if not self.dry_run and i < total_contacts:
-                time.sleep(0.2)  # Pausa más larga para INSERT (más conservador)
+        for i, (status, error_msg, processed) in enumerate(outcomes, 1):
+            stats[status] += 1
+            if error_msg:
+                stats['error_details'].append(f"Registro {i}: {error_msg}")
+            if processed:
+                stats['processed'] += 1
 
             # Log de progreso cada 10 contactos
             if i % 10 == 0:
@@ -504,6 +1273,57 @@ class HubSpotWriter:
 
         return stats
 
+    def _process_insert_row(self, contact_data: Dict[str, Any]) -> Tuple[str, Optional[str], bool]:
+        """
+        Verifica y crea un contacto de HB_INSERT (una fila de process_inserts)
+
+        Args:
+            contact_data: Fila de SQL Server
+
+        Returns:
+            Tupla (clave de estadística, detalle de error o None, cuenta como procesado)
+        """
+        cedula = str(contact_data.get('no__de_cedula', 'N/A'))
+        self.logger.info(f"🔍 Verificando cédula {cedula}")
+
+        try:
+            # 1. Validar que tiene cédula
+            if not cedula or cedula == 'N/A':
+                error_msg = f"Contacto sin cédula válida"
+                self.logger.warning(f"   ❌ {error_msg}")
+                return 'invalid', error_msg, False
+
+            # 2. Mapear datos usando INSERT mapper
+            hubspot_properties = self.insert_field_mapper.map_contact_data(contact_data)
+
+            if not hubspot_properties:
+                error_msg = f"No se pudieron mapear datos para cédula {cedula}"
+                self.logger.warning(f"   ❌ {error_msg}")
+                return 'invalid', error_msg, False
+
+            # 3. Verificar si YA EXISTE en HubSpot (CLAVE DE LA SEPARACIÓN)
+            existing_contact_id = self.get_contact_id_by_cedula(cedula)
+
+            if existing_contact_id:
+                self.logger.info(f"   ⚠️ Contacto {cedula} YA EXISTE en HubSpot (ID: {existing_contact_id}) - Omitiendo INSERT")
+                return 'already_exists', None, False
+
+            # 4. NO EXISTE → Crear nuevo contacto
+            self.logger.debug(f"   📝 Creando nuevo contacto con {len(hubspot_properties)} propiedades")
+
+            if self._create_single_contact(hubspot_properties):
+                self.logger.info(f"   ✅ Contacto {cedula} creado exitosamente")
+                return 'created', None, True
+
+            error_msg = f"Falló la creación del contacto {cedula}"
+            self.logger.warning(f"   ❌ {error_msg}")
+            return 'errors', error_msg, True
+
+        except Exception as e:
+            error_msg = f"Error procesando contacto {cedula}: {str(e)}"
+            self.logger.error(f"   ❌ {error_msg}")
+            return 'errors', error_msg, True
+
     def _create_single_contact(self, hubspot_properties: Dict[str, Any]) -> bool:
         """
         Crea un solo contacto en HubSpot
@@ -531,12 +1351,17 @@ class HubSpotWriter:
             simple_public_object_input = SimplePublicObjectInput(properties=hubspot_properties)
 
             # Crear contacto usando el parámetro correcto
-            response = self.hubspot_client.crm.contacts.basic_api.create(
+            response = self._call_api(
+                self.hubspot_client.crm.contacts.basic_api, 'create',
                 simple_public_object_input_for_create=simple_public_object_input
             )
 
             contact_id = response.id
             self.logger.info(f"✅ Contacto creado - Cédula: {cedula}, ID: {contact_id}")
+            cedula_clean = self.normalize_cedula(cedula)
+            if cedula_clean:
+                # Una fila posterior con la misma cédula lo verá como existente
+                self.contact_ids_by_cedula[cedula_clean] = contact_id
             return True
 
         except ApiException as e:
@@ -578,7 +1403,8 @@ class HubSpotWriter:
 
         # Crear contacto usando el parámetro correcto
         # NOTA: Las excepciones se propagan intencionalmente para manejo específico
-        response = self.hubspot_client.crm.contacts.basic_api.create(
+        response = self._call_api(
+            self.hubspot_client.crm.contacts.basic_api, 'create',
             simple_public_object_input_for_create=simple_public_object_input
         )
 
@@ -641,9 +1467,6 @@ class HubSpotWriter:
             if i % 100 == 0:
                 self.logger.info(f"📊 Progreso UPDATE: {i}/{total_contacts} ({stats})")
 
-            # Pausa para respetar rate limits
-            time.sleep(0.05)
-
         self.logger.info(f"✅ Proceso UPDATE completado: {stats}")
         return stats
 
@@ -734,84 +1557,54 @@ class HubSpotWriter:
         """
         total_contacts = len(update_data)
         self.logger.info(f"🚀 Iniciando proceso de UPDATE para {total_contacts} contactos")
-        self.logger.info("📝 Usando estrategia EXITOSA con force_all_properties=True")
+        self.logger.info("📝 Usando estrategia EXITOSA con force_all_properties=True (solo se envían los cambios)")
 
         stats = {
             'total': total_contacts,
             'processed': 0,
             'updated': 0,
+            'unchanged': 0,
             'not_found': 0,
             'errors': 0,
             'error_details': []
         }
 
-        # Procesar contacto por contacto (más seguro para actualizaciones críticas)
-        for i, contact_data in enumerate(update_data, 1):
-            cedula = str(contact_data.get('no__de_cedula', 'N/A'))
-
-            self.logger.info(f"🔄 Procesando {i}/{total_contacts}: Cédula {cedula}")
+        # Resolver todas las cédulas en bloque (búsqueda IN de 100) en lugar de una búsqueda por contacto
+        self.resolve_contact_ids_by_cedula([contact.get('no__de_cedula') for contact in update_data])
 
-            try:
-                # 1. Mapear datos (MISMO PROCESO QUE FUNCIONÓ)
-                hubspot_properties = self.field_mapper.map_contact_data(contact_data)
+        # Mapear y ubicar cada fila (las cédulas no resueltas en bloque se buscan en paralelo)
+        prepared = self.run_grouped(self._prepare_update_row, update_data)
 
-                if not hubspot_properties:
-                    stats['errors'] += 1
-                    error_msg = f"No se pudieron mapear datos para cédula {cedula}"
-                    stats['error_details'].append(error_msg)
-                    self.logger.warning(f"   ❌ {error_msg}")
-                    continue
-
-                # 2. Buscar contacto en HubSpot (MISMO PROCESO QUE FUNCIONÓ)
-                contact = self.find_contact_by_cedula(cedula)
-
-                if not contact:
-                    stats['not_found'] += 1
-                    self.logger.warning(f"   ❌ Contacto no encontrado en HubSpot para cédula {cedula}")
-                    continue
-
-                # 3. Actualizar CON FORZADO DE PROPIEDADES (LA CLAVE DEL ÉXITO)
-                self.logger.debug(f"   📝 Actualizando contacto ID: {contact.id} con {len(hubspot_properties)} propiedades")
-
-                success = self.update_contact(
-                    contact.id,
-                    hubspot_properties,
-                    already_mapped=True,
-                    force_all_properties=True  # ESTO ES LO QUE FUNCIONÓ AL 100%
-                )
-
-                if success:
-                    stats['updated'] += 1
-                    self.logger.info(f"   ✅ Contacto {cedula} actualizado exitosamente")
-                else:
-                    stats['errors'] += 1
-                    error_msg = f"Falló la actualización del contacto {cedula} (ID: {contact.id})"
-                    stats['error_details'].append(error_msg)
-                    self.logger.warning(f"   ❌ {error_msg}")
+        # Enviar con batch/update o uno por uno; ambos leen los valores actuales y omiten lo que no cambió
+        ready = [position for position, (status, _, _) in enumerate(prepared) if status is None]
+        results = self.update_contacts([prepared[position][2] for position in ready], force_all_properties=True)
+        outcomes: List[Tuple[str, Optional[str], bool]] = [(status, error_msg, False) for status, error_msg, _ in prepared]
+        for position, (success, message) in zip(ready, results):
+            cedula = update_data[position].get('no__de_cedula', 'N/A')
+            if not success:
+                outcomes[position] = ('errors', f"Cédula {cedula}: {message}", True)
+            else:
+                outcomes[position] = ('unchanged' if message == UNCHANGED_MESSAGE else 'updated', None, True)
 
-            except Exception as e:
-                stats['errors'] += 1
-                error_msg = f"Error procesando contacto {cedula}: {str(e)}"
+        for i, (status, error_msg, processed) in enumerate(outcomes, 1):
+            stats[status] += 1
+            if error_msg:
                 stats['error_details'].append(error_msg)
-                self.logger.error(f"   ❌ {error_msg}")
-
-            stats['processed'] += 1
-
-            # Pequeña pausa entre contactos para no sobrecargar la API
-            if not self.dry_run and i < total_contacts:
-                time.sleep(0.1)
+            if processed:
+                stats['processed'] += 1
 
             # Log de progreso cada 10 contactos
             if i % 10 == 0:
                 success_rate = (stats['updated'] / stats['processed']) * 100 if stats['processed'] > 0 else 0
                 self.logger.info(f"📊 Progreso: {i}/{total_contacts} procesados, {stats['updated']} exitosos ({success_rate:.1f}%)")
 
-        # Estadísticas finales
-        success_rate = (stats['updated'] / stats['processed']) * 100 if stats['processed'] > 0 else 0
+        # Estadísticas finales (los contactos sin cambios también cuentan como éxito)
+        success_rate = ((stats['updated'] + stats['unchanged']) / stats['processed']) * 100 if stats['processed'] > 0 else 0
 
         self.logger.info("🎉 Proceso UPDATE completado:")
         self.logger.info(f"   📊 Total procesados: {stats['processed']}")
         self.logger.info(f"   ✅ Actualizaciones exitosas: {stats['updated']}")
+        self.logger.info(f"   ⏭️ Sin cambios (no enviados): {stats['unchanged']}")
         self.logger.info(f"   ❌ No encontrados: {stats['not_found']}")
         self.logger.info(f"   ❌ Errores: {stats['errors']}")
         self.logger.info(f"   📈 Tasa de éxito: {success_rate:.1f}%")
@@ -825,3 +1618,42 @@ class HubSpotWriter:
                 self.logger.warning(f"   ... y {len(stats['error_details']) - 5} errores más")
 
         return stats
+
+    def _prepare_update_row(self, contact_data: Dict[str, Any]
+                            ) -> Tuple[Optional[str], Optional[str], Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Mapea y ubica en HubSpot el contacto de una fila de HB_UPDATE (una fila de process_updates)
+
+        Args:
+            contact_data: Fila de SQL Server
+
+        Returns:
+            Tupla (clave de estadística o None si está lista, detalle de error o
+            None, par (ID de contacto, propiedades mapeadas) si está lista)
+        """
+        cedula = str(contact_data.get('no__de_cedula', 'N/A'))
+        self.logger.info(f"🔄 Procesando cédula {cedula}")
+
+        try:
+            # 1. Mapear datos (MISMO PROCESO QUE FUNCIONÓ)
+            hubspot_properties = self.field_mapper.map_contact_data(contact_data)
+
+            if not hubspot_properties:
+                error_msg = f"No se pudieron mapear datos para cédula {cedula}"
+                self.logger.warning(f"   ❌ {error_msg}")
+                return 'errors', error_msg, None
+
+            # 2. Buscar contacto en HubSpot (MISMO PROCESO QUE FUNCIONÓ)
+            contact_id = self.get_contact_id_by_cedula(cedula)
+
+            if not contact_id:
+                self.logger.warning(f"   ❌ Contacto no encontrado en HubSpot para cédula {cedula}")
+                return 'not_found', None, None
+
+            self.logger.debug(f"   📝 Contacto ID: {contact_id} listo con {len(hubspot_properties)} propiedades")
+            return None, None, (contact_id, hubspot_properties)
+
+        except Exception as e:
+            error_msg = f"Error procesando contacto {cedula}: {str(e)}"
+            self.logger.error(f"   ❌ {error_msg}")
+            return 'errors', error_msg, None
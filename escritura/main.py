@@ -102,7 +102,8 @@ def sync_data():
                 logger.info(f"📈 Estadísticas UPDATE: {update_stats}")
                 
                 # Evaluar éxito del proceso
-                success_rate = update_stats.get('updated', 0) / max(update_stats.get('processed', 1), 1) * 100
+                successful = update_stats.get('updated', 0) + update_stats.get('unchanged', 0)
+                success_rate = successful / max(update_stats.get('processed', 1), 1) * 100
                 if success_rate >= 90:
                     logger.info("🎉 UPDATE completado con EXCELENTE tasa de éxito")
                 elif success_rate >= 70:
@@ -121,6 +121,11 @@ def production_insert_full():
         # SEGURIDAD: Importar funciones de validación
         from utils.security import validate_cedula, sanitize_string, mask_sensitive_data
 
+        # Resolver todas las cédulas en bloque (una búsqueda por cada 100) en lugar de una por contacto
+        writer.resolve_contact_ids_by_cedula([
+            contact.get('no__de_cedula') for contact in insert_data if isinstance(contact, dict)
+        ])
+
         # Procesar contacto por contacto
         for i, contact_data in enumerate(insert_data, 1):
             # SEGURIDAD: Validar que contact_data es un diccionario válido
@@ -159,9 +164,9 @@ def production_insert_full():
                     continue
 
                 # 3. Verificar si YA EXISTE por cédula
-                existing_contact = writer.find_contact_by_cedula(cedula)
+                existing_contact_id = writer.get_contact_id_by_cedula(cedula)
 
-                if existing_contact:
+                if existing_contact_id:
                     stats['already_exists'] += 1
                     continue
 
@@ -4,11 +4,11 @@ Proceso de actualización productivo basado en el éxito de test_cedula_11010074
 """
 import os
 import sys
-import time
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 sys.path.append('.')
 
+from config.settings import settings
 from hubspot_client.writer import HubSpotWriter
 from hubspot_client.field_mapper import HubSpotFieldMapper
 from utils.logger import get_logger
@@ -35,7 +35,6 @@ class ProductionUpdater:
         self.dry_run = dry_run
 
         # Configuración de SQL Server - SEGURIDAD: Usar settings centralizado
-        from config.settings import settings
         self.connection_string = settings.get_sql_connection_string()
 
         if self.dry_run:
@@ -91,21 +90,20 @@ class ProductionUpdater:
         self.logger.info(f"✅ SQL: Obtenidos {len(all_data)} registros para actualizar")
         return all_data
 
-    def process_single_contact_update(self, sql_data: Dict[str, Any]) -> Tuple[bool, str]:
+    def prepare_contact_update(self, sql_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]], str]:
         """
-        Procesa la actualización de un solo contacto
-        USANDO EXACTAMENTE EL MISMO PROCESO QUE FUNCIONÓ
+        Valida, mapea y ubica en HubSpot el contacto de una fila de SQL Server
         **SEGURIDAD:** Valida y sanitiza inputs antes de procesar
 
         Args:
             sql_data: Datos del contacto desde SQL Server
 
         Returns:
-            Tuple (éxito, mensaje)
+            Tuple (ID de contacto, propiedades mapeadas, mensaje); ID None si no se puede actualizar
         """
         # SEGURIDAD: Validar que sql_data es un diccionario válido
         if not isinstance(sql_data, dict):
-            return False, "Datos de entrada no son un diccionario válido"
+            return None, None, "Datos de entrada no son un diccionario válido"
 
         # SEGURIDAD: Sanitizar y validar cédula
         from utils.security import validate_cedula, sanitize_string, mask_sensitive_data
@@ -114,27 +112,43 @@ class ProductionUpdater:
 
         if not cedula or cedula == 'N/A' or not validate_cedula(cedula):
             cedula_masked = mask_sensitive_data(cedula, visible_chars=2) if cedula != 'N/A' else 'N/A'
-            return False, f"Cédula inválida o faltante: {cedula_masked}"
+            return None, None, f"Cédula inválida o faltante: {cedula_masked}"
+
+        # 1. Mapear datos (MISMO PROCESO QUE FUNCIONÓ)
+        hubspot_data = self.mapper.map_contact_data(sql_data)
 
+        if not hubspot_data:
+            return None, None, f"No se pudieron mapear datos para cédula {cedula}"
+
+        # 2. Buscar contacto en HubSpot (MISMO PROCESO QUE FUNCIONÓ)
+        contact_id = self.writer.get_contact_id_by_cedula(cedula)
+        if not contact_id:
+            return None, None, f"Contacto no encontrado en HubSpot para cédula {cedula}"
+
+        return contact_id, hubspot_data, f"Contacto {cedula} listo para actualizar"
+
+    def process_single_contact_update(self, sql_data: Dict[str, Any]) -> Tuple[bool, str]:
+        """
+        Procesa la actualización de un solo contacto
+        USANDO EXACTAMENTE EL MISMO PROCESO QUE FUNCIONÓ
+
+        Args:
+            sql_data: Datos del contacto desde SQL Server
+
+        Returns:
+            Tuple (éxito, mensaje)
+        """
+        cedula = str(sql_data.get('no__de_cedula', 'N/A')) if isinstance(sql_data, dict) else 'N/A'
         try:
-            # 1. Mapear datos (MISMO PROCESO QUE FUNCIONÓ)
-            hubspot_data = self.mapper.map_contact_data(sql_data)
-
-            if not hubspot_data:
-                return False, f"No se pudieron mapear datos para cédula {cedula}"
-
-            # 2. Buscar contacto en HubSpot (MISMO PROCESO QUE FUNCIONÓ)
-            contact = self.writer.find_contact_by_cedula(cedula)
-            if not contact:
-                return False, f"Contacto no encontrado en HubSpot para cédula {cedula}"
-
-            # 3. Actualizar CON FORZADO DE PROPIEDADES (LA CLAVE DEL ÉXITO)
-            success = self.writer.update_contact(
-                contact.id,
-                hubspot_data,
-                already_mapped=True,
+            contact_id, hubspot_data, message = self.prepare_contact_update(sql_data)
+            if not contact_id:
+                return False, message
+
+            # 3. Actualizar CON FORZADO DE PROPIEDADES (LA CLAVE DEL ÉXITO), enviando solo lo que cambió
+            success, _ = self.writer.update_contacts_individually(
+                [(contact_id, hubspot_data)],
                 force_all_properties=True  # ESTO ES LO QUE FUNCIONÓ
-            )
+            )[0]
 
             if success:
                 return True, f"Contacto {cedula} actualizado exitosamente"
@@ -146,6 +160,41 @@ class ProductionUpdater:
             self.logger.error(error_msg)
             return False, error_msg
 
+    def process_batch_contact_updates(self, batch_data: List[Dict[str, Any]]) -> List[Tuple[bool, str]]:
+        """
+        Procesa un lote con /batch/update (hasta 100 contactos por llamada) o,
+        con HUBSPOT_BATCH_UPDATE=false, con una llamada por contacto en paralelo;
+        en ambos casos solo se envían las propiedades que cambiaron
+
+        Args:
+            batch_data: Lista de datos de contactos para el lote
+
+        Returns:
+            Lista (éxito, mensaje) en el mismo orden que batch_data
+        """
+        outcomes: List[Optional[Tuple[bool, str]]] = [None] * len(batch_data)
+        positions = []
+        updates = []
+
+        for i, sql_data in enumerate(batch_data):
+            cedula = str(sql_data.get('no__de_cedula', 'N/A')) if isinstance(sql_data, dict) else 'N/A'
+            try:
+                contact_id, hubspot_data, message = self.prepare_contact_update(sql_data)
+            except Exception as e:
+                contact_id, message = None, f"Error procesando contacto {cedula}: {str(e)}"
+                self.logger.error(message)
+            if not contact_id:
+                outcomes[i] = (False, message)
+                continue
+            positions.append(i)
+            updates.append((contact_id, hubspot_data))
+
+        results = self.writer.update_contacts(updates, force_all_properties=True)
+        for i, outcome in zip(positions, results):
+            outcomes[i] = outcome
+
+        return outcomes
+
     def process_batch_updates(self, batch_data: List[Dict[str, Any]], batch_num: int) -> Dict[str, Any]:
         """
         Procesa un lote de actualizaciones
@@ -167,12 +216,13 @@ class ProductionUpdater:
             'errors': []
         }
 
+        # Todos los resultados del lote se obtienen antes de registrarlos, en el orden de entrada:
+        # con batch/update en llamadas de 100, si no con una llamada por contacto en paralelo
+        outcomes = self.process_batch_contact_updates(batch_data)
+
         for i, sql_data in enumerate(batch_data, 1):
             cedula = str(sql_data.get('no__de_cedula', 'N/A'))
-
-            self.logger.debug(f"  📝 Procesando {i}/{len(batch_data)}: Cédula {cedula}")
-
-            success, message = self.process_single_contact_update(sql_data)
+            success, message = outcomes[i - 1]
 
             if success:
                 stats['successful_updates'] += 1
@@ -182,10 +232,6 @@ class ProductionUpdater:
                 stats['errors'].append(f"Cédula {cedula}: {message}")
                 self.logger.warning(f"    ❌ {message}")
 
-            # Pequeña pausa entre contactos para no sobrecargar la API
-            if not self.dry_run:
-                time.sleep(0.1)
-
         # Estadísticas del lote
         success_rate = (stats['successful_updates'] / stats['total_contacts']) * 100
         self.logger.info(f"✅ Lote {batch_num} completado: {stats['successful_updates']}/{stats['total_contacts']} exitosos ({success_rate:.1f}%)")
@@ -214,7 +260,9 @@ class ProductionUpdater:
                 self.logger.warning("⚠️ No hay datos para actualizar")
                 return {'status': 'no_data', 'message': 'No hay datos para actualizar'}
 
-            # 2. Procesar en lotes
+            # 2. Procesar en lotes (con batch/update, al menos un lote completo de HubSpot por llamada)
+            if settings.HUBSPOT_BATCH_UPDATE and batch_size < self.writer.batch_size:
+                batch_size = self.writer.batch_size
             total_contacts = len(all_update_data)
             total_batches = (total_contacts + batch_size - 1) // batch_size
 
@@ -231,6 +279,9 @@ class ProductionUpdater:
                 'errors': []
             }
 
+            # Resolver todas las cédulas en bloque antes de los lotes (una búsqueda por cada 100)
+            self.writer.resolve_contact_ids_by_cedula([row.get('no__de_cedula') for row in all_update_data])
+
             # Procesar cada lote
             for batch_num in range(1, total_batches + 1):
                 start_idx = (batch_num - 1) * batch_size
@@ -245,11 +296,6 @@ class ProductionUpdater:
                 global_stats['batch_stats'].append(batch_stats)
                 global_stats['errors'].extend(batch_stats['errors'])
 
-                # Pausa entre lotes para no sobrecargar la API
-                if batch_num < total_batches and not self.dry_run:
-                    self.logger.info(f"⏸️ Pausa de 2 segundos antes del siguiente lote...")
-                    time.sleep(2)
-
             # 3. Estadísticas finales
             end_time = datetime.now()
             duration = end_time - start_time
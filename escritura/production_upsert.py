@@ -0,0 +1,73 @@
+# production_upsert.py
+"""
+UPSERT productivo: INSERT + UPDATE en una sola pasada con batch/upsert por no__de_cedula
+Reemplaza la secuencia production_insert_full.py → production_update.py cuando
+no__de_cedula es una propiedad de valor único en HubSpot
+"""
+import sys
+from datetime import datetime
+sys.path.append('.')
+
+from hubspot_client.writer import HubSpotWriter
+from db.mssql_connector import MSSQLConnector
+from utils.logger import get_logger
+from dotenv import load_dotenv
+
+def production_upsert(dry_run: bool = False) -> bool:
+    """
+    Carga HB_INSERT.sql y HB_UPDATE.sql y los envía a HubSpot con batch/upsert
+
+    Args:
+        dry_run: Si True, no hace cambios reales en HubSpot
+
+    Returns:
+        True si todos los contactos válidos se enviaron sin errores
+    """
+    load_dotenv()
+    logger = get_logger('hubspot_sync.production_upsert')
+
+    print("=" * 80)
+    print("🚀 UPSERT PRODUCTIVO - HB_INSERT.sql + HB_UPDATE.sql POR CÉDULA")
+    print("=" * 80)
+    print(f"🕐 Iniciado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    # 1. Obtener los datos de ambas consultas
+    print("1. 📊 CARGANDO DATOS DE INSERT Y UPDATE...")
+    try:
+        db_connector = MSSQLConnector()
+        insert_data = db_connector.get_insert_data()
+        update_data = db_connector.get_update_data()
+        print(f"   ✅ {len(insert_data)} registros de HB_INSERT.sql y {len(update_data)} de HB_UPDATE.sql")
+    except Exception as e:
+        logger.error(f"❌ Error cargando datos: {e}")
+        print(f"   ❌ Error cargando datos: {e}")
+        return False
+
+    if not insert_data and not update_data:
+        print("   ⚠️ No hay datos para procesar")
+        return True
+
+    # 2. Enviar con batch/upsert (100 contactos por llamada, sin búsqueda previa)
+    print("\n2. 🚀 EJECUTANDO UPSERT POR LOTES...")
+    start_time = datetime.now()
+    writer = HubSpotWriter(dry_run=dry_run)
+    stats = writer.process_upserts(insert_data, update_data)
+    duration = datetime.now() - start_time
+
+    # 3. Resumen final
+    print("\n3. 📊 RESUMEN FINAL:")
+    print(f"   📈 Total procesados: {stats['processed']}")
+    print(f"   ✅ Contactos creados: {stats['created']}")
+    print(f"   🔄 Contactos actualizados: {stats['updated']}")
+    print(f"   ⏭️ Omitidos (ya existían): {stats['skipped_existing']}")
+    print(f"   ❌ Inválidos: {stats['invalid']}")
+    print(f"   ❌ Errores: {stats['errors']}")
+    print(f"   ⏱️ Duración: {duration}")
+    if stats['processed'] and duration.total_seconds() > 0:
+        print(f"   📈 Velocidad: {stats['processed'] / duration.total_seconds():.1f} contactos/s")
+
+    return stats['errors'] == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if production_upsert() else 1)
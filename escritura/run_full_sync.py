@@ -4,6 +4,9 @@ Coordinador para ejecutar ambos procesos de sincronización:
 1. Primero INSERT (contactos nuevos)
 2. Después UPDATE (contactos existentes)
 
+Con SYNC_WRITE_MODE=upsert ejecuta production_upsert.py en su lugar: una sola
+pasada con batch/upsert por no__de_cedula, sin búsqueda previa por contacto.
+
 No modifica ningún proceso existente, solo los ejecuta en secuencia.
 """
 import os
@@ -12,6 +15,8 @@ import subprocess
 from datetime import datetime
 from pathlib import Path
 
+from config.settings import settings
+
 def print_separator(message):
     """Imprime un separador visual para claridad en logs"""
     print("\n" + "="*80)
@@ -54,6 +59,20 @@ def main():
     print(f"📅 Fecha/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     overall_start = datetime.now()
+
+    if settings.SYNC_WRITE_MODE == 'upsert':
+        # Fase única: UPSERT (contactos nuevos y existentes)
+        print_separator("FASE ÚNICA: UPSERT - CONTACTOS NUEVOS Y EXISTENTES")
+        upsert_success = run_script("production_upsert.py")
+
+        print_separator("RESUMEN FINAL")
+        print(f"📊 UPSERT: {'✅ EXITOSO' if upsert_success else '❌ FALLÓ'}")
+        print(f"⏱️  Duración total: {datetime.now() - overall_start}")
+        if upsert_success:
+            print("🎉 SINCRONIZACIÓN COMPLETA EXITOSA")
+            return 0
+        print("⚠️  SINCRONIZACIÓN CON ERRORES")
+        return 1
     
     # Fase 1: INSERT (contactos nuevos)
     print_separator("FASE 1: INSERT - CONTACTOS NUEVOS")
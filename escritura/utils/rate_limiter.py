@@ -0,0 +1,161 @@
+# utils/rate_limiter.py
+"""
+Limitador de tasa (token bucket) compartido para todas las llamadas a la API de HubSpot
+
+Reemplaza las pausas fijas (time.sleep) entre peticiones: cada llamada toma un
+token antes de salir y la tasa de recarga se ajusta con los headers
+X-HubSpot-RateLimit-* que devuelve HubSpot, de modo que el proceso avanza al
+máximo permitido por el plan del portal sin provocar errores 429.
+
+Solo depende de la librería estándar para poder cargarse también desde el
+paquete de lectura (hubspot/http_client.py).
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+# Buckets disponibles: la API de búsqueda tiene un límite propio más estricto
+DEFAULT_BUCKET = 'default'
+SEARCH_BUCKET = 'search'
+
+# Headers de límite de tasa que devuelve HubSpot (comparación en minúsculas)
+HEADER_MAX = 'x-hubspot-ratelimit-max'
+HEADER_REMAINING = 'x-hubspot-ratelimit-remaining'
+HEADER_INTERVAL_MS = 'x-hubspot-ratelimit-interval-milliseconds'
+HEADER_SECONDLY = 'x-hubspot-ratelimit-secondly'
+HEADER_SECONDLY_REMAINING = 'x-hubspot-ratelimit-secondly-remaining'
+
+
+class TokenBucket:
+    """Token bucket thread-safe: `rate` tokens por segundo con ráfagas de hasta `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = max(float(rate), 0.1)
+        self.capacity = max(float(capacity or rate), 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        """Recarga los tokens acumulados desde la última lectura"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Toma un token, esperando lo necesario si el bucket está vacío
+
+        Returns:
+            Segundos esperados antes de obtener el token
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if waited:
+                        self.waits += 1
+                        self.wait_seconds += waited
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def reconfigure(self, rate: float, capacity: float, remaining: Optional[float] = None):
+        """
+        Ajusta tasa y capacidad; si HubSpot reporta menos peticiones restantes
+        que tokens disponibles, se descartan los tokens sobrantes
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(float(rate), 0.1)
+            self.capacity = max(float(capacity), 1.0)
+            self._tokens = min(self._tokens, self.capacity)
+            if remaining is not None:
+                self._tokens = min(self._tokens, float(remaining))
+
+
+class HubSpotRateLimiter:
+    """Conjunto de token buckets por tipo de endpoint, ajustados con los headers de HubSpot"""
+
+    def __init__(self, default_rate: float, search_rate: float):
+        self._buckets = {
+            DEFAULT_BUCKET: TokenBucket(default_rate),
+            SEARCH_BUCKET: TokenBucket(search_rate),
+        }
+
+    def acquire(self, bucket: str = DEFAULT_BUCKET) -> float:
+        """Espera un turno en el bucket indicado antes de una petición"""
+        return self._buckets.get(bucket, self._buckets[DEFAULT_BUCKET]).acquire()
+
+    def update_from_headers(self, headers: Optional[Mapping[str, Any]]):
+        """
+        Ajusta el bucket general con los headers X-HubSpot-RateLimit-* de una respuesta
+
+        Usa el límite por segundo si viene informado; si no, Max / Interval. Las
+        respuestas de búsqueda no incluyen estos headers, por lo que el bucket
+        de búsqueda conserva su tasa configurada.
+        """
+        if not headers:
+            return
+
+        values = {str(key).lower(): value for key, value in headers.items()}
+
+        try:
+            if HEADER_SECONDLY in values:
+                rate = float(values[HEADER_SECONDLY])
+                remaining = values.get(HEADER_SECONDLY_REMAINING)
+            elif HEADER_MAX in values and HEADER_INTERVAL_MS in values:
+                interval_seconds = float(values[HEADER_INTERVAL_MS]) / 1000
+                if interval_seconds <= 0:
+                    return
+                rate = float(values[HEADER_MAX]) / interval_seconds
+                remaining = values.get(HEADER_REMAINING)
+            else:
+                return
+            remaining = float(remaining) if remaining is not None else None
+        except (TypeError, ValueError):
+            return
+
+        # Ráfaga máxima equivalente a un segundo de tasa
+        self._buckets[DEFAULT_BUCKET].reconfigure(rate, capacity=rate, remaining=remaining)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Tasa actual y tiempo de espera acumulado por bucket"""
+        return {
+            name: {'rate': bucket.rate, 'waits': bucket.waits, 'wait_seconds': bucket.wait_seconds}
+            for name, bucket in self._buckets.items()
+        }
+
+
+# Instancia compartida por proceso (todas las llamadas pasan por el mismo limitador)
+_limiter: Optional[HubSpotRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(default_rate: Optional[float] = None, search_rate: Optional[float] = None) -> HubSpotRateLimiter:
+    """
+    Retorna el limitador compartido del proceso, creándolo en el primer uso
+
+    Args:
+        default_rate: Peticiones por segundo iniciales (default: HUBSPOT_RATE_LIMIT_PER_SECOND o 10)
+        search_rate: Peticiones por segundo a la API de búsqueda (default: HUBSPOT_SEARCH_RATE_LIMIT_PER_SECOND o 4)
+
+    Returns:
+        HubSpotRateLimiter compartido
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = HubSpotRateLimiter(
+                    default_rate or float(os.getenv('HUBSPOT_RATE_LIMIT_PER_SECOND', '10')),
+                    search_rate or float(os.getenv('HUBSPOT_SEARCH_RATE_LIMIT_PER_SECOND', '4')),
+                )
+    return _limiter
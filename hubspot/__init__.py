@@ -17,6 +17,14 @@ Estructura del Módulo:
     - fetch_owners.py: Extracción de propietarios/usuarios
     - fetch_deals_pipelines.py: Extracción de etapas de ventas
     - fetch_tickets_pipelines.py: Extracción de etapas de soporte
+    - http_client.py: Transporte HTTP compartido (pool keep-alive, timeouts, latencia)
+    - extraction.py: Extracción por lotes de propiedades (secuencial o paralela)
+    - properties.py: Definiciones de propiedades y caché del análisis de propiedades
+    - sync_state.py: Marcas de agua para extracción incremental
+    - column_types.py: Tipos de columna SQL derivados de la metadata de propiedades
+    - record_store.py: Almacén columnar con codificación por diccionario para registros extraídos
+    - stats.py: Estadísticas de resumen acumuladas en una sola pasada
+    - manifest.py: Manifiesto declarativo de propiedades y tipos SQL por objeto
 
 Funcionalidades Comunes:
     - Análisis dinámico de propiedades
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+                    HUBSPOT COLUMN TYPES - ESQUEMA SQL DESDE METADATOS
+================================================================================
+
+Archivo:            hubspot/column_types.py
+Descripción:        Traduce la metadata de propiedades de HubSpot (type /
+                   fieldType / options) a tipos de columna de SQL Server y
+                   convierte cada valor una sola vez en Python antes de
+                   insertarlo, en lugar de guardar todo como NVARCHAR(MAX).
+
+Mapeo de Tipos:
+    - hs_object_id           → BIGINT
+    - number                 → DECIMAL(38, 10)
+    - datetime               → DATETIME2(3)  (UTC, sin zona horaria)
+    - date                   → DATE
+    - bool / booleancheckbox → BIT
+    - enumeration (select)   → NVARCHAR(n) acotado por la opción más larga
+    - resto / sin metadata   → NVARCHAR(4000) (los valores se truncan a 4000 unidades UTF-16)
+
+Configuración (.env):
+    - SQL_TYPED_COLUMNS: "true" (default) o "false" para volver a NVARCHAR(MAX)
+
+Funciones Exportadas:
+    - typed_columns_enabled(): Indica si se usan columnas tipadas
+    - sql_type_for_property(): Tipo SQL para una definición de propiedad
+    - build_column_types(): Tipos SQL por columna a partir de definiciones
+    - convert_value(): Conversión de un valor de HubSpot al tipo de su columna
+    - text_type_length(): Largo declarado de un tipo NVARCHAR (-1 = MAX)
+    - truncate_utf16(): Recorte a n unidades UTF-16 (largo de NVARCHAR(n))
+
+Autor:              Ing. Jose Ríler Solórzano Campos
+Fecha de Creación:  11 de julio de 2025
+Derechos de Autor:  © 2025 Jose Ríler Solórzano Campos. Todos los derechos reservados.
+Licencia:           Uso exclusivo del autor. Prohibida la distribución sin autorización.
+
+================================================================================
+"""
+
+import os
+import re
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation, localcontext
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# ==================== TIPOS SQL SERVER ====================
+SQL_BIGINT = "BIGINT"
+SQL_DECIMAL = "DECIMAL(38, 10)"
+SQL_DATETIME = "DATETIME2(3)"
+SQL_DATE = "DATE"
+SQL_BIT = "BIT"
+SQL_TEXT = "NVARCHAR(4000)"
+SQL_TEXT_LEGACY = "NVARCHAR(MAX)"
+
+# Límite de DECIMAL(38, 10): 28 dígitos enteros
+DECIMAL_LIMIT = Decimal("1e28")
+
+# Holgura para enumeraciones: las opciones pueden crecer entre ejecuciones
+ENUM_MIN_LENGTH = 100
+ENUM_MAX_LENGTH = 4000
+
+TEXT_TYPE_PATTERN = re.compile(r"^NVARCHAR\((\d+|MAX)\)$")
+
+
+class ValueConversionError(ValueError):
+    """
+    Valor de HubSpot que no se puede convertir al tipo de su columna.
+
+    columns lista las columnas afectadas cuando el error describe una fila
+    completa (build_entity_row() en main.py).
+    """
+
+    def __init__(self, message, columns=None):
+        super().__init__(message)
+        self.columns = list(columns or [])
+
+
+def typed_columns_enabled():
+    """
+    True salvo SQL_TYPED_COLUMNS=false
+    """
+    return os.getenv("SQL_TYPED_COLUMNS", "true").strip().lower() != "false"
+
+
+def sql_type_for_property(definition):
+    """
+    Tipo de columna SQL Server para una definición de propiedad de HubSpot.
+
+    Parámetros:
+        definition (dict): Definición de /crm/v3/properties (name, type, fieldType, options)
+
+    Retorna:
+        str: Tipo SQL (ej: "DECIMAL(38, 10)", "NVARCHAR(120)")
+    """
+    name = definition.get("name")
+    prop_type = (definition.get("type") or "").lower()
+    field_type = (definition.get("fieldType") or "").lower()
+
+    if name == "hs_object_id":
+        return SQL_BIGINT
+    if prop_type == "number":
+        return SQL_DECIMAL
+    if prop_type == "datetime":
+        return SQL_DATETIME
+    if prop_type == "date":
+        return SQL_DATE
+    if prop_type == "bool" or field_type == "booleancheckbox":
+        return SQL_BIT
+    if prop_type == "enumeration" and field_type in ("select", "radio"):
+        # Selección única: el valor siempre es una de las opciones
+        options = definition.get("options") or []
+        longest = max((len(str(opt.get("value") or "")) for opt in options), default=0)
+        if longest:
+            return f"NVARCHAR({min(max(longest * 2, ENUM_MIN_LENGTH), ENUM_MAX_LENGTH)})"
+    # Checkbox múltiple (valores unidos con ";"), texto, teléfono, etc.
+    return SQL_TEXT
+
+
+def build_column_types(columns, definitions):
+    """
+    Tipos SQL por columna para una carga.
+
+    Parámetros:
+        columns (list): Columnas de la tabla destino
+        definitions (list): Definiciones de propiedades del objeto
+
+    Retorna:
+        dict: {columna: tipo SQL}; columnas sin metadata → NVARCHAR(4000)
+    """
+    by_name = {d.get("name"): d for d in definitions or [] if d.get("name")}
+    return {
+        col: sql_type_for_property(by_name[col]) if col in by_name
+        else (SQL_BIGINT if col == "hs_object_id" else SQL_TEXT)
+        for col in columns
+    }
+
+
+def _parse_epoch_ms(text):
+    """
+    Convierte un timestamp en milisegundos (formato habitual de HubSpot) a datetime UTC
+    """
+    return datetime.fromtimestamp(int(text) / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _parse_datetime(text):
+    """
+    Acepta epoch en ms o ISO 8601 ("2025-07-11T15:04:05.123Z") y retorna datetime UTC sin zona
+    """
+    if text.lstrip("-").isdigit():
+        return _parse_epoch_ms(text)
+    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def convert_value(value, sql_type):
+    """
+    Convierte un valor de HubSpot (siempre texto en la API) al tipo de su columna.
+
+    Descripción:
+        Los valores vacíos se cargan como NULL; los que no se pueden convertir
+        (DECIMAL fuera de rango, número o fecha no interpretable, BIT no
+        reconocido) levantan ValueConversionError para que el llamador
+        rechace la fila en lugar de perder el dato en silencio. Las columnas
+        de texto no se tocan aquí; el llamador las sanitiza con sanitize_string().
+
+    Parámetros:
+        value: Valor crudo de la propiedad
+        sql_type (str): Tipo SQL de la columna
+
+    Retorna:
+        Valor Python (int, Decimal, datetime, date, bool, str) o None
+
+    Excepciones:
+        ValueConversionError: Si el valor no es convertible al tipo de la columna
+    """
+    if value is None:
+        return None
+    if sql_type.startswith("NVARCHAR"):
+        return value
+
+    text = str(value).strip()
+    if not text:
+        return None
+
+    try:
+        if sql_type == SQL_BIGINT:
+            return int(Decimal(text))
+        if sql_type == SQL_DECIMAL:
+            number = Decimal(text)
+            if not number.is_finite() or abs(number) >= DECIMAL_LIMIT:
+                raise ValueConversionError(f"'{text[:50]}' fuera del rango de {sql_type}")
+            # 38 dígitos de precisión para cuantizar sin InvalidOperation
+            with localcontext() as ctx:
+                ctx.prec = 38
+                return number.quantize(Decimal("1e-10"))
+        if sql_type == SQL_DATETIME:
+            return _parse_datetime(text)
+        if sql_type == SQL_DATE:
+            return _parse_datetime(text).date() if ("T" in text or text.isdigit()) else date.fromisoformat(text)
+        if sql_type == SQL_BIT:
+            lowered = text.lower()
+            if lowered in ("true", "1", "yes", "si", "sí"):
+                return True
+            if lowered in ("false", "0", "no"):
+                return False
+            raise ValueConversionError(f"'{text[:50]}' no es un valor {sql_type} reconocido")
+    except ValueConversionError:
+        raise
+    except (InvalidOperation, ValueError, OverflowError, OSError) as e:
+        raise ValueConversionError(f"'{text[:50]}' no es convertible a {sql_type}") from e
+
+    return value
+
+
+def text_type_length(sql_type):
+    """
+    Largo declarado de un tipo NVARCHAR(n): n, -1 para NVARCHAR(MAX) y None si no es texto
+    """
+    match = TEXT_TYPE_PATTERN.match(sql_type or "")
+    if not match:
+        return None
+    return -1 if match.group(1) == "MAX" else int(match.group(1))
+
+
+def truncate_utf16(text, max_units):
+    """
+    Recorta un texto a max_units unidades UTF-16 (las que cuenta NVARCHAR(n)) sin partir un par sustituto
+
+    Un carácter fuera del plano básico (emoji, CJK extendido) ocupa dos
+    unidades, por lo que 4000 caracteres de Python pueden exceder NVARCHAR(4000).
+    """
+    # Cada carácter ocupa como mucho dos unidades
+    if len(text) <= max_units // 2:
+        return text
+    encoded = text.encode("utf-16-le")
+    if len(encoded) <= max_units * 2:
+        return text
+    # errors="ignore" descarta la mitad de un par sustituto cortado
+    return encoded[: max_units * 2].decode("utf-16-le", errors="ignore")
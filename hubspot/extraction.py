@@ -0,0 +1,828 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+                    HUBSPOT EXTRACTION - UTILIDADES COMUNES DE EXTRACCIÓN
+================================================================================
+
+Archivo:            hubspot/extraction.py
+Descripción:        Lógica de extracción compartida por los extractores de deals,
+                   tickets y contactos. Pagina la API de búsqueda, divide listas
+                   amplias de propiedades en lotes, pagina cada lote (en serie o
+                   en paralelo) y combina los resultados por hs_object_id, ya sea
+                   acumulando todo o página a página (streaming).
+
+Lotes de Propiedades:
+    Con lectura por lotes (default) solo el primer lote de propiedades pagina
+    la búsqueda; los demás se leen por ID con /crm/v3/objects/{tipo}/batch/read
+    (100 IDs por llamada), de modo que todos los lotes describen exactamente
+    los mismos registros. Sin ella, cada lote re-pagina la búsqueda completa.
+
+Límite de 10,000 Resultados:
+    La búsqueda de HubSpot no pagina más allá de 10,000 resultados por
+    consulta. Las búsquedas ordenadas por hs_object_id continúan con un
+    filtro hs_object_id > último ID al acercarse al límite, y con más de un
+    worker el rango de IDs se divide en particiones que se paginan en
+    paralelo y se entregan en orden ascendente de ID.
+
+Configuración (.env):
+    - HUBSPOT_PROPERTY_BATCH_WORKERS: Lotes de propiedades paginados (o
+      llamadas de batch/read) en paralelo (default: 1 = secuencial)
+    - HUBSPOT_PROPERTY_BATCH_READ: "true" (default) lee los lotes restantes
+      con batch/read; "false" re-pagina la búsqueda por cada lote
+    - HUBSPOT_SEARCH_PARTITION_WORKERS: Rangos de hs_object_id paginados en
+      paralelo por búsqueda (default: 1 = un solo rango secuencial)
+    - HUBSPOT_SEARCH_PARTITION_SIZE: Registros objetivo por rango (default: 5000)
+    - HUBSPOT_EXTRACTION_MODE: Endpoint de las extracciones completas:
+      "search" (default), "list" (GET /crm/v3/objects/{tipo}) o "auto" (el
+      más rápido medido en ejecuciones anteriores). HUBSPOT_EXTRACTION_MODE_<TIPO>
+      (ej: HUBSPOT_EXTRACTION_MODE_CONTACTS) tiene prioridad; las extracciones
+      incrementales siempre usan búsqueda
+
+Funciones Exportadas:
+    - build_search_filter_groups(): Filtro de búsqueda completo o incremental
+    - iter_search_pages(): Generador de páginas de /crm/v3/objects/{tipo}/search
+    - iter_partitioned_search_pages(): Búsqueda particionada por rangos de hs_object_id
+    - split_id_ranges(): División de un rango de IDs en particiones
+    - iter_list_pages(): Generador de páginas del endpoint de listado
+    - get_extraction_mode(): Endpoint de extracción completa por tipo de objeto
+    - iter_entity_pages(): Páginas de una entidad por el endpoint que corresponda
+    - split_property_batches(): División de propiedades en lotes
+    - read_records_batch(): Lectura de propiedades por ID con batch/read
+    - fetch_property_batches(): Extracción por lotes con combinación por ID
+    - iter_property_batches_merged(): Lotes paginados en paralelo y combinados por páginas
+
+Autor:              Ing. Jose Ríler Solórzano Campos
+Fecha de Creación:  11 de julio de 2025
+Derechos de Autor:  © 2025 Jose Ríler Solórzano Campos. Todos los derechos reservados.
+Licencia:           Uso exclusivo del autor. Prohibida la distribución sin autorización.
+
+================================================================================
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from hubspot.http_client import HubSpotAPIError, ensure_success, hubspot_get, hubspot_post
+from hubspot.properties import CACHE_DIR
+from hubspot.record_store import RecordStore
+
+# Cargar variables de entorno
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Propiedades esenciales que deben estar en todos los lotes (clave de combinación)
+ESSENTIAL_PROPERTIES = ["hs_object_id"]
+
+# Orden por ID: todos los lotes de propiedades recorren los registros en la misma secuencia
+SORT_BY_OBJECT_ID = [{"propertyName": "hs_object_id", "direction": "ASCENDING"}]
+
+# Máximo de resultados que la API de búsqueda pagina por consulta
+SEARCH_RESULT_LIMIT = 10000
+SEARCH_PAGE_SIZE = 100
+
+# IDs por llamada de /crm/v3/objects/{tipo}/batch/read
+BATCH_READ_SIZE = 100
+
+# Páginas que cada rango puede adelantar mientras se entregan los rangos anteriores
+PARTITION_BUFFER_PAGES = 20
+
+# Endpoints de extracción completa
+EXTRACTION_SEARCH = "search"
+EXTRACTION_LIST = "list"
+EXTRACTION_AUTO = "auto"
+
+# Velocidad medida de cada endpoint por tipo de objeto (modo "auto")
+EXTRACTION_BENCHMARK_FILE = CACHE_DIR / "extraction_benchmarks.json"
+_benchmark_lock = threading.Lock()
+_auto_modes = {}  # Endpoint elegido por "auto" en esta ejecución, por tipo de objeto
+
+
+def get_property_batch_workers():
+    """
+    Ancho de paralelismo para paginar lotes de propiedades (mínimo 1)
+    """
+    try:
+        return max(1, int(os.getenv("HUBSPOT_PROPERTY_BATCH_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def get_search_partition_workers():
+    """
+    Rangos de hs_object_id paginados en paralelo por búsqueda (mínimo 1)
+    """
+    try:
+        return max(1, int(os.getenv("HUBSPOT_SEARCH_PARTITION_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def get_search_partition_size():
+    """
+    Registros objetivo por rango de hs_object_id (por debajo del límite de la búsqueda)
+    """
+    try:
+        return min(max(100, int(os.getenv("HUBSPOT_SEARCH_PARTITION_SIZE", "5000"))), SEARCH_RESULT_LIMIT)
+    except ValueError:
+        return 5000
+
+
+def _with_filters(filter_groups, extra_filters):
+    """
+    Agrega filtros a cada filterGroup (AND dentro del grupo) sin modificar el original
+    """
+    return [
+        {**group, "filters": list(group.get("filters", [])) + extra_filters}
+        for group in filter_groups
+    ]
+
+
+def batch_read_enabled():
+    """
+    True salvo HUBSPOT_PROPERTY_BATCH_READ=false
+    """
+    return os.getenv("HUBSPOT_PROPERTY_BATCH_READ", "true").strip().lower() != "false"
+
+
+def build_search_filter_groups(last_modified_property, modified_since=None):
+    """
+    Construye los filterGroups de la búsqueda de registros.
+
+    Parámetros:
+        last_modified_property (str): Propiedad de última modificación del objeto
+            (ej: "hs_lastmodifieddate", "lastmodifieddate" en contactos)
+        modified_since (int): Marca de agua en epoch ms; None = extracción completa
+
+    Retorna:
+        list: filterGroups para el payload de /crm/v3/objects/{tipo}/search
+    """
+    if modified_since is None:
+        # Extracción completa: todos los registros con ID
+        return [{"filters": [{"propertyName": "hs_object_id", "operator": "HAS_PROPERTY"}]}]
+
+    # Extracción incremental: solo registros modificados desde la marca de agua
+    return [{"filters": [{"propertyName": last_modified_property, "operator": "GTE", "value": str(modified_since)}]}]
+
+
+def iter_search_pages(object_type, properties_list, filter_groups, entity_label, sorts=None):
+    """
+    Pagina /crm/v3/objects/{tipo}/search entregando cada página al llegar.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        properties_list (list): Propiedades a extraer (máx. ~100 por búsqueda)
+        filter_groups (list): filterGroups de build_search_filter_groups()
+        entity_label (str): Nombre de la entidad para logs
+        sorts (list): Orden de la búsqueda (opcional, ej: SORT_BY_OBJECT_ID)
+
+    Genera:
+        list: Registros de cada página ({"id", "properties", ...})
+
+    Límite de Resultados:
+        Con sorts=SORT_BY_OBJECT_ID, antes de superar SEARCH_RESULT_LIMIT la
+        búsqueda se reinicia con hs_object_id > último ID recibido, de modo
+        que se obtienen todos los registros y no solo los primeros 10,000.
+
+    Excepciones:
+        HubSpotAPIError: Si una página falla después de agotar los reintentos
+    """
+    url = f"https://api.hubapi.com/crm/v3/objects/{object_type}/search"
+    keyset = sorts == SORT_BY_OBJECT_ID
+    query_filter_groups = filter_groups
+    after = None
+    page_count = 0
+    total = 0
+
+    while True:
+        payload = {
+            "limit": SEARCH_PAGE_SIZE,
+            "properties": properties_list,
+            "filterGroups": query_filter_groups
+        }
+        if sorts:
+            payload["sorts"] = sorts
+        if after:
+            payload["after"] = after
+
+        # Los 429/5xx ya se reintentaron en el transporte; un error restante
+        # aborta la extracción en lugar de truncar la tabla en silencio
+        response = hubspot_post(url, payload)
+        ensure_success(response, f"Paginación de {entity_label} (página {page_count + 1})")
+
+        data = response.json()
+        records = data.get("results", [])
+        page_count += 1
+        total += len(records)
+        print(f"📄 Página {page_count}: {len(records)} {entity_label} obtenidos (Total: {total})")
+        yield records
+
+        # Verificar si hay más páginas
+        paging = data.get("paging")
+        if paging and paging.get("next") and paging["next"].get("after"):
+            after = paging["next"]["after"]
+            if keyset and records and str(after).isdigit() and int(after) + SEARCH_PAGE_SIZE > SEARCH_RESULT_LIMIT:
+                # La siguiente página superaría el límite: nueva consulta desde el último ID
+                last_id = records[-1].get("id") or records[-1].get("properties", {}).get("hs_object_id")
+                print(f"🔁 Límite de {SEARCH_RESULT_LIMIT:,} resultados en {entity_label}: continuando desde hs_object_id > {last_id}")
+                query_filter_groups = _with_filters(
+                    filter_groups, [{"propertyName": "hs_object_id", "operator": "GT", "value": str(last_id)}]
+                )
+                after = None
+        else:
+            break
+
+
+def _probe_id_bounds(object_type, filter_groups, entity_label):
+    """
+    Total de resultados y hs_object_id mínimo y máximo de una búsqueda (dos consultas de 1 registro)
+
+    Retorna:
+        tuple: (total, min_id, max_id); (0, None, None) si no hay resultados
+    """
+    url = f"https://api.hubapi.com/crm/v3/objects/{object_type}/search"
+    total = 0
+    bounds = []
+    for direction in ("ASCENDING", "DESCENDING"):
+        response = hubspot_post(url, {
+            "limit": 1,
+            "properties": ["hs_object_id"],
+            "filterGroups": filter_groups,
+            "sorts": [{"propertyName": "hs_object_id", "direction": direction}]
+        })
+        ensure_success(response, f"Rango de IDs de {entity_label}")
+        data = response.json()
+        results = data.get("results", [])
+        if not results:
+            return 0, None, None
+        total = data.get("total", total)
+        bounds.append(int(results[0].get("id") or results[0]["properties"]["hs_object_id"]))
+    return total, bounds[0], bounds[1]
+
+
+def split_id_ranges(min_id, max_id, partitions):
+    """
+    Divide [min_id, max_id] en rangos contiguos de igual ancho.
+
+    Parámetros:
+        min_id (int): Menor hs_object_id
+        max_id (int): Mayor hs_object_id
+        partitions (int): Cantidad de rangos deseada
+
+    Retorna:
+        list: [(desde, hasta), ...] inclusivos y ordenados; el último rango
+            queda abierto (hasta=None) para incluir registros creados durante
+            la extracción
+    """
+    span = max_id - min_id + 1
+    partitions = max(1, min(partitions, span))
+    starts = [min_id + (span * i) // partitions for i in range(partitions)]
+    ranges = [(start, next_start - 1) for start, next_start in zip(starts, starts[1:])]
+    ranges.append((starts[-1], None))
+    return ranges
+
+
+def _id_range_filters(low, high):
+    """
+    Filtros de un rango de hs_object_id (high=None: sin límite superior)
+    """
+    filters = [{"propertyName": "hs_object_id", "operator": "GTE", "value": str(low)}]
+    if high is not None:
+        filters.append({"propertyName": "hs_object_id", "operator": "LTE", "value": str(high)})
+    return filters
+
+
+def iter_partitioned_search_pages(object_type, properties_list, filter_groups, entity_label, max_workers=None):
+    """
+    Pagina una búsqueda dividida en rangos de hs_object_id, en paralelo y en orden de ID.
+
+    Descripción:
+        Con un worker la búsqueda recorre un solo rango ordenado por ID
+        (continuando más allá de los 10,000 resultados). Con más workers se
+        consultan el total y los IDs extremos, el rango se divide en
+        particiones de ~HUBSPOT_SEARCH_PARTITION_SIZE registros y cada una se
+        pagina en un ThreadPoolExecutor. Las páginas se entregan rango por
+        rango en orden ascendente, de modo que el resultado sigue ordenado por
+        hs_object_id (requisito de iter_property_batches_merged()); cada rango
+        adelanta como máximo PARTITION_BUFFER_PAGES páginas.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        properties_list (list): Propiedades a extraer
+        filter_groups (list): filterGroups de build_search_filter_groups()
+        entity_label (str): Nombre de la entidad para logs
+        max_workers (int): Paralelismo; usa HUBSPOT_SEARCH_PARTITION_WORKERS si se omite
+
+    Genera:
+        list: Registros de cada página ordenados por hs_object_id
+    """
+    workers = max_workers or get_search_partition_workers()
+    if workers <= 1:
+        yield from iter_search_pages(object_type, properties_list, filter_groups, entity_label, sorts=SORT_BY_OBJECT_ID)
+        return
+
+    total, min_id, max_id = _probe_id_bounds(object_type, filter_groups, entity_label)
+    if not total:
+        return
+
+    partitions = max(workers, -(-total // get_search_partition_size()))
+    ranges = split_id_ranges(min_id, max_id, partitions)
+    if len(ranges) == 1:
+        yield from iter_search_pages(object_type, properties_list, filter_groups, entity_label, sorts=SORT_BY_OBJECT_ID)
+        return
+
+    print(f"🧩 {total:,} {entity_label} divididos en {len(ranges)} rangos de hs_object_id ({workers} workers)")
+    page_queues = [queue.Queue(maxsize=PARTITION_BUFFER_PAGES) for _ in ranges]
+    stop = threading.Event()
+
+    def put(page_queue, item):
+        while not stop.is_set():
+            try:
+                page_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def paginate_range(index, low, high):
+        page_queue = page_queues[index]
+        if stop.is_set():
+            return
+        try:
+            for page in iter_search_pages(
+                object_type,
+                properties_list,
+                _with_filters(filter_groups, _id_range_filters(low, high)),
+                f"{entity_label} [rango {index + 1}/{len(ranges)}]",
+                sorts=SORT_BY_OBJECT_ID
+            ):
+                if not put(page_queue, ("page", page)):
+                    return
+            put(page_queue, ("done", None))
+        except Exception as e:
+            put(page_queue, ("error", e))
+
+    # Los rangos se inician en orden: el rango que se está entregando siempre tiene un worker
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{entity_label}-range")
+    try:
+        for index, (low, high) in enumerate(ranges):
+            executor.submit(paginate_range, index, low, high)
+        for page_queue in page_queues:
+            while True:
+                kind, item = page_queue.get()
+                if kind == "done":
+                    break
+                if kind == "error":
+                    raise item
+                yield item
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_list_pages(object_type, properties_list, entity_label):
+    """
+    Pagina GET /crm/v3/objects/{tipo} con el cursor after (extracción completa).
+
+    Descripción:
+        El endpoint de listado no tiene el límite de 10,000 resultados de la
+        búsqueda y usa el límite de tasa general en lugar del de búsqueda.
+        Entrega los registros en orden ascendente de ID; se verifica en cada
+        página porque la combinación de lotes a la par depende de ese orden.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        properties_list (list): Propiedades a extraer (parámetro properties)
+        entity_label (str): Nombre de la entidad para logs
+
+    Genera:
+        list: Registros de cada página ({"id", "properties", ...})
+
+    Excepciones:
+        HubSpotAPIError: Si una página falla tras los reintentos o llega fuera de orden
+    """
+    url = f"https://api.hubapi.com/crm/v3/objects/{object_type}"
+    params = {"limit": SEARCH_PAGE_SIZE, "properties": ",".join(properties_list), "archived": "false"}
+    after = None
+    page_count = 0
+    total = 0
+    last_id = 0
+
+    while True:
+        response = hubspot_get(url, params={**params, "after": after} if after else params)
+        ensure_success(response, f"Listado de {entity_label} (página {page_count + 1})")
+
+        data = response.json()
+        records = data.get("results", [])
+        ids = [int(record["id"]) for record in records if str(record.get("id", "")).isdigit()]
+        if ids and (ids[0] <= last_id or ids != sorted(ids)):
+            raise HubSpotAPIError(
+                f"Listado de {entity_label}: página {page_count + 1} fuera de orden por ID; "
+                f"usar HUBSPOT_EXTRACTION_MODE=search"
+            )
+        if ids:
+            last_id = ids[-1]
+
+        page_count += 1
+        total += len(records)
+        print(f"📄 Página {page_count}: {len(records)} {entity_label} obtenidos (Total: {total})")
+        yield records
+
+        paging = data.get("paging")
+        if paging and paging.get("next") and paging["next"].get("after"):
+            after = paging["next"]["after"]
+        else:
+            break
+
+
+def _load_benchmarks():
+    """
+    Mediciones guardadas de los endpoints de extracción ({} si no hay)
+    """
+    try:
+        with open(EXTRACTION_BENCHMARK_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_extraction_benchmark(object_type, mode, records, properties, elapsed):
+    """
+    Guarda la velocidad de una extracción completa para el modo "auto".
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        mode (str): "search" o "list"
+        records (int): Registros extraídos
+        properties (int): Propiedades por registro
+        elapsed (float): Segundos dedicados a descargar páginas
+    """
+    if not records or elapsed <= 0:
+        return
+    with _benchmark_lock:
+        benchmarks = _load_benchmarks()
+        benchmarks.setdefault(object_type, {})[mode] = {
+            "records_per_second": round(records / elapsed, 1),
+            "records": records,
+            "properties": properties,
+            "measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        try:
+            EXTRACTION_BENCHMARK_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = EXTRACTION_BENCHMARK_FILE.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(benchmarks, f, indent=2)
+            os.replace(tmp_path, EXTRACTION_BENCHMARK_FILE)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la medición de extracción de {object_type}: {str(e)}")
+
+
+def _fastest_extraction_mode(object_type):
+    """
+    Endpoint para el modo "auto": mide primero el que no tenga medición y luego usa el más rápido
+    """
+    with _benchmark_lock:
+        if object_type in _auto_modes:
+            return _auto_modes[object_type]
+
+        measured = _load_benchmarks().get(object_type, {})
+        missing = [mode for mode in (EXTRACTION_LIST, EXTRACTION_SEARCH) if mode not in measured]
+        if missing:
+            mode = missing[0]
+            print(f"🧪 Extracción de {object_type}: midiendo endpoint '{mode}'")
+        else:
+            mode = max((EXTRACTION_LIST, EXTRACTION_SEARCH), key=lambda m: measured[m].get("records_per_second", 0))
+            rates = ", ".join(f"{m}: {measured[m].get('records_per_second', 0):,.0f} reg/s" for m in (EXTRACTION_LIST, EXTRACTION_SEARCH))
+            print(f"⚡ Extracción de {object_type}: endpoint '{mode}' ({rates})")
+        _auto_modes[object_type] = mode
+        return mode
+
+
+def get_extraction_mode(object_type):
+    """
+    Endpoint de extracción completa para un tipo de objeto.
+
+    Descripción:
+        HUBSPOT_EXTRACTION_MODE_<TIPO> tiene prioridad sobre
+        HUBSPOT_EXTRACTION_MODE. "auto" elige el endpoint más rápido medido
+        (una vez por ejecución, igual para todos los lotes de propiedades).
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+
+    Retorna:
+        str: "search" (default) o "list"
+    """
+    mode = os.getenv(f"HUBSPOT_EXTRACTION_MODE_{object_type.upper()}") or os.getenv("HUBSPOT_EXTRACTION_MODE", EXTRACTION_SEARCH)
+    mode = mode.strip().lower()
+    if mode == EXTRACTION_AUTO:
+        return _fastest_extraction_mode(object_type)
+    if mode not in (EXTRACTION_SEARCH, EXTRACTION_LIST):
+        print(f"⚠️ HUBSPOT_EXTRACTION_MODE '{mode}' no válido para {object_type}, usando '{EXTRACTION_SEARCH}'")
+        return EXTRACTION_SEARCH
+    return mode
+
+
+def _timed_pages(pages, object_type, mode, properties):
+    """
+    Entrega las páginas midiendo solo el tiempo de descarga (no el del consumidor)
+    y registra la velocidad al completar la extracción
+    """
+    elapsed = 0.0
+    records = 0
+    while True:
+        started = time.perf_counter()
+        page = next(pages, None)
+        elapsed += time.perf_counter() - started
+        if page is None:
+            break
+        records += len(page)
+        yield page
+    record_extraction_benchmark(object_type, mode, records, properties, elapsed)
+
+
+def iter_entity_pages(object_type, properties_list, last_modified_property, modified_since, entity_label):
+    """
+    Páginas de una entidad por el endpoint que corresponda.
+
+    Descripción:
+        Las extracciones completas usan get_extraction_mode() (búsqueda
+        particionada o listado) y registran su velocidad; las incrementales
+        necesitan el filtro por fecha de modificación y siempre usan búsqueda.
+        Ambos endpoints entregan los registros ordenados por hs_object_id.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        properties_list (list): Propiedades a extraer
+        last_modified_property (str): Propiedad de última modificación del objeto
+        modified_since (int): Marca de agua en epoch ms; None = extracción completa
+        entity_label (str): Nombre de la entidad para logs
+
+    Retorna:
+        iterator: Páginas de registros ({"id", "properties", ...})
+    """
+    if modified_since is not None:
+        filter_groups = build_search_filter_groups(last_modified_property, modified_since)
+        return iter_partitioned_search_pages(object_type, properties_list, filter_groups, entity_label)
+
+    mode = get_extraction_mode(object_type)
+    if mode == EXTRACTION_LIST:
+        pages = iter_list_pages(object_type, properties_list, entity_label)
+    else:
+        filter_groups = build_search_filter_groups(last_modified_property)
+        pages = iter_partitioned_search_pages(object_type, properties_list, filter_groups, entity_label)
+    return _timed_pages(pages, object_type, mode, len(properties_list))
+
+
+def split_property_batches(properties_list, batch_size):
+    """
+    Divide la lista de propiedades en lotes que siempre incluyen las esenciales.
+
+    Parámetros:
+        properties_list (list): Propiedades útiles a extraer
+        batch_size (int): Propiedades no esenciales por lote
+
+    Retorna:
+        list: Lista de lotes (cada lote es una lista de nombres de propiedades)
+    """
+    non_essential = [p for p in properties_list if p not in ESSENTIAL_PROPERTIES]
+    return [
+        ESSENTIAL_PROPERTIES + non_essential[i:i + batch_size]
+        for i in range(0, len(non_essential), batch_size)
+    ]
+
+
+def read_records_batch(object_type, record_ids, properties_list, entity_label):
+    """
+    Lee propiedades de hasta 100 registros por ID con /crm/v3/objects/{tipo}/batch/read.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        record_ids (list): IDs de los registros (máx. BATCH_READ_SIZE)
+        properties_list (list): Propiedades a leer
+        entity_label (str): Nombre de la entidad para logs
+
+    Retorna:
+        list: Registros encontrados ({"id", "properties", ...}); los IDs
+            eliminados durante la extracción se omiten (respuesta 207)
+
+    Excepciones:
+        HubSpotAPIError: Si la llamada falla después de agotar los reintentos
+    """
+    response = hubspot_post(f"https://api.hubapi.com/crm/v3/objects/{object_type}/batch/read", {
+        "properties": properties_list,
+        "inputs": [{"id": str(record_id)} for record_id in record_ids]
+    })
+    if response.status_code == 207:
+        # Multi-estado: algunos IDs ya no existen; el resto de la respuesta es válido
+        return response.json().get("results", [])
+    ensure_success(response, f"Lectura por lotes de {entity_label}")
+    return response.json().get("results", [])
+
+
+def _read_property_batches(object_type, record_ids, batches, entity_label, executor=None):
+    """
+    Lee los lotes de propiedades indicados para los IDs dados (100 IDs por llamada).
+
+    Genera:
+        list: Registros de cada llamada, en el orden de las tareas
+    """
+    tasks = [
+        (record_ids[i:i + BATCH_READ_SIZE], batch_props)
+        for batch_props in batches
+        for i in range(0, len(record_ids), BATCH_READ_SIZE)
+    ]
+    if executor:
+        return executor.map(lambda task: read_records_batch(object_type, task[0], task[1], entity_label), tasks)
+    return (read_records_batch(object_type, ids, batch_props, entity_label) for ids, batch_props in tasks)
+
+
+def _merge_batch(combined, records):
+    """
+    Combina las propiedades de un lote en el diccionario acumulado por ID - SIN PANDAS
+    """
+    for record in records:
+        props = record.get("properties", {})
+        record_id = props.get("hs_object_id")
+        if record_id:
+            if record_id not in combined:
+                combined[record_id] = {"properties": {}}
+            combined[record_id]["properties"].update(props)
+
+
+def fetch_property_batches(fetch_batch, properties_list, batch_size, entity_label, max_workers=None, object_type=None):
+    """
+    Extrae registros en lotes de propiedades y los combina por hs_object_id.
+
+    Descripción:
+        Con object_type y lectura por lotes activa, el primer lote pagina la
+        búsqueda (IDs + primeras propiedades) y los demás se leen por ID con
+        batch/read, 100 IDs por llamada, en paralelo con más de un worker.
+
+        Sin lectura por lotes, cada lote re-pagina el conjunto completo de
+        registros con un subconjunto de propiedades. Con un solo worker los
+        lotes se procesan en secuencia (comportamiento original); con más
+        workers las paginaciones corren en paralelo en un ThreadPoolExecutor
+        y se combinan en el orden de los lotes, de modo que el resultado es
+        el mismo que en modo secuencial.
+
+    Parámetros:
+        fetch_batch (callable): Función que recibe una lista de propiedades y
+            retorna los registros (ej: fetch_all_deals_with_post)
+        properties_list (list): Propiedades útiles a extraer
+        batch_size (int): Propiedades no esenciales por lote
+        entity_label (str): Nombre de la entidad para logs ("deals", "tickets"...)
+        max_workers (int): Paralelismo; usa HUBSPOT_PROPERTY_BATCH_WORKERS si se omite
+        object_type (str): "deals", "tickets" o "contacts" para leer los lotes
+            restantes con batch/read (None = re-paginar por lote)
+
+    Retorna:
+        RecordStore: Registros combinados en el almacén columnar (iterable como
+            {"properties": {...}})
+    """
+    batches = split_property_batches(properties_list, batch_size)
+    total_batches = len(batches)
+    workers = min(max_workers or get_property_batch_workers(), max(total_batches, 1))
+
+    print(f"📦 Dividiendo {len(properties_list)} propiedades en {total_batches} lotes de {batch_size}...")
+    combined = RecordStore()  # Almacén columnar: los lotes completan la fila de cada ID
+
+    if object_type and total_batches > 1 and batch_read_enabled():
+        # Primera pasada: búsqueda con el primer lote (define los registros de la extracción)
+        print(f"📦 Procesando lote 1/{total_batches} con {len(batches[0])} propiedades (búsqueda)...")
+        combined.add_records(fetch_batch(batches[0]))
+        record_ids = [record_id for record_id in combined.column_values("hs_object_id") if record_id is not None]
+
+        # Segunda pasada: lotes restantes por ID
+        calls = (total_batches - 1) * -(-len(record_ids) // BATCH_READ_SIZE)
+        workers = max_workers or get_property_batch_workers()
+        print(f"📥 Leyendo {total_batches - 1} lotes restantes de {len(record_ids)} {entity_label} con batch/read ({calls} llamadas, {workers} workers)...")
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{entity_label}-read") if workers > 1 else None
+        try:
+            for call_num, records in enumerate(_read_property_batches(object_type, record_ids, batches[1:], entity_label, executor), 1):
+                combined.add_records(records)
+                if call_num % 50 == 0 or call_num == calls:
+                    print(f"   📥 batch/read {call_num}/{calls}")
+        finally:
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+    elif workers <= 1:
+        for batch_num, batch_props in enumerate(batches, 1):
+            print(f"📦 Procesando lote {batch_num}/{total_batches} con {len(batch_props)} propiedades...")
+            combined.add_records(fetch_batch(batch_props))
+            print(f"✅ Lote {batch_num} procesado. {entity_label.capitalize()} únicos acumulados: {len(combined)}")
+    else:
+        print(f"⚡ Paginando {total_batches} lotes en paralelo con {workers} workers...")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{entity_label}-batch") as executor:
+            futures = [executor.submit(fetch_batch, batch_props) for batch_props in batches]
+            # Combinar en orden de lote para un resultado determinista
+            for batch_num, future in enumerate(futures, 1):
+                combined.add_records(future.result())
+                print(f"✅ Lote {batch_num}/{total_batches} combinado. {entity_label.capitalize()} únicos acumulados: {len(combined)}")
+
+    print(f"🎯 Combinación completa: {len(combined)} {entity_label} con datos completos")
+
+    return combined
+
+
+def _iter_pages_with_batch_read(fetch_pages, object_type, batches, entity_label, max_workers=None):
+    """
+    Pagina el primer lote de propiedades y completa cada página con batch/read de los demás lotes
+    """
+    workers = min(max_workers or get_property_batch_workers(), max(len(batches) - 1, 1))
+    print(f"📦 Paginando {len(batches)} lotes de propiedades: búsqueda + batch/read por página (streaming)...")
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{entity_label}-read") if workers > 1 else None
+    try:
+        for page in fetch_pages(batches[0]):
+            pending = {}
+            _merge_batch(pending, page)
+            for records in _read_property_batches(object_type, list(pending), batches[1:], entity_label, executor):
+                # Solo se completan los registros de la página (no se agregan IDs nuevos)
+                _merge_batch(pending, [r for r in records if r.get("properties", {}).get("hs_object_id") in pending])
+            yield list(pending.values())
+    finally:
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_property_batches_merged(fetch_pages, properties_list, batch_size, entity_label, max_workers=None, object_type=None):
+    """
+    Pagina todos los lotes de propiedades a la par y entrega registros completos por páginas.
+
+    Descripción:
+        Versión en streaming de fetch_property_batches(). Con object_type y
+        lectura por lotes activa, solo el primer lote pagina la búsqueda y
+        cada página se completa con batch/read de los lotes restantes antes
+        de entregarse.
+
+        Sin lectura por lotes, cada lote pagina
+        los mismos registros ordenados por hs_object_id; en cada ronda se
+        pide la siguiente página de todos los lotes (en paralelo con más de
+        un worker) y se entregan los registros cuyo ID ya fue superado por
+        todos los lotes, es decir, que ya tienen todas sus propiedades. La
+        memoria queda acotada a unas pocas páginas por lote.
+
+    Parámetros:
+        fetch_pages (callable): Recibe una lista de propiedades y retorna un
+            iterador de páginas ordenadas por hs_object_id
+        properties_list (list): Propiedades útiles a extraer
+        batch_size (int): Propiedades no esenciales por lote
+        entity_label (str): Nombre de la entidad para logs
+        max_workers (int): Paralelismo; usa HUBSPOT_PROPERTY_BATCH_WORKERS si se omite
+        object_type (str): "deals", "tickets" o "contacts" para completar cada
+            página con batch/read (None = paginar todos los lotes a la par)
+
+    Genera:
+        list: Registros combinados con formato {"properties": {...}}
+    """
+    batches = split_property_batches(properties_list, batch_size)
+    if object_type and len(batches) > 1 and batch_read_enabled():
+        yield from _iter_pages_with_batch_read(fetch_pages, object_type, batches, entity_label, max_workers)
+        return
+
+    iterators = [fetch_pages(batch_props) for batch_props in batches]
+    workers = min(max_workers or get_property_batch_workers(), max(len(batches), 1))
+
+    print(f"📦 Paginando {len(properties_list)} propiedades en {len(batches)} lotes a la par (streaming)...")
+    pending = {}  # Registros parciales por ID
+    frontier = [0] * len(batches)  # Mayor hs_object_id entregado por cada lote
+    active = list(range(len(batches)))
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{entity_label}-stream") if workers > 1 else None
+    try:
+        while active:
+            if executor:
+                pages = list(executor.map(lambda index: next(iterators[index], None), active))
+            else:
+                pages = [next(iterators[index], None) for index in active]
+
+            for index, page in zip(list(active), pages):
+                if page is None:
+                    # Lote agotado: ya no retiene ningún registro
+                    active.remove(index)
+                    frontier[index] = float("inf")
+                    continue
+                _merge_batch(pending, page)
+                ids = [int(r["properties"]["hs_object_id"]) for r in page if r.get("properties", {}).get("hs_object_id")]
+                if ids:
+                    frontier[index] = max(frontier[index], max(ids))
+
+            # Registros completos: todos los lotes ya pasaron su ID
+            complete_up_to = min(frontier) if frontier else float("inf")
+            ready = sorted((record_id for record_id in pending if int(record_id) <= complete_up_to), key=int)
+            if ready:
+                yield [pending.pop(record_id) for record_id in ready]
+    finally:
+        if executor:
+            executor.shutdown(wait=True)
+
+    if pending:
+        yield [pending.pop(record_id) for record_id in sorted(pending, key=int)]
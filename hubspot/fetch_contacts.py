@@ -25,12 +25,25 @@ Licencia:           Uso exclusivo del autor. Prohibida la distribución sin auto
 """
 
 import os
-import requests
-import pandas as pd
 from dotenv import load_dotenv
 from pathlib import Path
-from tabulate import tabulate
-import time
+from functools import partial
+
+from hubspot.extraction import (
+    fetch_property_batches,
+    iter_entity_pages,
+    iter_property_batches_merged,
+)
+from hubspot.http_client import hubspot_post
+from hubspot.properties import (
+    fetch_property_definitions,
+    get_loaded_property_definitions,
+    load_cached_property_analysis,
+    save_property_analysis,
+)
+from hubspot.manifest import get_manifest_properties
+from hubspot.record_store import RecordStore
+from hubspot.stats import SummaryStats
 
 # Cargar variables de entorno
 env_path = Path(__file__).resolve().parent.parent / ".env"
@@ -43,21 +56,10 @@ def get_all_contact_properties():
     """
     Obtiene todas las propiedades disponibles para contacts
     """
-    url = "https://api.hubapi.com/crm/v3/properties/contacts"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
-
     print("🔍 Obteniendo lista de propiedades de contactos...")
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            print(f"❌ Error obteniendo propiedades: {response.status_code}")
-            return []
-
-        data = response.json()
-        properties = [prop.get("name") for prop in data.get("results", []) if prop.get("name")]
+        definitions = fetch_property_definitions("contacts")
+        properties = [prop.get("name") for prop in definitions if prop.get("name")]
         print(f"✅ Propiedades de contactos disponibles: {len(properties)}")
         return properties
 
@@ -75,27 +77,39 @@ def analyze_all_contact_properties_in_chunks():
         print("❌ No se pudieron obtener las propiedades")
         return []
 
+    # Reutilizar el análisis previo si no expiró y el esquema no cambió
+    definitions = get_loaded_property_definitions("contacts")
+    cached_properties = load_cached_property_analysis("contacts", definitions)
+    if cached_properties:
+        return cached_properties
+
     print(f"🎯 Analizando TODAS las {len(all_properties)} propiedades de contactos en lotes...")
     
     # Dividir en chunks de 80 propiedades
     chunk_size = 80
     properties_with_data = []
+    failed_chunks = 0
     
     for i in range(0, len(all_properties), chunk_size):
         chunk = all_properties[i:i+chunk_size]
         print(f"📦 Analizando lote {i//chunk_size + 1}/{(len(all_properties)-1)//chunk_size + 1}: {len(chunk)} propiedades")
         
         chunk_results = analyze_contact_chunk_with_post(chunk, chunk_number=i//chunk_size + 1)
-        if chunk_results:
+        if chunk_results is None:
+            failed_chunks += 1
+        elif chunk_results:
             properties_with_data.extend(chunk_results)
-        
-        # Pequeña pausa para no sobrecargar la API
-        time.sleep(0.5)
     
     # Remover duplicados y ordenar
     properties_with_data = list(set(properties_with_data))
     print(f"🎉 TOTAL de propiedades de contactos con datos: {len(properties_with_data)}")
     
+    # Solo se guarda en caché un análisis completo (sin lotes fallidos)
+    if failed_chunks:
+        print(f"⚠️ {failed_chunks} lotes fallaron; el análisis no se guarda en caché")
+    else:
+        save_property_analysis("contacts", definitions, properties_with_data)
+
     return properties_with_data
 
 def analyze_contact_chunk_with_post(properties_chunk, chunk_number=1):
@@ -103,10 +117,6 @@ def analyze_contact_chunk_with_post(properties_chunk, chunk_number=1):
     Analiza un lote de propiedades de contactos usando POST
     """
     url = "https://api.hubapi.com/crm/v3/objects/contacts/search"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
 
     # Payload para POST
     payload = {
@@ -125,10 +135,10 @@ def analyze_contact_chunk_with_post(properties_chunk, chunk_number=1):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = hubspot_post(url, payload)
         if response.status_code != 200:
             print(f"❌ Error en lote {chunk_number}: {response.status_code}")
-            return []
+            return None
 
         data = response.json()
         sample_contacts = data.get("results", [])
@@ -146,7 +156,7 @@ def analyze_contact_chunk_with_post(properties_chunk, chunk_number=1):
 
     except Exception as e:
         print(f"❌ Error en lote {chunk_number}: {str(e)}")
-        return []
+        return None
 
 def analyze_contact_properties_in_chunk(sample_contacts, properties_chunk):
     """
@@ -182,7 +192,43 @@ def analyze_contact_properties_in_chunk(sample_contacts, properties_chunk):
 
     return properties_with_data
 
-def fetch_contacts_from_hubspot():
+def prepare_contact_properties():
+    """
+    Análisis de propiedades (fase 1 de la extracción) compartido por la extracción
+    completa y la extracción en streaming.
+
+    Retorna:
+        list: Propiedades útiles (actualiza también CONTACT_PROPERTIES)
+    """
+    # ==================== FASE 1: ANÁLISIS DE PROPIEDADES ====================
+    # Con manifiesto declarado (hubspot/manifest.py) se omite el análisis: esquema estable
+    properties_with_data = get_manifest_properties("contacts")
+    if properties_with_data:
+        print("📜 Propiedades tomadas del manifiesto, sin análisis dinámico")
+    else:
+        # Analizar TODAS las propiedades disponibles para encontrar las útiles
+        print("🚀 Iniciando análisis COMPLETO de propiedades de CONTACTOS...")
+        properties_with_data = analyze_all_contact_properties_in_chunks()
+    
+    # ==================== FALLBACK: PROPIEDADES BÁSICAS ====================
+    # Si falla el análisis, usar conjunto mínimo de propiedades esenciales para contactos
+    if not properties_with_data:
+        print("⚠️ No se pudo analizar propiedades. Usando básicas...")
+        properties_with_data = [
+            "hs_object_id", "email", "firstname", "lastname", "phone", 
+            "company", "createdate", "lastmodifieddate", "hubspot_owner_id"
+        ]
+    
+    # ==================== ACTUALIZACIÓN DE VARIABLE GLOBAL ====================
+    # Actualizar la lista global para uso en otras funciones del módulo
+    global CONTACT_PROPERTIES
+    CONTACT_PROPERTIES = properties_with_data
+    
+    print(f"\n🎯 Obteniendo TODOS los contactos con {len(properties_with_data)} propiedades útiles...")
+
+    return properties_with_data
+
+def fetch_contacts_from_hubspot(modified_since=None):
     """
     Función principal para extracción completa de contactos desde HubSpot API.
     
@@ -208,9 +254,16 @@ def fetch_contacts_from_hubspot():
         - fetch_all_contacts_with_post(): Para extracción masiva optimizada
         - Variable global CONTACT_PROPERTIES: Para almacenar propiedades útiles
         
+    Parámetros:
+        modified_since (int): Marca de agua en epoch ms (modo incremental);
+            None extrae todos los registros
+
     Retorna:
         list: Lista de diccionarios con contactos y sus propiedades
-        list vacía: En caso de error o no encontrar datos
+        list vacía: Si no se encuentran datos
+
+    Excepciones:
+        HubSpotAPIError: Si una página falla después de agotar los reintentos
         
     Efectos Secundarios:
         - Actualiza CONTACT_PROPERTIES global
@@ -227,142 +280,77 @@ def fetch_contacts_from_hubspot():
         - Propiedades analizadas: ~260 de 568 disponibles
         - Eficiencia: ~54% de optimización en propiedades
     """
-    # ==================== FASE 1: ANÁLISIS DE PROPIEDADES ====================
-    # Analizar TODAS las propiedades disponibles para encontrar las útiles
-    print("🚀 Iniciando análisis COMPLETO de propiedades de CONTACTOS...")
-    properties_with_data = analyze_all_contact_properties_in_chunks()
-    
-    # ==================== FALLBACK: PROPIEDADES BÁSICAS ====================
-    # Si falla el análisis, usar conjunto mínimo de propiedades esenciales para contactos
-    if not properties_with_data:
-        print("⚠️ No se pudo analizar propiedades. Usando básicas...")
-        properties_with_data = [
-            "hs_object_id", "email", "firstname", "lastname", "phone", 
-            "company", "createdate", "lastmodifieddate", "hubspot_owner_id"
-        ]
-    
-    # ==================== ACTUALIZACIÓN DE VARIABLE GLOBAL ====================
-    # Actualizar la lista global para uso en otras funciones del módulo
-    global CONTACT_PROPERTIES
-    CONTACT_PROPERTIES = properties_with_data
-    
-    print(f"\n🎯 Obteniendo TODOS los contactos con {len(properties_with_data)} propiedades útiles...")
-    
+    properties_with_data = prepare_contact_properties()
+
     # Usar POST para obtener todos los contactos
-    return fetch_all_contacts_with_post(properties_with_data)
+    return fetch_all_contacts_with_post(properties_with_data, modified_since)
 
-def fetch_all_contacts_with_post(properties_list):
+def fetch_all_contacts_with_post(properties_list, modified_since=None):
     """
     Obtiene todos los contactos usando POST dividiendo las propiedades si es necesario
+
+    Parámetros:
+        properties_list (list): Propiedades a extraer
+        modified_since (int): Marca de agua en epoch ms para extracción
+            incremental; None extrae todos los registros
     """
     # Si hay demasiadas propiedades, hacer múltiples calls
     if len(properties_list) > 100:
         print(f"⚠️ Demasiadas propiedades ({len(properties_list)}), dividiendo en lotes...")
-        return fetch_contacts_in_property_batches(properties_list)
+        return fetch_contacts_in_property_batches(properties_list, modified_since)
     
-    url = "https://api.hubapi.com/crm/v3/objects/contacts/search"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
-
-    all_contacts = []
-    after = None
-    page_count = 0
-
-    while True:
-        # Payload para POST
-        payload = {
-            "limit": 100,
-            "properties": properties_list,
-            "filterGroups": [
-                {
-                    "filters": [
-                        {
-                            "propertyName": "hs_object_id",
-                            "operator": "HAS_PROPERTY"
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        # Agregar paginación si existe
-        if after:
-            payload["after"] = after
-
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-            if response.status_code != 200:
-                print(f"❌ Error HTTP {response.status_code}")
-                print(f"❌ Respuesta: {response.text}")
-                break
-
-            data = response.json()
-            contacts = data.get("results", [])
-            all_contacts.extend(contacts)
-            page_count += 1
-            
-            print(f"📄 Página {page_count}: {len(contacts)} contactos obtenidos (Total: {len(all_contacts)})")
-
-            # Verificar si hay más páginas
-            paging = data.get("paging")
-            if paging and paging.get("next") and paging["next"].get("after"):
-                after = paging["next"]["after"]
-            else:
-                break
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error en la petición: {str(e)}")
-            break
-        except Exception as e:
-            print(f"❌ Error inesperado: {str(e)}")
-            break
+    # Almacén columnar en lugar de una lista de diccionarios por registro
+    all_contacts = RecordStore()
+    for page in iter_entity_pages("contacts", properties_list, "lastmodifieddate", modified_since, "contactos"):
+        all_contacts.add_records(page)
 
     print(f"✅ Total de contactos obtenidos: {len(all_contacts)}")
     return all_contacts
 
-def fetch_contacts_in_property_batches(properties_list):
+def fetch_contacts_in_property_batches(properties_list, modified_since=None):
     """
     Obtiene contactos en lotes de propiedades y luego los combina
+
+    El primer lote pagina la búsqueda y los demás se leen por ID con batch/read
+    (HUBSPOT_PROPERTY_BATCH_READ); con HUBSPOT_PROPERTY_BATCH_WORKERS > 1 las
+    llamadas corren en paralelo
     """
-    print(f"📦 Dividiendo {len(properties_list)} propiedades en lotes de 80...")
-    
-    # Propiedades esenciales que deben estar en todos los lotes
-    essential_props = ["hs_object_id"]
-    
-    # Dividir propiedades no esenciales en lotes
-    non_essential = [p for p in properties_list if p not in essential_props]
-    batch_size = 80
-    
-    all_contacts_data = {}  # Diccionario para combinar datos por ID
-    
-    for i in range(0, len(non_essential), batch_size):
-        batch_props = essential_props + non_essential[i:i+batch_size]
-        batch_num = i//batch_size + 1
-        total_batches = (len(non_essential)-1)//batch_size + 1
-        
-        print(f"📦 Procesando lote {batch_num}/{total_batches} con {len(batch_props)} propiedades...")
-        
-        batch_contacts = fetch_all_contacts_with_post(batch_props)
-        
-        # Combinar datos por ID
-        for contact in batch_contacts:
-            contact_id = contact.get("properties", {}).get("hs_object_id")
-            if contact_id:
-                if contact_id not in all_contacts_data:
-                    all_contacts_data[contact_id] = {"properties": {}}
-                
-                # Combinar propiedades
-                all_contacts_data[contact_id]["properties"].update(contact.get("properties", {}))
-        
-        print(f"✅ Lote {batch_num} procesado. Contactos únicos acumulados: {len(all_contacts_data)}")
-    
-    # Convertir diccionario de vuelta a lista
-    combined_contacts = list(all_contacts_data.values())
-    print(f"🎯 Combinación completa: {len(combined_contacts)} contactos con datos completos")
-    
-    return combined_contacts
+    fetch_batch = partial(fetch_all_contacts_with_post, modified_since=modified_since)
+    return fetch_property_batches(fetch_batch, properties_list, batch_size=80, entity_label="contactos", object_type="contacts")
+
+def iter_contact_pages(properties_list, modified_since=None):
+    """
+    Páginas de contactos a medida que llegan, sin acumular la extracción completa
+
+    Con más de 100 propiedades los lotes se paginan a la par ordenados por
+    hs_object_id y cada página entregada trae los registros ya combinados.
+
+    Parámetros:
+        properties_list (list): Propiedades a extraer
+        modified_since (int): Marca de agua en epoch ms; None extrae todos los registros
+
+    Retorna:
+        iterator: Listas de registros con formato {"properties": {...}}
+    """
+    if len(properties_list) > 100:
+        return iter_property_batches_merged(
+            lambda batch_props: iter_entity_pages("contacts", batch_props, "lastmodifieddate", modified_since, "contactos"),
+            properties_list, batch_size=80, entity_label="contactos", object_type="contacts"
+        )
+    return iter_entity_pages("contacts", properties_list, "lastmodifieddate", modified_since, "contactos")
+
+def stream_contacts_from_hubspot(modified_since=None):
+    """
+    Extracción en streaming: análisis de propiedades + generador de páginas
+
+    Parámetros:
+        modified_since (int): Marca de agua en epoch ms; None extrae todos los registros
+
+    Retorna:
+        tuple: (propiedades útiles, iterador de páginas de iter_contact_pages())
+    """
+    properties_with_data = prepare_contact_properties()
+    return properties_with_data, iter_contact_pages(properties_with_data, modified_since)
 
 def get_all_contact_properties_list():
     """
@@ -373,6 +361,10 @@ def get_all_contact_properties_list():
 def display_contacts_summary(contacts):
     """
     Muestra un resumen extendido de contactos
+
+    Parámetros:
+        contacts: RecordStore, lista de registros o SummaryStats ya acumulado
+            página a página (carga en streaming)
     """
     if not contacts:
         print("⚠️ No hay contactos para mostrar")
@@ -381,33 +373,17 @@ def display_contacts_summary(contacts):
     print(f"\n📊 RESUMEN EXTENDIDO DE CONTACTOS ({len(contacts)} total)")
     print("=" * 60)
     
-    # Crear DataFrame para análisis
-    all_props_data = []
-    for contact in contacts:
-        all_props_data.append(contact.get("properties", {}))
-    
-    df = pd.DataFrame(all_props_data)
+    # Estadísticas en una sola pasada (cada celda se evalúa una vez, sin DataFrame)
+    stats = contacts if isinstance(contacts, SummaryStats) else SummaryStats.for_entity("contacts").add(contacts)
     
     # Mostrar estadísticas de completitud de datos
     print("\n📈 ESTADÍSTICAS DE COMPLETITUD DE DATOS:")
-    prop_stats = []
-    for col in df.columns:
-        actual_data_count = ((df[col].notna()) & (df[col] != "") & (df[col] != "None")).sum()
-        
-        if actual_data_count > 0:
-            prop_stats.append({
-                "propiedad": col,
-                "con_datos": actual_data_count,
-                "porcentaje": (actual_data_count / len(df)) * 100
-            })
-    
-    # Ordenar por porcentaje
-    prop_stats.sort(key=lambda x: x["porcentaje"], reverse=True)
+    prop_stats = stats.completeness()
     
     # Mostrar top 15
     print("\n🔝 TOP 15 PROPIEDADES DE CONTACTOS CON MÁS DATOS:")
     for i, stat in enumerate(prop_stats[:15], 1):
-        print(f"   {i:2d}. {stat['propiedad']:<30} {stat['porcentaje']:5.1f}% ({stat['con_datos']}/{len(df)})")
+        print(f"   {i:2d}. {stat['propiedad']:<30} {stat['porcentaje']:5.1f}% ({stat['con_datos']}/{stats.total})")
     
     # Estadísticas generales
     total_props = len(CONTACT_PROPERTIES)
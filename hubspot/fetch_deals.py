@@ -25,6 +25,7 @@ Dependencias Externas:
 
 Funciones Exportadas:
     - fetch_deals_from_hubspot(): Extracción principal de deals
+    - stream_deals_from_hubspot(): Extracción página a página para carga en streaming
     - get_all_deal_properties_list(): Lista de propiedades útiles
     - display_extended_summary(): Generación de resúmenes estadísticos
 
@@ -38,10 +39,26 @@ Licencia:           Uso exclusivo del autor. Prohibida la distribución sin auto
 
 # ==================== IMPORTS DE LIBRERÍAS ====================
 import os                       # Variables de entorno del sistema
-import requests                 # Cliente HTTP para API de HubSpot
 from dotenv import load_dotenv  # Carga de configuración desde .env
 from pathlib import Path        # Manejo de rutas multiplataforma
-import time                     # Control de timing y delays
+from functools import partial   # Lotes de propiedades con marca de agua
+
+from hubspot.extraction import (
+    fetch_property_batches,
+    iter_entity_pages,
+    iter_property_batches_merged,
+)
+# Transporte HTTP compartido
+from hubspot.http_client import hubspot_post
+from hubspot.properties import (
+    fetch_property_definitions,
+    get_loaded_property_definitions,
+    load_cached_property_analysis,
+    save_property_analysis,
+)
+from hubspot.manifest import get_manifest_properties
+from hubspot.record_store import RecordStore
+from hubspot.stats import SummaryStats
 
 # ==================== CONFIGURACIÓN INICIAL ====================
 # Carga las variables de entorno desde el archivo .env del directorio padre
@@ -82,22 +99,11 @@ def get_all_deal_properties():
     Uso:
         Llamada desde analyze_all_properties_in_chunks() para análisis dinámico
     """
-    url = "https://api.hubapi.com/crm/v3/properties/deals"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
-
     print("🔍 Obteniendo lista de propiedades disponibles...")
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            print(f"❌ Error obteniendo propiedades: {response.status_code}")
-            return []
-
-        data = response.json()
+        definitions = fetch_property_definitions("deals")
         # Extraer nombres de propiedades válidas
-        properties = [prop.get("name") for prop in data.get("results", []) if prop.get("name")]
+        properties = [prop.get("name") for prop in definitions if prop.get("name")]
         print(f"✅ Propiedades disponibles: {len(properties)}")
         return properties
 
@@ -137,8 +143,12 @@ def analyze_all_properties_in_chunks():
     Efectos Secundarios:
         Actualiza la variable global DEAL_PROPERTIES
         
+    Caché:
+        El resultado se guarda en disco (hubspot/properties.py) y se reutiliza
+        mientras no expire el TTL ni cambie el esquema de propiedades.
+
     Performance:
-        Tiempo estimado: 30-60 segundos para ~900 propiedades
+        Tiempo estimado: 30-60 segundos para ~900 propiedades (1 llamada con caché vigente)
     """
     # Obtener lista completa de propiedades disponibles
     all_properties = get_all_deal_properties()
@@ -147,27 +157,39 @@ def analyze_all_properties_in_chunks():
         print("❌ No se pudieron obtener las propiedades")
         return []
 
+    # Reutilizar el análisis previo si no expiró y el esquema no cambió
+    definitions = get_loaded_property_definitions("deals")
+    cached_properties = load_cached_property_analysis("deals", definitions)
+    if cached_properties:
+        return cached_properties
+
     print(f"🎯 Analizando TODAS las {len(all_properties)} propiedades en lotes...")
     
     # Dividir en chunks de 80 propiedades (más agresivo)
     chunk_size = 80
     properties_with_data = []
+    failed_chunks = 0
     
     for i in range(0, len(all_properties), chunk_size):
         chunk = all_properties[i:i+chunk_size]
         print(f"📦 Analizando lote {i//chunk_size + 1}/{(len(all_properties)-1)//chunk_size + 1}: {len(chunk)} propiedades")
         
         chunk_results = analyze_chunk_with_post(chunk, chunk_number=i//chunk_size + 1)
-        if chunk_results:
+        if chunk_results is None:
+            failed_chunks += 1
+        elif chunk_results:
             properties_with_data.extend(chunk_results)
-        
-        # Pequeña pausa para no sobrecargar la API
-        time.sleep(0.5)
     
     # Remover duplicados y ordenar
     properties_with_data = list(set(properties_with_data))
     print(f"🎉 TOTAL de propiedades con datos encontradas: {len(properties_with_data)}")
     
+    # Solo se guarda en caché un análisis completo (sin lotes fallidos)
+    if failed_chunks:
+        print(f"⚠️ {failed_chunks} lotes fallaron; el análisis no se guarda en caché")
+    else:
+        save_property_analysis("deals", definitions, properties_with_data)
+
     return properties_with_data
 
 def analyze_chunk_with_post(properties_chunk, chunk_number=1):
@@ -175,10 +197,6 @@ def analyze_chunk_with_post(properties_chunk, chunk_number=1):
     Analiza un lote de propiedades usando POST
     """
     url = "https://api.hubapi.com/crm/v3/objects/deals/search"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
 
     # Payload para POST
     payload = {
@@ -197,10 +215,10 @@ def analyze_chunk_with_post(properties_chunk, chunk_number=1):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = hubspot_post(url, payload)
         if response.status_code != 200:
             print(f"❌ Error en lote {chunk_number}: {response.status_code}")
-            return []
+            return None
 
         data = response.json()
         sample_deals = data.get("results", [])
@@ -218,7 +236,7 @@ def analyze_chunk_with_post(properties_chunk, chunk_number=1):
 
     except Exception as e:
         print(f"❌ Error en lote {chunk_number}: {str(e)}")
-        return []
+        return None
 
 def analyze_properties_in_chunk(sample_deals, properties_chunk):
     """
@@ -254,7 +272,46 @@ def analyze_properties_in_chunk(sample_deals, properties_chunk):
 
     return properties_with_data
 
-def fetch_deals_from_hubspot():
+def prepare_deal_properties():
+    """
+    Análisis de propiedades (fase 1 de la extracción) compartido por la extracción
+    completa y la extracción en streaming.
+
+    Retorna:
+        list: Propiedades útiles (actualiza también DEAL_PROPERTIES)
+    """
+    # ==================== FASE 1: ANÁLISIS DE PROPIEDADES ====================
+    # Con manifiesto declarado (hubspot/manifest.py) se omite el análisis: esquema estable
+    properties_with_data = get_manifest_properties("deals")
+    if properties_with_data:
+        print("📜 Propiedades tomadas del manifiesto, sin análisis dinámico")
+    else:
+        # Analizar TODAS las propiedades disponibles para encontrar las útiles
+        print("🚀 Iniciando análisis COMPLETO de propiedades...")
+        properties_with_data = analyze_all_properties_in_chunks()
+    
+    # ==================== FALLBACK: PROPIEDADES BÁSICAS ====================
+    # Si falla el análisis, usar conjunto mínimo de propiedades esenciales
+    if not properties_with_data:
+        print("⚠️ No se pudo analizar propiedades. Usando básicas...")
+        properties_with_data = [
+            "hs_object_id", "dealname", "amount", "dealstage", "pipeline", 
+            "closedate", "createdate", "hubspot_owner_id", "dealtype"
+        ]
+    
+    # ==================== ACTUALIZACIÓN DE VARIABLE GLOBAL ====================
+    # Actualizar la lista global para uso en otras funciones del módulo
+    global DEAL_PROPERTIES
+    DEAL_PROPERTIES = properties_with_data
+    
+    # ==================== ESTADÍSTICAS DE OPTIMIZACIÓN ====================
+    # Mostrar eficiencia del filtrado de propiedades
+    print(f"\n🎯 Obteniendo TODOS los deals con {len(properties_with_data)} propiedades útiles...")
+    print(f"📊 Esto representa {len(properties_with_data)/905*100:.1f}% de todas las propiedades disponibles")
+
+    return properties_with_data
+
+def fetch_deals_from_hubspot(modified_since=None):
     """
     Función principal para extracción completa de deals desde HubSpot API.
     
@@ -280,9 +337,16 @@ def fetch_deals_from_hubspot():
         - fetch_all_deals_with_post(): Para extracción masiva optimizada
         - Variable global DEAL_PROPERTIES: Para almacenar propiedades útiles
         
+    Parámetros:
+        modified_since (int): Marca de agua en epoch ms (modo incremental);
+            None extrae todos los registros
+
     Retorna:
         list: Lista de diccionarios con deals y sus propiedades
-        list vacía: En caso de error o no encontrar datos
+        list vacía: Si no se encuentran datos
+
+    Excepciones:
+        HubSpotAPIError: Si una página falla después de agotar los reintentos
         
     Efectos Secundarios:
         - Actualiza DEAL_PROPERTIES global
@@ -294,146 +358,78 @@ def fetch_deals_from_hubspot():
     Performance:
         Tiempo estimado: 2-5 minutos para ~2000 deals con ~100 propiedades
     """
-    # ==================== FASE 1: ANÁLISIS DE PROPIEDADES ====================
-    # Analizar TODAS las propiedades disponibles para encontrar las útiles
-    print("🚀 Iniciando análisis COMPLETO de propiedades...")
-    properties_with_data = analyze_all_properties_in_chunks()
-    
-    # ==================== FALLBACK: PROPIEDADES BÁSICAS ====================
-    # Si falla el análisis, usar conjunto mínimo de propiedades esenciales
-    if not properties_with_data:
-        print("⚠️ No se pudo analizar propiedades. Usando básicas...")
-        properties_with_data = [
-            "hs_object_id", "dealname", "amount", "dealstage", "pipeline", 
-            "closedate", "createdate", "hubspot_owner_id", "dealtype"
-        ]
-    
-    # ==================== ACTUALIZACIÓN DE VARIABLE GLOBAL ====================
-    # Actualizar la lista global para uso en otras funciones del módulo
-    global DEAL_PROPERTIES
-    DEAL_PROPERTIES = properties_with_data
-    
-    # ==================== ESTADÍSTICAS DE OPTIMIZACIÓN ====================
-    # Mostrar eficiencia del filtrado de propiedades
-    print(f"\n🎯 Obteniendo TODOS los deals con {len(properties_with_data)} propiedades útiles...")
-    print(f"📊 Esto representa {len(properties_with_data)/905*100:.1f}% de todas las propiedades disponibles")
-    
+    properties_with_data = prepare_deal_properties()
+
     # ==================== FASE 2: EXTRACCIÓN MASIVA ====================
     # Usar método POST optimizado para obtener todos los deals
-    return fetch_all_deals_with_post(properties_with_data)
+    return fetch_all_deals_with_post(properties_with_data, modified_since)
 
-def fetch_all_deals_with_post(properties_list):
+def fetch_all_deals_with_post(properties_list, modified_since=None):
     """
     Obtiene todos los deals usando POST dividiendo las propiedades si es necesario
+
+    Parámetros:
+        properties_list (list): Propiedades a extraer
+        modified_since (int): Marca de agua en epoch ms para extracción
+            incremental; None extrae todos los registros
     """
     # Si hay demasiadas propiedades, hacer múltiples calls
     if len(properties_list) > 100:
         print(f"⚠️ Demasiadas propiedades ({len(properties_list)}), dividiendo en lotes...")
-        return fetch_deals_in_property_batches(properties_list)
+        return fetch_deals_in_property_batches(properties_list, modified_since)
     
-    url = "https://api.hubapi.com/crm/v3/objects/deals/search"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
-
-    all_deals = []
-    after = None
-    page_count = 0
-
-    while True:
-        # Payload para POST
-        payload = {
-            "limit": 100,
-            "properties": properties_list,
-            "filterGroups": [
-                {
-                    "filters": [
-                        {
-                            "propertyName": "hs_object_id",
-                            "operator": "HAS_PROPERTY"
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        # Agregar paginación si existe
-        if after:
-            payload["after"] = after
-
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-            if response.status_code != 200:
-                print(f"❌ Error HTTP {response.status_code}")
-                print(f"❌ Respuesta: {response.text}")
-                break
-
-            data = response.json()
-            deals = data.get("results", [])
-            all_deals.extend(deals)
-            page_count += 1
-            
-            print(f"📄 Página {page_count}: {len(deals)} deals obtenidos (Total: {len(all_deals)})")
-
-            # Verificar si hay más páginas
-            paging = data.get("paging")
-            if paging and paging.get("next") and paging["next"].get("after"):
-                after = paging["next"]["after"]
-            else:
-                break
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error en la petición: {str(e)}")
-            break
-        except Exception as e:
-            print(f"❌ Error inesperado: {str(e)}")
-            break
+    # Almacén columnar en lugar de una lista de diccionarios por registro
+    all_deals = RecordStore()
+    for page in iter_entity_pages("deals", properties_list, "hs_lastmodifieddate", modified_since, "deals"):
+        all_deals.add_records(page)
 
     print(f"✅ Total de deals obtenidos: {len(all_deals)}")
     return all_deals
 
-def fetch_deals_in_property_batches(properties_list):
+def fetch_deals_in_property_batches(properties_list, modified_since=None):
     """
     Obtiene deals en lotes de propiedades y luego los combina - SIN PANDAS
+
+    El primer lote pagina la búsqueda y los demás se leen por ID con batch/read
+    (HUBSPOT_PROPERTY_BATCH_READ); con HUBSPOT_PROPERTY_BATCH_WORKERS > 1 las
+    llamadas corren en paralelo
     """
-    print(f"📦 Dividiendo {len(properties_list)} propiedades en lotes de 80...")
-    
-    # Propiedades esenciales que deben estar en todos los lotes
-    essential_props = ["hs_object_id"]
-    
-    # Dividir propiedades no esenciales en lotes
-    non_essential = [p for p in properties_list if p not in essential_props]
-    batch_size = 80
-    
-    all_deals_data = {}  # Diccionario para combinar datos por ID
-    
-    for i in range(0, len(non_essential), batch_size):
-        batch_props = essential_props + non_essential[i:i+batch_size]
-        batch_num = i//batch_size + 1
-        total_batches = (len(non_essential)-1)//batch_size + 1
-        
-        print(f"📦 Procesando lote {batch_num}/{total_batches} con {len(batch_props)} propiedades...")
-        
-        batch_deals = fetch_all_deals_with_post(batch_props)
-        
-        # Combinar datos por ID - SIN PANDAS
-        for deal in batch_deals:
-            deal_id = deal.get("properties", {}).get("hs_object_id")
-            if deal_id:
-                if deal_id not in all_deals_data:
-                    all_deals_data[deal_id] = {"properties": {}}
-                
-                # Combinar propiedades
-                all_deals_data[deal_id]["properties"].update(deal.get("properties", {}))
-        
-        print(f"✅ Lote {batch_num} procesado. Deals únicos acumulados: {len(all_deals_data)}")
-    
-    # Convertir diccionario de vuelta a lista
-    combined_deals = list(all_deals_data.values())
-    print(f"🎯 Combinación completa: {len(combined_deals)} deals con datos completos")
-    
-    return combined_deals
+    fetch_batch = partial(fetch_all_deals_with_post, modified_since=modified_since)
+    return fetch_property_batches(fetch_batch, properties_list, batch_size=80, entity_label="deals", object_type="deals")
+
+def iter_deal_pages(properties_list, modified_since=None):
+    """
+    Páginas de deals a medida que llegan, sin acumular la extracción completa
+
+    Con más de 100 propiedades los lotes se paginan a la par ordenados por
+    hs_object_id y cada página entregada trae los registros ya combinados.
+
+    Parámetros:
+        properties_list (list): Propiedades a extraer
+        modified_since (int): Marca de agua en epoch ms; None extrae todos los registros
+
+    Retorna:
+        iterator: Listas de registros con formato {"properties": {...}}
+    """
+    if len(properties_list) > 100:
+        return iter_property_batches_merged(
+            lambda batch_props: iter_entity_pages("deals", batch_props, "hs_lastmodifieddate", modified_since, "deals"),
+            properties_list, batch_size=80, entity_label="deals", object_type="deals"
+        )
+    return iter_entity_pages("deals", properties_list, "hs_lastmodifieddate", modified_since, "deals")
+
+def stream_deals_from_hubspot(modified_since=None):
+    """
+    Extracción en streaming: análisis de propiedades + generador de páginas
+
+    Parámetros:
+        modified_since (int): Marca de agua en epoch ms; None extrae todos los registros
+
+    Retorna:
+        tuple: (propiedades útiles, iterador de páginas de iter_deal_pages())
+    """
+    properties_with_data = prepare_deal_properties()
+    return properties_with_data, iter_deal_pages(properties_with_data, modified_since)
 
 def get_all_deal_properties_list():
     """
@@ -444,6 +440,10 @@ def get_all_deal_properties_list():
 def display_extended_summary(deals):
     """
     Muestra un resumen extendido con más detalles - SIN PANDAS
+
+    Parámetros:
+        deals: RecordStore, lista de registros o SummaryStats ya acumulado
+            página a página (carga en streaming)
     """
     if not deals:
         print("⚠️ No hay deals para mostrar")
@@ -452,43 +452,17 @@ def display_extended_summary(deals):
     print(f"\n📊 RESUMEN EXTENDIDO DE DEALS ({len(deals)} total)")
     print("=" * 60)
     
-    # Análisis manual SIN PANDAS
-    all_properties = set()
-    deals_data = []
-    
-    for deal in deals:
-        props = deal.get("properties", {})
-        deals_data.append(props)
-        all_properties.update(props.keys())
+    # Estadísticas en una sola pasada (cada celda se evalúa una vez)
+    stats = deals if isinstance(deals, SummaryStats) else SummaryStats.for_entity("deals").add(deals)
+    total_count = stats.total
     
     print(f"\n📈 ESTADÍSTICAS DE COMPLETITUD DE DATOS:")
-    
-    # Calcular estadísticas manualmente
-    prop_stats = []
-    for prop_name in all_properties:
-        total_count = len(deals_data)
-        with_data_count = 0
-        
-        for props in deals_data:
-            value = props.get(prop_name)
-            if value and str(value).strip() and str(value) not in ["None", "null", ""]:
-                with_data_count += 1
-        
-        if with_data_count > 0:
-            percentage = (with_data_count / total_count) * 100
-            prop_stats.append({
-                "propiedad": prop_name,
-                "con_datos": with_data_count,
-                "porcentaje": percentage
-            })
-    
-    # Ordenar por porcentaje
-    prop_stats.sort(key=lambda x: x["porcentaje"], reverse=True)
+    prop_stats = stats.completeness()
     
     # Mostrar top 15
     print("\n🔝 TOP 15 PROPIEDADES CON MÁS DATOS:")
     for i, stat in enumerate(prop_stats[:15], 1):
-        print(f"   {i:2d}. {stat['propiedad']:<30} {stat['porcentaje']:5.1f}% ({stat['con_datos']}/{len(deals_data)})")
+        print(f"   {i:2d}. {stat['propiedad']:<30} {stat['porcentaje']:5.1f}% ({stat['con_datos']}/{total_count})")
     
     # Estadísticas generales
     total_props = len(DEAL_PROPERTIES)
@@ -502,31 +476,12 @@ def display_extended_summary(deals):
     print(f"   📉 Con datos en <10% de deals: {total_props - props_with_10_percent}")
 
     # Agregar estadísticas específicas de deals
-    deals_by_stage = {}
-    deals_by_pipeline = {}
-    total_amount = 0
-    deals_with_amount = 0
-    
-    for props in deals_data:
-        # Analizar por stage
-        stage = props.get("dealstage", "Sin stage")
-        deals_by_stage[stage] = deals_by_stage.get(stage, 0) + 1
-        
-        # Analizar por pipeline
-        pipeline = props.get("pipeline", "Sin pipeline")
-        deals_by_pipeline[pipeline] = deals_by_pipeline.get(pipeline, 0) + 1
-        
-        # Analizar amounts
-        amount = props.get("amount")
-        if amount and str(amount).replace(".", "").replace(",", "").isdigit():
-            try:
-                total_amount += float(amount)
-                deals_with_amount += 1
-            except (ValueError, TypeError):
-                pass
+    deals_by_stage = stats.value_counts["dealstage"]
+    deals_by_pipeline = stats.value_counts["pipeline"]
+    total_amount, deals_with_amount = stats.numeric_summary("amount")
     
     print(f"\n💰 ESTADÍSTICAS DE DEALS:")
-    print(f"   📊 Total de deals: {len(deals_data)}")
+    print(f"   📊 Total de deals: {total_count}")
     print(f"   💵 Deals con monto: {deals_with_amount}")
     if deals_with_amount > 0:
         avg_amount = total_amount / deals_with_amount
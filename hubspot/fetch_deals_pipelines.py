@@ -28,6 +28,8 @@ import requests
 from dotenv import load_dotenv
 from pathlib import Path
 
+from hubspot.http_client import hubspot_get
+
 # Cargar variables de entorno
 env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -98,19 +100,15 @@ def fetch_deal_pipelines_as_table():
         - Metadatos vacíos: Se preservan como campos vacíos
     """
     # ==================== CONFIGURACIÓN DE API ====================
-    # Configurar endpoint y headers para consulta de pipelines de deals
+    # Configurar endpoint para consulta de pipelines de deals
     url = "https://api.hubapi.com/crm/v3/pipelines/deals"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
 
     print("🔄 Obteniendo pipelines de deals...")
     
     try:
         # ==================== CONSULTA A HUBSPOT API ====================
         # Realizar petición HTTP para obtener pipelines de deals
-        response = requests.get(url, headers=headers)
+        response = hubspot_get(url)
         if response.status_code != 200:
             print(f"❌ Error obteniendo pipelines: {response.status_code}")
             print(f"❌ Respuesta: {response.text}")
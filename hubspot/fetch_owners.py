@@ -24,10 +24,11 @@ Licencia:           Uso exclusivo del autor. Prohibida la distribución sin auto
 """
 
 import os
-import requests
 from dotenv import load_dotenv
 from pathlib import Path
 
+from hubspot.http_client import ensure_success, hubspot_get
+
 # Cargar variables de entorno
 env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -37,10 +38,6 @@ def fetch_owners():
     Obtiene todos los owners de HubSpot
     """
     url = "https://api.hubapi.com/crm/v3/owners/"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
     
     print("🔄 Obteniendo owners de HubSpot...")
     
@@ -49,33 +46,24 @@ def fetch_owners():
     page_count = 0
 
     while url:
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            if response.status_code != 200:
-                print(f"❌ Error {response.status_code}: {response.text}")
-                break
-
-            data = response.json()
-            results = data.get("results", [])
-            owners.extend(results)
-            page_count += 1
-            
-            print(f"📄 Página {page_count}: {len(results)} owners obtenidos (Total: {len(owners)})")
-
-            # Verificar si hay más páginas
-            paging = data.get("paging", {}).get("next", {}).get("link")
-            url = paging if paging else None
-            
-            # Limpiar params para siguientes páginas (la URL ya incluye los parámetros)
-            if url:
-                params = {}
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error de conexión: {str(e)}")
-            break
-        except Exception as e:
-            print(f"❌ Error inesperado: {str(e)}")
-            break
+        # Un error persistente (tras reintentos) aborta en lugar de truncar owners
+        response = hubspot_get(url, params=params)
+        ensure_success(response, f"Paginación de owners (página {page_count + 1})")
+
+        data = response.json()
+        results = data.get("results", [])
+        owners.extend(results)
+        page_count += 1
+
+        print(f"📄 Página {page_count}: {len(results)} owners obtenidos (Total: {len(owners)})")
+
+        # Verificar si hay más páginas
+        paging = data.get("paging", {}).get("next", {}).get("link")
+        url = paging if paging else None
+
+        # Limpiar params para siguientes páginas (la URL ya incluye los parámetros)
+        if url:
+            params = {}
 
     print(f"✅ Total de owners obtenidos: {len(owners)}")
     return owners
@@ -115,7 +103,10 @@ def fetch_owners_as_table():
         
     Retorna:
         list: Lista de diccionarios con datos estructurados de owners
-        list vacía: En caso de error o no encontrar owners
+        list vacía: Si no se encuentran owners
+
+    Excepciones:
+        HubSpotAPIError: Si una página falla después de agotar los reintentos
         
     Uso desde main.py:
         owners_data = fetch_owners_as_table()
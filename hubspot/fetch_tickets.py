@@ -25,10 +25,25 @@ Licencia:           Uso exclusivo del autor. Prohibida la distribución sin auto
 """
 
 import os
-import requests
-import time
 from dotenv import load_dotenv
 from pathlib import Path
+from functools import partial
+
+from hubspot.extraction import (
+    fetch_property_batches,
+    iter_entity_pages,
+    iter_property_batches_merged,
+)
+from hubspot.http_client import hubspot_post
+from hubspot.properties import (
+    fetch_property_definitions,
+    get_loaded_property_definitions,
+    load_cached_property_analysis,
+    save_property_analysis,
+)
+from hubspot.manifest import get_manifest_properties
+from hubspot.record_store import RecordStore
+from hubspot.stats import SummaryStats
 
 # Cargar variables de entorno
 env_path = Path(__file__).resolve().parent.parent / ".env"
@@ -72,21 +87,10 @@ def get_all_ticket_properties():
     """
     Obtiene todas las propiedades disponibles para tickets
     """
-    url = "https://api.hubapi.com/crm/v3/properties/tickets"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
-
     print("🔍 Obteniendo propiedades de tickets disponibles...")
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            print(f"❌ Error obteniendo propiedades: {response.status_code}")
-            return TICKETS_PROPERTIES_BASE
-
-        data = response.json()
-        properties = [prop.get("name") for prop in data.get("results", []) if prop.get("name")]
+        definitions = fetch_property_definitions("tickets")
+        properties = [prop.get("name") for prop in definitions if prop.get("name")]
         print(f"✅ Propiedades de tickets disponibles: {len(properties)}")
         return properties
 
@@ -104,27 +108,39 @@ def analyze_ticket_properties_in_chunks():
         print("❌ No se pudieron obtener las propiedades")
         return TICKETS_PROPERTIES_BASE
 
+    # Reutilizar el análisis previo si no expiró y el esquema no cambió
+    definitions = get_loaded_property_definitions("tickets")
+    cached_properties = load_cached_property_analysis("tickets", definitions)
+    if cached_properties:
+        return cached_properties
+
     print(f"🎯 Analizando {len(all_properties)} propiedades de tickets en lotes...")
     
     # Dividir en chunks más pequeños para tickets
     chunk_size = 60
     properties_with_data = []
+    failed_chunks = 0
     
     for i in range(0, len(all_properties), chunk_size):
         chunk = all_properties[i:i+chunk_size]
         print(f"📦 Analizando lote {i//chunk_size + 1}/{(len(all_properties)-1)//chunk_size + 1}: {len(chunk)} propiedades")
         
         chunk_results = analyze_ticket_chunk_with_post(chunk, chunk_number=i//chunk_size + 1)
-        if chunk_results:
+        if chunk_results is None:
+            failed_chunks += 1
+        elif chunk_results:
             properties_with_data.extend(chunk_results)
-        
-        # Pausa para no sobrecargar la API
-        time.sleep(0.5)
     
     # Remover duplicados y asegurar propiedades base
     properties_with_data = list(set(properties_with_data + TICKETS_PROPERTIES_BASE))
     print(f"🎉 TOTAL de propiedades de tickets con datos: {len(properties_with_data)}")
     
+    # Solo se guarda en caché un análisis completo (sin lotes fallidos)
+    if failed_chunks:
+        print(f"⚠️ {failed_chunks} lotes fallaron; el análisis no se guarda en caché")
+    else:
+        save_property_analysis("tickets", definitions, properties_with_data)
+
     return properties_with_data
 
 def analyze_ticket_chunk_with_post(properties_chunk, chunk_number=1):
@@ -132,10 +148,6 @@ def analyze_ticket_chunk_with_post(properties_chunk, chunk_number=1):
     Analiza un lote de propiedades de tickets usando POST
     """
     url = "https://api.hubapi.com/crm/v3/objects/tickets/search"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
 
     payload = {
         "limit": 50,  # Menos tickets por chunk
@@ -153,10 +165,10 @@ def analyze_ticket_chunk_with_post(properties_chunk, chunk_number=1):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = hubspot_post(url, payload)
         if response.status_code != 200:
             print(f"❌ Error en lote {chunk_number}: {response.status_code}")
-            return []
+            return None
 
         data = response.json()
         sample_tickets = data.get("results", [])
@@ -174,7 +186,7 @@ def analyze_ticket_chunk_with_post(properties_chunk, chunk_number=1):
 
     except Exception as e:
         print(f"❌ Error en lote {chunk_number}: {str(e)}")
-        return []
+        return None
 
 def analyze_properties_in_ticket_chunk(sample_tickets, properties_chunk):
     """
@@ -207,7 +219,42 @@ def analyze_properties_in_ticket_chunk(sample_tickets, properties_chunk):
 
     return properties_with_data
 
-def fetch_tickets_from_hubspot():
+def prepare_ticket_properties():
+    """
+    Análisis de propiedades (fase 1 de la extracción) compartido por la extracción
+    completa y la extracción en streaming.
+
+    Retorna:
+        list: Propiedades útiles (actualiza también TICKETS_PROPERTIES)
+    """
+    # ==================== FASE 1: ANÁLISIS DE PROPIEDADES ====================
+    # Con manifiesto declarado (hubspot/manifest.py) se omite el análisis: esquema estable
+    properties_with_data = get_manifest_properties("tickets")
+    if properties_with_data:
+        print("📜 Propiedades tomadas del manifiesto, sin análisis dinámico")
+    else:
+        # Analizar propiedades específicas de tickets para encontrar las útiles
+        print("🚀 Iniciando análisis de propiedades de tickets...")
+        properties_with_data = analyze_ticket_properties_in_chunks()
+    
+    # ==================== FALLBACK: PROPIEDADES BASE ====================
+    # Si falla el análisis, usar conjunto predefinido de propiedades esenciales para tickets
+    if not properties_with_data:
+        print("⚠️ Usando propiedades base...")
+        properties_with_data = TICKETS_PROPERTIES_BASE
+    
+    # ==================== ACTUALIZACIÓN DE VARIABLE GLOBAL ====================
+    # Actualizar la lista global para uso en otras funciones del módulo
+    global TICKETS_PROPERTIES
+    TICKETS_PROPERTIES = properties_with_data
+    
+    # ==================== ESTADÍSTICAS DE OPTIMIZACIÓN ====================
+    # Mostrar eficiencia del filtrado de propiedades específico para tickets
+    print(f"\n🎯 Obteniendo TODOS los tickets con {len(properties_with_data)} propiedades útiles...")
+
+    return properties_with_data
+
+def fetch_tickets_from_hubspot(modified_since=None):
     """
     Función principal para extracción completa de tickets de soporte desde HubSpot API.
     
@@ -240,9 +287,16 @@ def fetch_tickets_from_hubspot():
         - TICKETS_PROPERTIES_BASE: Lista de propiedades básicas de fallback
         - Variable global TICKETS_PROPERTIES: Para almacenar propiedades útiles
         
+    Parámetros:
+        modified_since (int): Marca de agua en epoch ms (modo incremental);
+            None extrae todos los registros
+
     Retorna:
         list: Lista de diccionarios con tickets y sus propiedades
-        list vacía: En caso de error o no encontrar datos
+        list vacía: Si no se encuentran datos
+
+    Excepciones:
+        HubSpotAPIError: Si una página falla después de agotar los reintentos
         
     Efectos Secundarios:
         - Actualiza TICKETS_PROPERTIES global
@@ -264,135 +318,78 @@ def fetch_tickets_from_hubspot():
         - Estados: Normalización de valores de estado de tickets
         - Categorías: Procesamiento de categorías de soporte
     """
-    # ==================== FASE 1: ANÁLISIS DE PROPIEDADES ====================
-    # Analizar propiedades específicas de tickets para encontrar las útiles
-    print("🚀 Iniciando análisis de propiedades de tickets...")
-    properties_with_data = analyze_ticket_properties_in_chunks()
-    
-    # ==================== FALLBACK: PROPIEDADES BASE ====================
-    # Si falla el análisis, usar conjunto predefinido de propiedades esenciales para tickets
-    if not properties_with_data:
-        print("⚠️ Usando propiedades base...")
-        properties_with_data = TICKETS_PROPERTIES_BASE
-    
-    # ==================== ACTUALIZACIÓN DE VARIABLE GLOBAL ====================
-    # Actualizar la lista global para uso en otras funciones del módulo
-    global TICKETS_PROPERTIES
-    TICKETS_PROPERTIES = properties_with_data
-    
-    # ==================== ESTADÍSTICAS DE OPTIMIZACIÓN ====================
-    # Mostrar eficiencia del filtrado de propiedades específico para tickets
-    print(f"\n🎯 Obteniendo TODOS los tickets con {len(properties_with_data)} propiedades útiles...")
-    
+    properties_with_data = prepare_ticket_properties()
+
     # ==================== FASE 2: EXTRACCIÓN MASIVA ====================
     # Usar método POST optimizado para obtener todos los tickets con transformaciones
-    return fetch_all_tickets_with_post(properties_with_data)
+    return fetch_all_tickets_with_post(properties_with_data, modified_since)
 
-def fetch_all_tickets_with_post(properties_list):
+def fetch_all_tickets_with_post(properties_list, modified_since=None):
     """
     Obtiene todos los tickets usando POST
+
+    Parámetros:
+        properties_list (list): Propiedades a extraer
+        modified_since (int): Marca de agua en epoch ms para extracción
+            incremental; None extrae todos los registros
     """
     # Si hay demasiadas propiedades, dividir en lotes
     if len(properties_list) > 80:
         print(f"⚠️ Demasiadas propiedades ({len(properties_list)}), dividiendo en lotes...")
-        return fetch_tickets_in_property_batches(properties_list)
+        return fetch_tickets_in_property_batches(properties_list, modified_since)
     
-    url = "https://api.hubapi.com/crm/v3/objects/tickets/search"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
-
-    all_tickets = []
-    after = None
-    page_count = 0
-
-    while True:
-        payload = {
-            "limit": 100,
-            "properties": properties_list,
-            "filterGroups": [
-                {
-                    "filters": [
-                        {
-                            "propertyName": "hs_object_id",
-                            "operator": "HAS_PROPERTY"
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        if after:
-            payload["after"] = after
-
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-            if response.status_code != 200:
-                print(f"❌ Error HTTP {response.status_code}")
-                print(f"❌ Respuesta: {response.text}")
-                break
-
-            data = response.json()
-            tickets = data.get("results", [])
-            all_tickets.extend(tickets)
-            page_count += 1
-            
-            print(f"📄 Página {page_count}: {len(tickets)} tickets obtenidos (Total: {len(all_tickets)})")
-
-            # Verificar si hay más páginas
-            paging = data.get("paging")
-            if paging and paging.get("next") and paging["next"].get("after"):
-                after = paging["next"]["after"]
-            else:
-                break
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error en la petición: {str(e)}")
-            break
-        except Exception as e:
-            print(f"❌ Error inesperado: {str(e)}")
-            break
+    # Almacén columnar en lugar de una lista de diccionarios por registro
+    all_tickets = RecordStore()
+    for page in iter_entity_pages("tickets", properties_list, "hs_lastmodifieddate", modified_since, "tickets"):
+        all_tickets.add_records(page)
 
     print(f"✅ Total de tickets obtenidos: {len(all_tickets)}")
     return all_tickets
 
-def fetch_tickets_in_property_batches(properties_list):
+def fetch_tickets_in_property_batches(properties_list, modified_since=None):
     """
     Obtiene tickets en lotes de propiedades y los combina
+
+    El primer lote pagina la búsqueda y los demás se leen por ID con batch/read
+    (HUBSPOT_PROPERTY_BATCH_READ); con HUBSPOT_PROPERTY_BATCH_WORKERS > 1 las
+    llamadas corren en paralelo
     """
-    print(f"📦 Dividiendo {len(properties_list)} propiedades en lotes de 60...")
-    
-    essential_props = ["hs_object_id"]
-    non_essential = [p for p in properties_list if p not in essential_props]
-    batch_size = 60
-    
-    all_tickets_data = {}
-    
-    for i in range(0, len(non_essential), batch_size):
-        batch_props = essential_props + non_essential[i:i+batch_size]
-        batch_num = i//batch_size + 1
-        total_batches = (len(non_essential)-1)//batch_size + 1
-        
-        print(f"📦 Procesando lote {batch_num}/{total_batches} con {len(batch_props)} propiedades...")
-        
-        batch_tickets = fetch_all_tickets_with_post(batch_props)
-        
-        # Combinar datos por ID
-        for ticket in batch_tickets:
-            ticket_id = ticket.get("properties", {}).get("hs_object_id")
-            if ticket_id:
-                if ticket_id not in all_tickets_data:
-                    all_tickets_data[ticket_id] = {"properties": {}}
-                
-                all_tickets_data[ticket_id]["properties"].update(ticket.get("properties", {}))
-        
-        print(f"✅ Lote {batch_num} procesado. Tickets únicos acumulados: {len(all_tickets_data)}")
-    
-    combined_tickets = list(all_tickets_data.values())
-    print(f"🎯 Combinación completa: {len(combined_tickets)} tickets con datos completos")
-    
-    return combined_tickets
+    fetch_batch = partial(fetch_all_tickets_with_post, modified_since=modified_since)
+    return fetch_property_batches(fetch_batch, properties_list, batch_size=60, entity_label="tickets", object_type="tickets")
+
+def iter_ticket_pages(properties_list, modified_since=None):
+    """
+    Páginas de tickets a medida que llegan, sin acumular la extracción completa
+
+    Con más de 80 propiedades los lotes se paginan a la par ordenados por
+    hs_object_id y cada página entregada trae los registros ya combinados.
+
+    Parámetros:
+        properties_list (list): Propiedades a extraer
+        modified_since (int): Marca de agua en epoch ms; None extrae todos los registros
+
+    Retorna:
+        iterator: Listas de registros con formato {"properties": {...}}
+    """
+    if len(properties_list) > 80:
+        return iter_property_batches_merged(
+            lambda batch_props: iter_entity_pages("tickets", batch_props, "hs_lastmodifieddate", modified_since, "tickets"),
+            properties_list, batch_size=60, entity_label="tickets", object_type="tickets"
+        )
+    return iter_entity_pages("tickets", properties_list, "hs_lastmodifieddate", modified_since, "tickets")
+
+def stream_tickets_from_hubspot(modified_since=None):
+    """
+    Extracción en streaming: análisis de propiedades + generador de páginas
+
+    Parámetros:
+        modified_since (int): Marca de agua en epoch ms; None extrae todos los registros
+
+    Retorna:
+        tuple: (propiedades útiles, iterador de páginas de iter_ticket_pages())
+    """
+    properties_with_data = prepare_ticket_properties()
+    return properties_with_data, iter_ticket_pages(properties_with_data, modified_since)
 
 def get_all_ticket_properties_list():
     """
@@ -403,6 +400,10 @@ def get_all_ticket_properties_list():
 def display_tickets_summary(tickets):
     """
     Muestra un resumen de los tickets
+
+    Parámetros:
+        tickets: RecordStore, lista de registros o SummaryStats ya acumulado
+            página a página (carga en streaming)
     """
     if not tickets:
         print("⚠️ No hay tickets para mostrar")
@@ -411,44 +412,18 @@ def display_tickets_summary(tickets):
     print(f"\n📊 RESUMEN DE TICKETS ({len(tickets)} total)")
     print("=" * 50)
     
-    # Crear datos para análisis
-    all_props_data = []
-    for ticket in tickets:
-        all_props_data.append(ticket.get("properties", {}))
+    # Analizar completitud de datos sin pandas, en una sola pasada
+    stats = tickets if isinstance(tickets, SummaryStats) else SummaryStats.for_entity("tickets").add(tickets)
+    prop_stats = stats.completeness()
     
-    if not all_props_data:
+    if not prop_stats:
         print("⚠️ No hay propiedades para analizar")
         return
     
-    # Analizar completitud de datos sin pandas
-    prop_stats = []
-    
-    # Obtener todas las propiedades únicas
-    all_props = set()
-    for props in all_props_data:
-        all_props.update(props.keys())
-    
-    for prop in all_props:
-        actual_data_count = 0
-        for props in all_props_data:
-            value = props.get(prop)
-            if value and str(value).strip() and str(value) not in ["None", "null", ""]:
-                actual_data_count += 1
-        
-        if actual_data_count > 0:
-            prop_stats.append({
-                "propiedad": prop,
-                "con_datos": actual_data_count,
-                "porcentaje": (actual_data_count / len(all_props_data)) * 100
-            })
-    
-    # Ordenar por porcentaje
-    prop_stats.sort(key=lambda x: x["porcentaje"], reverse=True)
-    
     # Mostrar top 15
     print("\n🔝 TOP 15 PROPIEDADES DE TICKETS CON MÁS DATOS:")
     for i, stat in enumerate(prop_stats[:15], 1):
-        print(f"   {i:2d}. {stat['propiedad']:<30} {stat['porcentaje']:5.1f}% ({stat['con_datos']}/{len(all_props_data)})")
+        print(f"   {i:2d}. {stat['propiedad']:<30} {stat['porcentaje']:5.1f}% ({stat['con_datos']}/{stats.total})")
     
     # Estadísticas generales
     total_props = len(TICKETS_PROPERTIES)
@@ -28,6 +28,8 @@ import requests
 from dotenv import load_dotenv
 from pathlib import Path
 
+from hubspot.http_client import hubspot_get
+
 # Cargar variables de entorno
 env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -37,17 +39,13 @@ def fetch_ticket_pipelines_as_table():
     Obtiene todos los pipelines de tickets y sus stages en formato de lista de diccionarios
     """
     url = "https://api.hubapi.com/crm/v3/pipelines/tickets"
-    headers = {
-        "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
-        "Content-Type": "application/json"
-    }
 
     print("🔄 Obteniendo pipelines de tickets...")
     
     try:
         # ==================== CONSULTA A HUBSPOT API ====================
         # Realizar petición HTTP para obtener pipelines de tickets de soporte
-        response = requests.get(url, headers=headers)
+        response = hubspot_get(url)
         if response.status_code != 200:
             print(f"❌ Error obteniendo pipelines de tickets: {response.status_code}")
             print(f"❌ Respuesta: {response.text}")
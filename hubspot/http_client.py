@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+                    HUBSPOT HTTP CLIENT - TRANSPORTE HTTP COMPARTIDO
+================================================================================
+
+Archivo:            hubspot/http_client.py
+Descripción:        Transporte HTTP único para todos los extractores del paquete
+                   hubspot. Mantiene una sesión con conexiones keep-alive
+                   reutilizables, timeouts de conexión/lectura configurables,
+                   headers de autenticación centralizados, limitación de tasa
+                   (token bucket ajustado con X-HubSpot-RateLimit-*),
+                   reintentos con backoff exponencial para 429/5xx y
+                   contabilidad de latencia por endpoint.
+
+Configuración (.env):
+    - HUBSPOT_TOKEN: Token de autenticación (requerido)
+    - HUBSPOT_CONNECT_TIMEOUT: Timeout de conexión en segundos (default: 10)
+    - HUBSPOT_READ_TIMEOUT: Timeout de lectura en segundos (default: 60)
+    - HUBSPOT_POOL_SIZE: Conexiones keep-alive por host (default: 10)
+    - HUBSPOT_RATE_LIMIT_PER_SECOND: Tasa inicial antes de leer headers (default: 10)
+    - HUBSPOT_SEARCH_RATE_LIMIT_PER_SECOND: Tasa de la API de búsqueda (default: 4)
+    - HUBSPOT_MAX_RETRIES: Reintentos por petición ante 429/5xx/conexión (default: 5)
+    - HUBSPOT_RETRY_BACKOFF: Espera base del backoff exponencial en segundos (default: 1)
+    - HUBSPOT_RETRY_BUDGET: Reintentos totales permitidos por ejecución (default: 100)
+
+Funciones Exportadas:
+    - get_session(): Sesión HTTP compartida (thread-safe)
+    - hubspot_get() / hubspot_post(): Peticiones autenticadas con timeout y reintentos
+    - ensure_success(): Convierte una respuesta no exitosa en HubSpotAPIError
+    - get_request_stats(): Estadísticas de latencia por endpoint
+    - display_request_stats(): Resumen de latencia en consola
+
+Autor:              Ing. Jose Ríler Solórzano Campos
+Fecha de Creación:  11 de julio de 2025
+Derechos de Autor:  © 2025 Jose Ríler Solórzano Campos. Todos los derechos reservados.
+Licencia:           Uso exclusivo del autor. Prohibida la distribución sin autorización.
+
+================================================================================
+"""
+
+import importlib.util
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+# Cargar variables de entorno
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Cargar el limitador de tasa compartido con escritura (solo librería estándar)
+_rate_limiter_path = Path(__file__).resolve().parent.parent / "escritura" / "utils" / "rate_limiter.py"
+_spec = importlib.util.spec_from_file_location("rate_limiter", _rate_limiter_path)
+_rate_limiter_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_rate_limiter_module)
+get_rate_limiter = _rate_limiter_module.get_rate_limiter
+
+# ==================== CONFIGURACIÓN DEL TRANSPORTE ====================
+HUBSPOT_API_BASE_URL = "https://api.hubapi.com"
+
+CONNECT_TIMEOUT = float(os.getenv("HUBSPOT_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.getenv("HUBSPOT_READ_TIMEOUT", "60"))
+POOL_SIZE = int(os.getenv("HUBSPOT_POOL_SIZE", "10"))
+
+# ==================== CONFIGURACIÓN DE REINTENTOS ====================
+# 429 (límite de tasa) y 5xx transitorios se reintentan; el resto de errores no
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRIES = int(os.getenv("HUBSPOT_MAX_RETRIES", "5"))
+RETRY_BACKOFF = float(os.getenv("HUBSPOT_RETRY_BACKOFF", "1"))
+RETRY_BACKOFF_MAX = 60.0
+RETRY_BUDGET = int(os.getenv("HUBSPOT_RETRY_BUDGET", "100"))
+
+# Sesión compartida, estadísticas de latencia y presupuesto de reintentos (protegidos por locks)
+_session = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_request_stats = {}
+_retries_used = 0
+
+
+class HubSpotAPIError(Exception):
+    """
+    Error de HubSpot que no se resolvió con reintentos (status no exitoso).
+
+    Se propaga para que la extracción falle completa en lugar de devolver
+    datos truncados que luego reemplazarían la tabla en SQL Server.
+    """
+
+    def __init__(self, message, status_code=None, response_text=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response_text = response_text
+
+
+def get_session():
+    """
+    Retorna la sesión HTTP compartida, creándola en el primer uso.
+
+    Descripción:
+        La sesión mantiene un pool de conexiones keep-alive hacia
+        api.hubapi.com, de modo que cada página y cada lote de propiedades
+        reutiliza la conexión TCP+TLS en lugar de abrir una nueva.
+
+    Retorna:
+        requests.Session: Sesión con headers de autenticación configurados
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "Authorization": f"Bearer {os.getenv('HUBSPOT_TOKEN')}",
+                    "Content-Type": "application/json"
+                })
+                _session = session
+    return _session
+
+
+def _endpoint_key(method, url):
+    """
+    Normaliza método + URL a una clave de estadísticas sin host ni query string
+    """
+    return f"{method} {urlsplit(url).path}"
+
+
+def _record_call(method, url, elapsed, failed, retried=False):
+    """
+    Acumula la latencia de una llamada en las estadísticas por endpoint
+    """
+    key = _endpoint_key(method, url)
+    with _stats_lock:
+        stats = _request_stats.setdefault(
+            key, {"calls": 0, "errors": 0, "retries": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        )
+        stats["calls"] += 1
+        stats["total_seconds"] += elapsed
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+        if failed:
+            stats["errors"] += 1
+        if retried:
+            stats["retries"] += 1
+
+
+def _take_retry_budget():
+    """
+    Consume un reintento del presupuesto de la ejecución; False si está agotado
+    """
+    global _retries_used
+    with _stats_lock:
+        if _retries_used >= RETRY_BUDGET:
+            return False
+        _retries_used += 1
+        return True
+
+
+def _retry_delay(attempt, response=None):
+    """
+    Segundos a esperar antes del reintento número `attempt` (1, 2, ...).
+
+    Respeta Retry-After si HubSpot lo envía (segundos o fecha HTTP); si no,
+    usa backoff exponencial con jitter para no sincronizar hilos concurrentes.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_BACKOFF_MAX)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                return min(max(delay, 0.0), RETRY_BACKOFF_MAX)
+            except (TypeError, ValueError):
+                pass
+
+    backoff = min(RETRY_BACKOFF * (2 ** (attempt - 1)), RETRY_BACKOFF_MAX)
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+def _rate_limit_bucket(url):
+    """
+    Bucket del limitador para la URL: la API de búsqueda tiene un límite propio
+    """
+    return "search" if urlsplit(url).path.rstrip("/").endswith("/search") else "default"
+
+
+def hubspot_request(method, url, params=None, payload=None, timeout=None):
+    """
+    Ejecuta una petición autenticada contra HubSpot usando la sesión compartida.
+
+    Descripción:
+        Antes de enviar, espera un turno en el limitador de tasa compartido;
+        al recibir la respuesta ajusta el limitador con los headers
+        X-HubSpot-RateLimit-*. Los 429, 5xx y errores de conexión se
+        reintentan hasta HUBSPOT_MAX_RETRIES veces (respetando Retry-After)
+        mientras quede presupuesto de reintentos en la ejecución.
+
+    Parámetros:
+        method (str): Método HTTP ("GET", "POST")
+        url (str): URL absoluta o ruta relativa a api.hubapi.com
+        params (dict): Parámetros de query string (opcional)
+        payload (dict): Cuerpo JSON (opcional)
+        timeout (tuple): (conexión, lectura) en segundos; usa la configuración global si se omite
+
+    Retorna:
+        requests.Response: Respuesta de HubSpot (el llamador valida el status;
+            tras agotar reintentos puede seguir siendo 429/5xx)
+
+    Excepciones:
+        requests.exceptions.RequestException: Errores de conexión o timeout
+            que persisten después de los reintentos
+    """
+    if not url.startswith("http"):
+        url = f"{HUBSPOT_API_BASE_URL}{url}"
+
+    limiter = get_rate_limiter()
+    bucket = _rate_limit_bucket(url)
+    attempt = 0
+
+    while True:
+        limiter.acquire(bucket)
+        start = time.perf_counter()
+        try:
+            response = get_session().request(
+                method,
+                url,
+                params=params,
+                json=payload,
+                timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            attempt += 1
+            retry = attempt <= MAX_RETRIES and _take_retry_budget()
+            _record_call(method, url, time.perf_counter() - start, failed=True, retried=retry)
+            if not retry:
+                raise
+            delay = _retry_delay(attempt)
+            print(f"🔁 Error de conexión en {_endpoint_key(method, url)} ({type(e).__name__}), reintento {attempt}/{MAX_RETRIES} en {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        except requests.exceptions.RequestException:
+            _record_call(method, url, time.perf_counter() - start, failed=True)
+            raise
+
+        limiter.update_from_headers(response.headers)
+        if response.status_code not in RETRY_STATUS_CODES:
+            _record_call(method, url, time.perf_counter() - start, failed=response.status_code >= 400)
+            return response
+
+        attempt += 1
+        retry = attempt <= MAX_RETRIES and _take_retry_budget()
+        _record_call(method, url, time.perf_counter() - start, failed=True, retried=retry)
+        if not retry:
+            return response
+        delay = _retry_delay(attempt, response)
+        print(f"🔁 HTTP {response.status_code} en {_endpoint_key(method, url)}, reintento {attempt}/{MAX_RETRIES} en {delay:.1f}s")
+        time.sleep(delay)
+
+
+def hubspot_get(url, params=None):
+    """
+    GET autenticado con timeout y pool de conexiones compartido
+    """
+    return hubspot_request("GET", url, params=params)
+
+
+def hubspot_post(url, payload=None):
+    """
+    POST autenticado con cuerpo JSON, timeout y pool de conexiones compartido
+    """
+    return hubspot_request("POST", url, payload=payload)
+
+
+def ensure_success(response, context):
+    """
+    Verifica que la respuesta sea 200 o lanza HubSpotAPIError.
+
+    Parámetros:
+        response (requests.Response): Respuesta de hubspot_get/hubspot_post
+        context (str): Descripción de la operación para el mensaje de error
+
+    Excepciones:
+        HubSpotAPIError: Si el status no es 200 (ya agotados los reintentos)
+    """
+    if response.status_code != 200:
+        raise HubSpotAPIError(
+            f"{context}: HTTP {response.status_code} - {response.text[:500]}",
+            status_code=response.status_code,
+            response_text=response.text
+        )
+
+
+def get_request_stats():
+    """
+    Retorna una copia de las estadísticas de latencia acumuladas por endpoint
+    """
+    with _stats_lock:
+        return {key: dict(stats) for key, stats in _request_stats.items()}
+
+
+def reset_request_stats():
+    """
+    Reinicia las estadísticas y el presupuesto de reintentos (útil entre ejecuciones en el mismo proceso)
+    """
+    global _retries_used
+    with _stats_lock:
+        _request_stats.clear()
+        _retries_used = 0
+
+
+def display_request_stats():
+    """
+    Muestra un resumen de llamadas y latencia por endpoint de HubSpot
+    """
+    stats = get_request_stats()
+    if not stats:
+        return
+
+    total_calls = sum(s["calls"] for s in stats.values())
+    total_seconds = sum(s["total_seconds"] for s in stats.values())
+
+    total_retries = sum(s["retries"] for s in stats.values())
+
+    print(f"\n🌐 LLAMADAS A HUBSPOT ({total_calls} total, {total_seconds:.1f}s acumulados, {total_retries} reintentos)")
+    for key, s in sorted(stats.items(), key=lambda item: item[1]["total_seconds"], reverse=True):
+        avg_ms = (s["total_seconds"] / s["calls"]) * 1000 if s["calls"] else 0
+        print(
+            f"   {key:<45} {s['calls']:5d} llamadas | prom {avg_ms:7.1f} ms | "
+            f"máx {s['max_seconds'] * 1000:7.1f} ms | errores {s['errors']} | reintentos {s['retries']}"
+        )
+
+    for bucket, b in get_rate_limiter().get_stats().items():
+        print(f"   ⏳ Limitador '{bucket}': {b['rate']:.1f} req/s | {b['waits']} esperas | {b['wait_seconds']:.1f}s en espera")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+                    HUBSPOT MANIFEST - MANIFIESTO DECLARATIVO DE PROPIEDADES
+================================================================================
+
+Archivo:            hubspot/manifest.py
+Descripción:        Lectura del manifiesto opcional de propiedades por tipo de
+                   objeto. Cuando existe, la extracción de deals, tickets o
+                   contactos omite el análisis de "propiedades con datos" y
+                   usa exactamente las propiedades declaradas, en su orden y
+                   con sus tipos SQL: la tabla destino tiene el mismo esquema
+                   en cada ejecución.
+
+Formato ({directorio}/{tipo}.json, ej: manifests/contacts.json):
+    {
+      "properties": [
+        "email",
+        {"name": "amount", "sql_type": "DECIMAL(38, 10)"},
+        {"name": "closedate", "sql_type": "DATETIME2(3)"}
+      ]
+    }
+    - Una cadena equivale a {"name": ...} sin tipo: el tipo sale de la metadata
+      de HubSpot si ya se obtuvo, o NVARCHAR(4000)
+    - hs_object_id se agrega siempre (BIGINT)
+    - Tipos aceptados: BIGINT, DECIMAL(38, 10), DATETIME2(3), DATE, BIT y
+      NVARCHAR(n | MAX)
+
+Configuración (.env):
+    - HUBSPOT_PROPERTY_MANIFEST_DIR: Directorio de manifiestos (default:
+      manifests en la raíz del proyecto)
+    - HUBSPOT_PROPERTY_MANIFEST_<TIPO>: Ruta del manifiesto de un tipo de
+      objeto (ej: HUBSPOT_PROPERTY_MANIFEST_CONTACTS), con prioridad
+
+Funciones Exportadas:
+    - load_property_manifest(): Manifiesto de un tipo de objeto o None
+    - get_manifest_properties(): Propiedades declaradas (None sin manifiesto)
+    - get_manifest_column_types(): Tipos SQL declarados por propiedad
+
+Autor:              Ing. Jose Ríler Solórzano Campos
+Fecha de Creación:  11 de julio de 2025
+Derechos de Autor:  © 2025 Jose Ríler Solórzano Campos. Todos los derechos reservados.
+Licencia:           Uso exclusivo del autor. Prohibida la distribución sin autorización.
+
+================================================================================
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from hubspot.column_types import SQL_BIGINT, SQL_BIT, SQL_DATE, SQL_DATETIME, SQL_DECIMAL
+
+# Cargar variables de entorno
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# ==================== CONFIGURACIÓN ====================
+MANIFEST_DIR = Path(os.getenv(
+    "HUBSPOT_PROPERTY_MANIFEST_DIR",
+    str(Path(__file__).resolve().parent.parent / "manifests")
+))
+
+# Tipos SQL aceptados en un manifiesto: los que convert_value() sabe convertir
+# (se usan tal cual en CREATE/ALTER TABLE)
+FIXED_SQL_TYPES = (SQL_BIGINT, SQL_BIT, SQL_DATE, SQL_DATETIME, SQL_DECIMAL)
+TEXT_SQL_TYPE = re.compile(r"^NVARCHAR\((\d{1,4}|MAX)\)$")
+# Largo máximo de NVARCHAR(n) aceptado por SQL Server (más largo = NVARCHAR(MAX))
+MAX_TEXT_LENGTH = 4000
+
+# Nombres de propiedad de HubSpot (evita inyección en identificadores SQL)
+PROPERTY_NAME = re.compile(r"^[A-Za-z0-9_]+$")
+
+# Manifiestos leídos en esta ejecución, por tipo de objeto (None = sin manifiesto)
+_manifests = {}
+_manifests_lock = threading.Lock()
+
+
+def _manifest_path(object_type):
+    """
+    Ruta del manifiesto de un tipo de objeto
+    """
+    override = os.getenv(f"HUBSPOT_PROPERTY_MANIFEST_{object_type.upper()}")
+    return Path(override) if override else MANIFEST_DIR / f"{object_type}.json"
+
+
+def _parse_manifest(object_type, data):
+    """
+    Valida el contenido de un manifiesto y lo normaliza.
+
+    Retorna:
+        dict: {"properties": [nombres en orden], "sql_types": {nombre: tipo}}
+
+    Excepciones:
+        ValueError: Si una propiedad o un tipo SQL no es válido
+    """
+    entries = data.get("properties") if isinstance(data, dict) else None
+    if not entries:
+        raise ValueError(f"El manifiesto de {object_type} no declara propiedades")
+
+    properties = ["hs_object_id"]
+    sql_types = {"hs_object_id": SQL_BIGINT}
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"name": entry}
+        name = (entry.get("name") or "").strip()
+        if not PROPERTY_NAME.match(name):
+            raise ValueError(f"Propiedad no válida en el manifiesto de {object_type}: '{name}'")
+        if name in sql_types or name in properties:
+            continue
+
+        sql_type = entry.get("sql_type")
+        if sql_type:
+            sql_type = " ".join(sql_type.upper().replace(",", ", ").split())
+            text_match = TEXT_SQL_TYPE.match(sql_type)
+            valid = sql_type in FIXED_SQL_TYPES or (
+                text_match is not None
+                and (text_match.group(1) == "MAX" or 1 <= int(text_match.group(1)) <= MAX_TEXT_LENGTH)
+            )
+            if not valid:
+                raise ValueError(f"Tipo SQL no válido para '{name}' en el manifiesto de {object_type}: '{sql_type}'")
+            sql_types[name] = sql_type
+        properties.append(name)
+
+    return {"properties": properties, "sql_types": sql_types}
+
+
+def load_property_manifest(object_type):
+    """
+    Manifiesto de propiedades de un tipo de objeto (leído una vez por ejecución).
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+
+    Retorna:
+        dict | None: {"properties": [...], "sql_types": {...}} o None si no existe
+
+    Excepciones:
+        ValueError: Si el manifiesto existe pero no es válido (JSON o contenido);
+            se propaga para no cargar un esquema distinto al declarado
+    """
+    with _manifests_lock:
+        if object_type in _manifests:
+            return _manifests[object_type]
+
+        path = _manifest_path(object_type)
+        manifest = None
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"Manifiesto de {object_type} con JSON inválido ({path}): {str(e)}") from e
+            manifest = _parse_manifest(object_type, data)
+            print(f"📜 Manifiesto de propiedades de {object_type}: {len(manifest['properties'])} propiedades ({path})")
+
+        _manifests[object_type] = manifest
+        return manifest
+
+
+def get_manifest_properties(object_type):
+    """
+    Propiedades declaradas en el manifiesto (hs_object_id primero) o None sin manifiesto
+    """
+    manifest = load_property_manifest(object_type)
+    return list(manifest["properties"]) if manifest else None
+
+
+def get_manifest_column_types(object_type):
+    """
+    Tipos SQL declarados en el manifiesto ({} sin manifiesto o sin tipos)
+    """
+    manifest = load_property_manifest(object_type)
+    return dict(manifest["sql_types"]) if manifest else {}
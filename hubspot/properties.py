@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+                    HUBSPOT PROPERTIES - DEFINICIONES Y CACHÉ DE ANÁLISIS
+================================================================================
+
+Archivo:            hubspot/properties.py
+Descripción:        Obtención de definiciones de propiedades (/crm/v3/properties)
+                   compartida por deals, tickets y contactos, y caché en disco
+                   del análisis de "propiedades con datos". El caché expira por
+                   TTL y se invalida cuando HubSpot reporta propiedades nuevas,
+                   eliminadas o modificadas (huella del esquema).
+
+Configuración (.env):
+    - HUBSPOT_PROPERTY_CACHE_TTL_HOURS: Vigencia del análisis en caché
+      (default: 24; 0 desactiva el caché)
+    - HUBSPOT_CACHE_DIR: Directorio del caché (default: .cache en la raíz)
+
+Funciones Exportadas:
+    - fetch_property_definitions(): Definiciones completas desde HubSpot
+    - get_property_definitions(): Definiciones memorizadas durante la ejecución
+    - get_loaded_property_definitions(): Definiciones ya obtenidas, sin consultar la API
+    - schema_fingerprint(): Huella del esquema de propiedades
+    - load_cached_property_analysis() / save_property_analysis(): Caché en disco
+
+Autor:              Ing. Jose Ríler Solórzano Campos
+Fecha de Creación:  11 de julio de 2025
+Derechos de Autor:  © 2025 Jose Ríler Solórzano Campos. Todos los derechos reservados.
+Licencia:           Uso exclusivo del autor. Prohibida la distribución sin autorización.
+
+================================================================================
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from hubspot.http_client import ensure_success, hubspot_get
+
+# Cargar variables de entorno
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# ==================== CONFIGURACIÓN DEL CACHÉ ====================
+CACHE_DIR = Path(os.getenv("HUBSPOT_CACHE_DIR", str(Path(__file__).resolve().parent.parent / ".cache")))
+PROPERTY_CACHE_TTL_HOURS = float(os.getenv("HUBSPOT_PROPERTY_CACHE_TTL_HOURS", "24"))
+
+# Definiciones obtenidas en esta ejecución, por tipo de objeto
+_definitions = {}
+_definitions_lock = threading.Lock()
+
+
+def fetch_property_definitions(object_type):
+    """
+    Obtiene las definiciones completas de propiedades de un objeto desde HubSpot.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+
+    Retorna:
+        list: Definiciones de propiedades (name, type, fieldType, updatedAt, options...)
+
+    Excepciones:
+        HubSpotAPIError: Si el endpoint responde con error tras los reintentos
+    """
+    response = hubspot_get(f"/crm/v3/properties/{object_type}")
+    ensure_success(response, f"Propiedades de {object_type}")
+
+    definitions = response.json().get("results", [])
+    with _definitions_lock:
+        _definitions[object_type] = definitions
+    return definitions
+
+
+def get_loaded_property_definitions(object_type):
+    """
+    Retorna las definiciones ya obtenidas en esta ejecución sin consultar la API ([] si no hay)
+    """
+    with _definitions_lock:
+        return _definitions.get(object_type) or []
+
+
+def get_property_definitions(object_type):
+    """
+    Retorna las definiciones ya obtenidas en esta ejecución o las consulta una vez
+    """
+    with _definitions_lock:
+        definitions = _definitions.get(object_type)
+    if definitions is None:
+        definitions = fetch_property_definitions(object_type)
+    return definitions
+
+
+def schema_fingerprint(definitions):
+    """
+    Huella del esquema: cambia si se agrega, elimina o modifica alguna propiedad.
+
+    Parámetros:
+        definitions (list): Definiciones de fetch_property_definitions()
+
+    Retorna:
+        str: Hash SHA-256 de (name, type, updatedAt) ordenado por nombre
+    """
+    signature = sorted(
+        (d.get("name", ""), d.get("type", ""), d.get("updatedAt") or "")
+        for d in definitions
+    )
+    return hashlib.sha256(json.dumps(signature).encode("utf-8")).hexdigest()
+
+
+def _cache_path(object_type):
+    """
+    Ruta del archivo de caché del análisis para un tipo de objeto
+    """
+    return CACHE_DIR / f"properties_with_data_{object_type}.json"
+
+
+def load_cached_property_analysis(object_type, definitions):
+    """
+    Retorna la lista de propiedades con datos desde caché si sigue vigente.
+
+    Descripción:
+        El caché es válido si no superó el TTL y la huella del esquema coincide
+        con las definiciones actuales; en cualquier otro caso retorna None y
+        el llamador debe repetir el análisis completo.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        definitions (list): Definiciones actuales de propiedades
+
+    Retorna:
+        list | None: Propiedades con datos, o None si no hay caché válido
+    """
+    if PROPERTY_CACHE_TTL_HOURS <= 0 or not definitions:
+        return None
+
+    path = _cache_path(object_type)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    age_hours = (time.time() - cached.get("created_at", 0)) / 3600
+    if age_hours > PROPERTY_CACHE_TTL_HOURS:
+        print(f"⌛ Caché de propiedades de {object_type} expirado ({age_hours:.1f}h)")
+        return None
+
+    if cached.get("fingerprint") != schema_fingerprint(definitions):
+        print(f"🔄 El esquema de propiedades de {object_type} cambió, invalidando caché")
+        return None
+
+    properties = cached.get("properties") or None
+    if properties:
+        print(f"💾 Usando análisis en caché de {object_type}: {len(properties)} propiedades con datos ({age_hours:.1f}h)")
+    return properties
+
+
+def save_property_analysis(object_type, definitions, properties):
+    """
+    Guarda el resultado del análisis de propiedades con la huella del esquema.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        definitions (list): Definiciones usadas en el análisis
+        properties (list): Propiedades con datos encontradas
+    """
+    if PROPERTY_CACHE_TTL_HOURS <= 0 or not definitions or not properties:
+        return
+
+    path = _cache_path(object_type)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "object_type": object_type,
+                "created_at": time.time(),
+                "fingerprint": schema_fingerprint(definitions),
+                "properties": sorted(properties)
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ No se pudo guardar el caché de propiedades de {object_type}: {str(e)}")
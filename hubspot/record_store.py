@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+                    HUBSPOT RECORD STORE - ALMACÉN COLUMNAR DE REGISTROS
+================================================================================
+
+Archivo:            hubspot/record_store.py
+Descripción:        Almacén en memoria para deals, tickets y contactos extraídos.
+                   En lugar de un diccionario {"properties": {...}} con cientos
+                   de claves por registro, guarda una lista por columna con orden
+                   de columnas fijo. Las columnas de baja cardinalidad (dealstage,
+                   pipeline, hubspot_owner_id, propiedades vacías...) se codifican
+                   con diccionario: cada fila ocupa 2 bytes y cada valor distinto
+                   se guarda una sola vez. Una columna pasa a lista simple cuando
+                   supera DICTIONARY_MAX_VALUES valores distintos (emails, fechas).
+
+Compatibilidad:
+    - Iterar el almacén entrega {"properties": RecordView} como las páginas de
+      la API, por lo que el código que recorre listas de registros sigue
+      funcionando; RecordView es un Mapping de solo lectura sobre una fila.
+    - Agregar un registro con un hs_object_id existente completa esa fila
+      (combinación de lotes de propiedades sin un diccionario intermedio).
+
+Funciones Exportadas:
+    - RecordStore: Almacén columnar con codificación por diccionario
+    - RecordView: Vista de solo lectura de una fila
+
+Autor:              Ing. Jose Ríler Solórzano Campos
+Fecha de Creación:  11 de julio de 2025
+Derechos de Autor:  © 2025 Jose Ríler Solórzano Campos. Todos los derechos reservados.
+Licencia:           Uso exclusivo del autor. Prohibida la distribución sin autorización.
+
+================================================================================
+"""
+
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+
+# Valores distintos a partir de los cuales una columna deja de codificarse con diccionario
+# (los códigos caben en un array de 2 bytes por fila)
+DICTIONARY_MAX_VALUES = 2048
+
+
+class _Column:
+    """
+    Valores de una columna: códigos sobre un diccionario o lista simple
+    """
+
+    __slots__ = ("dictionary", "lookup", "codes", "values")
+
+    def __init__(self, size):
+        # Código 0 = None (propiedad vacía)
+        self.dictionary = [None]
+        self.lookup = {}
+        self.codes = array("H", bytes(2 * size))
+        self.values = None
+
+    def append_empty(self):
+        if self.values is None:
+            self.codes.append(0)
+        else:
+            self.values.append(None)
+
+    def get(self, row):
+        if self.values is None:
+            return self.dictionary[self.codes[row]]
+        return self.values[row]
+
+    def set(self, row, value):
+        if self.values is not None:
+            self.values[row] = value
+            return
+
+        code = 0 if value is None else self.lookup.get(value)
+        if code is None:
+            if len(self.dictionary) > DICTIONARY_MAX_VALUES:
+                # Alta cardinalidad: el diccionario ya no ahorra memoria
+                self.values = [self.dictionary[c] for c in self.codes]
+                self.codes = None
+                self.dictionary = None
+                self.lookup = None
+                self.values[row] = value
+                return
+            code = len(self.dictionary)
+            self.dictionary.append(value)
+            self.lookup[value] = code
+        self.codes[row] = code
+
+    def __iter__(self):
+        if self.values is None:
+            dictionary = self.dictionary
+            return (dictionary[code] for code in self.codes)
+        return iter(self.values)
+
+    def value_counts(self):
+        """
+        Ocurrencias por valor (incluye None); con diccionario se cuentan códigos
+        """
+        if self.values is None:
+            return Counter({self.dictionary[code]: count for code, count in Counter(self.codes).items()})
+        return Counter(self.values)
+
+    @property
+    def is_dictionary_encoded(self):
+        return self.values is None
+
+
+class RecordView(Mapping):
+    """
+    Vista de solo lectura de una fila del almacén con interfaz de diccionario
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, column):
+        try:
+            return self._store._columns[column].get(self._row)
+        except KeyError:
+            raise KeyError(column) from None
+
+    def get(self, column, default=None):
+        col = self._store._columns.get(column)
+        if col is None:
+            return default
+        return col.get(self._row)
+
+    def __iter__(self):
+        return iter(self._store._order)
+
+    def __len__(self):
+        return len(self._store._order)
+
+    def __repr__(self):
+        return f"RecordView({dict(self)!r})"
+
+
+class RecordStore:
+    """
+    Almacén columnar de registros de HubSpot con orden de columnas fijo.
+
+    Parámetros:
+        key (str): Propiedad que identifica el registro (default: hs_object_id);
+            registros repetidos se combinan en la misma fila
+    """
+
+    def __init__(self, key="hs_object_id"):
+        self._key = key
+        self._columns = {}
+        self._order = []
+        self._row_by_key = {}
+        self._size = 0
+
+    @classmethod
+    def from_records(cls, records, key="hs_object_id"):
+        """
+        Crea un almacén desde registros con formato {"properties": {...}}
+        """
+        store = cls(key)
+        store.add_records(records)
+        return store
+
+    def _column(self, name):
+        column = self._columns.get(name)
+        if column is None:
+            column = _Column(self._size)
+            self._columns[name] = column
+            self._order.append(name)
+        return column
+
+    def add(self, props):
+        """
+        Agrega (o completa, si su clave ya existe) un registro a partir de sus propiedades.
+
+        Retorna:
+            int: Fila del registro
+        """
+        key_value = props.get(self._key)
+        row = self._row_by_key.get(key_value) if key_value is not None else None
+        if row is None:
+            row = self._size
+            self._size += 1
+            for column in self._columns.values():
+                column.append_empty()
+            if key_value is not None:
+                self._row_by_key[key_value] = row
+
+        for name, value in props.items():
+            self._column(name).set(row, value)
+        return row
+
+    def add_records(self, records):
+        """
+        Agrega una página de registros de la API ({"properties": {...}})
+        """
+        for record in records:
+            self.add(record.get("properties", {}))
+
+    @property
+    def columns(self):
+        """
+        Columnas en orden de aparición
+        """
+        return list(self._order)
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        # Mismo formato que los resultados de la API para el código existente
+        for row in range(self._size):
+            yield {"properties": RecordView(self, row)}
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [RecordView(self, index) for index in range(*row.indices(self._size))]
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError(row)
+        return RecordView(self, row)
+
+    def views(self):
+        """
+        Vistas de todas las filas (lista liviana para el cargador SQL)
+        """
+        return [RecordView(self, row) for row in range(self._size)]
+
+    def column_values(self, name):
+        """
+        Iterador de los valores de una columna (None donde no hay dato)
+        """
+        column = self._columns.get(name)
+        if column is None:
+            return iter([None] * self._size)
+        return iter(column)
+
+    def value_counts(self, name):
+        """
+        Ocurrencias por valor de una columna (Counter, incluye None)
+        """
+        column = self._columns.get(name)
+        if column is None:
+            return Counter({None: self._size}) if self._size else Counter()
+        return column.value_counts()
+
+    def encoding_stats(self):
+        """
+        Columnas codificadas con diccionario vs. listas simples
+
+        Retorna:
+            dict: {"columns": n, "dictionary": n, "plain": n}
+        """
+        encoded = sum(1 for column in self._columns.values() if column.is_dictionary_encoded)
+        return {"columns": len(self._order), "dictionary": encoded, "plain": len(self._order) - encoded}
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+                    HUBSPOT STATS - ESTADÍSTICAS DE RESUMEN EN UNA PASADA
+================================================================================
+
+Archivo:            hubspot/stats.py
+Descripción:        Acumulador de estadísticas para los resúmenes de deals,
+                   tickets y contactos. Cada celda se evalúa una sola vez al
+                   llegar su página (o una vez por valor distinto cuando los
+                   registros ya están en un RecordStore), en lugar de recorrer
+                   todos los registros por cada propiedad al imprimir.
+
+Estadísticas:
+    - Completitud: registros con dato real por propiedad
+    - Conteo por valor: propiedades de agrupación (ej: dealstage, pipeline)
+    - Sumas numéricas: total y cantidad de valores válidos (ej: amount)
+
+Configuración (.env):
+    - SYNC_SUMMARIES: "true" (default) o "false" para omitir los resúmenes
+      en ejecuciones programadas
+
+Funciones Exportadas:
+    - summaries_enabled(): Indica si se deben calcular y mostrar resúmenes
+    - has_data(): Indica si un valor de HubSpot contiene un dato real
+    - SummaryStats: Acumulador de estadísticas por páginas
+
+Autor:              Ing. Jose Ríler Solórzano Campos
+Fecha de Creación:  11 de julio de 2025
+Derechos de Autor:  © 2025 Jose Ríler Solórzano Campos. Todos los derechos reservados.
+Licencia:           Uso exclusivo del autor. Prohibida la distribución sin autorización.
+
+================================================================================
+"""
+
+import os
+from collections import Counter
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from hubspot.record_store import RecordStore
+
+# Cargar variables de entorno
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# Valores que HubSpot (o una serialización previa) usa para "sin dato"
+EMPTY_MARKERS = ("None", "null")
+
+# Propiedades agrupadas y numéricas que muestra el resumen de cada entidad
+SUMMARY_FIELDS = {
+    "deals": {"values": ("dealstage", "pipeline"), "numeric": ("amount",)},
+    "tickets": {"values": (), "numeric": ()},
+    "contacts": {"values": (), "numeric": ()},
+}
+
+
+def summaries_enabled():
+    """
+    True salvo SYNC_SUMMARIES=false
+    """
+    return os.getenv("SYNC_SUMMARIES", "true").strip().lower() != "false"
+
+
+def has_data(value):
+    """
+    True si el valor contiene un dato real (no vacío, ni "None" ni "null").
+
+    Descripción:
+        Los valores de la API ya son texto: solo se convierte con str() lo
+        que no lo es, una vez por valor.
+    """
+    if not value:
+        return False
+    text = value if isinstance(value, str) else str(value)
+    return bool(text.strip()) and text not in EMPTY_MARKERS
+
+
+def _parse_number(value):
+    """
+    Número de un valor de monto de HubSpot o None (mismo criterio que el resumen original)
+    """
+    if not value:
+        return None
+    text = value if isinstance(value, str) else str(value)
+    if not text.replace(".", "").replace(",", "").isdigit():
+        return None
+    try:
+        return float(text)
+    except (ValueError, TypeError):
+        return None
+
+
+class SummaryStats:
+    """
+    Estadísticas de resumen acumuladas página a página.
+
+    Parámetros:
+        values (tuple): Propiedades con conteo por valor
+        numeric (tuple): Propiedades con suma y cantidad de valores numéricos
+    """
+
+    def __init__(self, values=(), numeric=()):
+        self.total = 0
+        self.filled = Counter()
+        self.value_counts = {name: Counter() for name in values}
+        self.numeric = {name: [0.0, 0] for name in numeric}
+
+    @classmethod
+    def for_entity(cls, entity_type):
+        """
+        Acumulador con las propiedades de resumen de "deals", "tickets" o "contacts"
+        """
+        fields = SUMMARY_FIELDS.get(entity_type, {})
+        return cls(fields.get("values", ()), fields.get("numeric", ()))
+
+    def __len__(self):
+        return self.total
+
+    def add_records(self, records):
+        """
+        Agrega una página de registros de la API ({"properties": {...}})
+        """
+        filled = self.filled
+        for record in records:
+            props = record.get("properties", {})
+            self.total += 1
+            for name, value in props.items():
+                if has_data(value):
+                    filled[name] += 1
+            for name, counter in self.value_counts.items():
+                counter[props.get(name)] += 1
+            for name, accumulated in self.numeric.items():
+                number = _parse_number(props.get(name))
+                if number is not None:
+                    accumulated[0] += number
+                    accumulated[1] += 1
+
+    def add_store(self, store):
+        """
+        Agrega un RecordStore evaluando cada valor distinto una sola vez por columna
+        """
+        self.total += len(store)
+        for name in store.columns:
+            counts = store.value_counts(name)
+            self.filled[name] += sum(count for value, count in counts.items() if has_data(value))
+            if name in self.numeric:
+                for value, count in counts.items():
+                    number = _parse_number(value)
+                    if number is not None:
+                        self.numeric[name][0] += number * count
+                        self.numeric[name][1] += count
+        for name, counter in self.value_counts.items():
+            counter.update(store.value_counts(name))
+
+    def add(self, entities):
+        """
+        Agrega registros extraídos (RecordStore o lista de registros)
+        """
+        if isinstance(entities, RecordStore):
+            self.add_store(entities)
+        else:
+            self.add_records(entities)
+        return self
+
+    def observe(self, pages):
+        """
+        Acumula cada página al pasar y la entrega sin modificarla (carga en streaming)
+        """
+        for page in pages:
+            self.add_records(page)
+            yield page
+
+    def completeness(self):
+        """
+        Propiedades con datos ordenadas por porcentaje descendente.
+
+        Retorna:
+            list: [{"propiedad", "con_datos", "porcentaje"}, ...]
+        """
+        if not self.total:
+            return []
+        prop_stats = [
+            {"propiedad": name, "con_datos": count, "porcentaje": (count / self.total) * 100}
+            for name, count in self.filled.items()
+            if count > 0
+        ]
+        prop_stats.sort(key=lambda x: x["porcentaje"], reverse=True)
+        return prop_stats
+
+    def numeric_summary(self, name):
+        """
+        (suma, cantidad) de los valores numéricos acumulados de una propiedad
+        """
+        total, count = self.numeric.get(name, (0.0, 0))
+        return total, count
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+                    HUBSPOT SYNC STATE - MARCAS DE AGUA DE EXTRACCIÓN INCREMENTAL
+================================================================================
+
+Archivo:            hubspot/sync_state.py
+Descripción:        Persistencia de la marca de agua (high-water mark) por tipo
+                   de objeto para la extracción incremental. La marca se toma
+                   al iniciar la extracción y solo se guarda cuando la carga
+                   en SQL Server termina correctamente; la siguiente ejecución
+                   busca únicamente registros modificados desde esa marca.
+
+Configuración (.env):
+    - HUBSPOT_SYNC_MODE: "full" (default) o "incremental"
+    - HUBSPOT_INCREMENTAL_OVERLAP_MINUTES: Margen hacia atrás aplicado a la
+      marca para cubrir desfases de reloj e indexación (default: 10)
+    - HUBSPOT_SYNC_STATE_FILE: Archivo de estado (default: .cache/sync_state.json)
+
+Funciones Exportadas:
+    - is_incremental_mode(): Indica si la ejecución es incremental
+    - begin_extraction(): Marca de agua vigente y nueva marca candidata
+    - save_watermark(): Persiste la marca tras una carga exitosa
+    - LAST_MODIFIED_PROPERTY: Propiedad de última modificación por objeto
+
+Autor:              Ing. Jose Ríler Solórzano Campos
+Fecha de Creación:  11 de julio de 2025
+Derechos de Autor:  © 2025 Jose Ríler Solórzano Campos. Todos los derechos reservados.
+Licencia:           Uso exclusivo del autor. Prohibida la distribución sin autorización.
+
+================================================================================
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+# ==================== CONFIGURACIÓN ====================
+SYNC_STATE_FILE = Path(os.getenv(
+    "HUBSPOT_SYNC_STATE_FILE",
+    str(Path(__file__).resolve().parent.parent / ".cache" / "sync_state.json")
+))
+INCREMENTAL_OVERLAP_MINUTES = float(os.getenv("HUBSPOT_INCREMENTAL_OVERLAP_MINUTES", "10"))
+
+# Propiedad de última modificación filtrable en la API de búsqueda
+LAST_MODIFIED_PROPERTY = {
+    "deals": "hs_lastmodifieddate",
+    "tickets": "hs_lastmodifieddate",
+    "contacts": "lastmodifieddate",
+}
+
+# Los pipelines pueden guardar marcas en paralelo
+_state_lock = threading.Lock()
+
+
+def is_incremental_mode():
+    """
+    True si HUBSPOT_SYNC_MODE=incremental
+    """
+    return os.getenv("HUBSPOT_SYNC_MODE", "full").strip().lower() == "incremental"
+
+
+def _load_state():
+    """
+    Lee el archivo de estado ({} si no existe o está dañado)
+    """
+    try:
+        with open(SYNC_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_watermark(object_type):
+    """
+    Marca de agua guardada para el objeto (epoch en milisegundos) o None
+    """
+    entry = _load_state().get(object_type) or {}
+    return entry.get("watermark_ms")
+
+
+def begin_extraction(object_type):
+    """
+    Determina desde cuándo extraer y la marca que se guardará si todo sale bien.
+
+    Descripción:
+        La nueva marca es el instante actual menos el margen de solape, tomada
+        ANTES de extraer: cualquier registro modificado durante la extracción
+        vuelve a entrar en la siguiente ejecución (los duplicados se resuelven
+        en la carga por hs_object_id).
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+
+    Retorna:
+        tuple: (modified_since_ms o None para extracción completa, nueva_marca_ms)
+    """
+    new_watermark = int((time.time() - INCREMENTAL_OVERLAP_MINUTES * 60) * 1000)
+    if not is_incremental_mode():
+        return None, new_watermark
+    return get_watermark(object_type), new_watermark
+
+
+def save_watermark(object_type, watermark_ms, records):
+    """
+    Persiste la marca de agua de un objeto después de una carga exitosa.
+
+    Parámetros:
+        object_type (str): "deals", "tickets" o "contacts"
+        watermark_ms (int): Marca calculada por begin_extraction()
+        records (int): Registros cargados en la ejecución (informativo)
+    """
+    with _state_lock:
+        state = _load_state()
+        state[object_type] = {
+            "watermark_ms": watermark_ms,
+            "records": records,
+            "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        SYNC_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = SYNC_STATE_FILE.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, SYNC_STATE_FILE)
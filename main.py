@@ -34,7 +34,17 @@ Licencia:           Uso exclusivo del autor. Prohibida la distribución sin auto
 
 # ==================== IMPORTS ESTÁNDAR ====================
 # Librerías estándar del sistema
+import csv  # Archivos de registros rechazados
 import os  # Variables de entorno del sistema
+import queue  # Cola acotada entre la extracción y la carga en streaming
+import threading  # Registro de tiempos de carga entre pipelines en paralelo
+import time  # Medición de duración por pipeline
+import uuid  # Nombres únicos de archivos de BULK INSERT
+from collections import Counter  # Valores no convertibles por columna
+from concurrent.futures import ThreadPoolExecutor, as_completed  # Pipelines en paralelo
+from datetime import date, datetime  # Formato de valores tipados en archivos de BULK INSERT
+from decimal import Decimal
+from itertools import chain  # Reinsertar la primera página leída en streaming
 from pathlib import Path  # Manejo de rutas de archivos multiplataforma
 
 import pyodbc  # Conector ODBC para SQL Server
@@ -53,13 +63,16 @@ load_dotenv(dotenv_path=env_path)
 import importlib.util
 
 from hubspot.fetch_contacts import (
+    display_contacts_summary,
     fetch_contacts_from_hubspot,
     get_all_contact_properties_list,
+    stream_contacts_from_hubspot,
 )
 from hubspot.fetch_deals import (
     display_extended_summary,
     fetch_deals_from_hubspot,
     get_all_deal_properties_list,
+    stream_deals_from_hubspot,
 )
 from hubspot.fetch_deals_pipelines import fetch_deal_pipelines_as_table
 from hubspot.fetch_owners import display_owners_summary, fetch_owners_as_table
@@ -67,8 +80,29 @@ from hubspot.fetch_tickets import (
     display_tickets_summary,
     fetch_tickets_from_hubspot,
     get_all_ticket_properties_list,
+    stream_tickets_from_hubspot,
 )
 from hubspot.fetch_tickets_pipelines import fetch_ticket_pipelines_as_table
+from hubspot.column_types import (
+    SQL_BIGINT,
+    SQL_BIT,
+    SQL_DATE,
+    SQL_DATETIME,
+    SQL_DECIMAL,
+    SQL_TEXT_LEGACY,
+    ValueConversionError,
+    build_column_types,
+    convert_value,
+    text_type_length,
+    truncate_utf16,
+    typed_columns_enabled,
+)
+from hubspot.http_client import display_request_stats
+from hubspot.manifest import get_manifest_column_types, get_manifest_properties
+from hubspot.properties import get_loaded_property_definitions
+from hubspot.record_store import RecordStore
+from hubspot.stats import SummaryStats, summaries_enabled
+from hubspot.sync_state import begin_extraction, save_watermark
 
 _escritura_path = Path(__file__).resolve().parent / "escritura"
 _security_module_path = _escritura_path / "utils" / "security.py"
@@ -92,14 +126,17 @@ def main():
 
     Descripción:
         Coordina todo el proceso de sincronización entre HubSpot y SQL Server.
-        Procesa secuencialmente: Deals → Tickets → Contactos → Owners → Pipelines
+        Cada entidad (Deals, Tickets, Contactos, Owners, Pipelines) es un
+        pipeline independiente de extracción + carga. Con SYNC_PIPELINE_WORKERS=1
+        se procesan en serie (Deals → Tickets → Contactos → Owners → Pipelines);
+        con más workers corren en paralelo con un número acotado de hilos.
 
     Flujo de Ejecución:
         1. Verificación de variables de entorno (verify_environment)
-        2. Extracción de datos desde HubSpot API
-        3. Análisis dinámico de propiedades útiles
+        2. Ejecución de pipelines por entidad (run_entity_pipelines)
+        3. Extracción de datos desde HubSpot API con análisis dinámico de propiedades
         4. Sincronización directa con SQL Server
-        5. Generación de resúmenes estadísticos
+        5. Resumen final con estado por entidad
 
     Dependencias:
         - Módulos hubspot/fetch_*.py para extracción de datos
@@ -121,126 +158,349 @@ def main():
     if not verify_environment():
         return
 
+    results = run_entity_pipelines(ENTITY_PIPELINES, get_pipeline_workers())
+
+    # ==================== ✅ RESUMEN FINAL DE SINCRONIZACIÓN ✅ ====================
+    # Muestra estadísticas consolidadas de todo el proceso
+    print("\n" + "=" * 70)
+    print("✅ SINCRONIZACIÓN COMPLETA")
+    print("=" * 70)
+
+    # Imprime contadores finales para verificación
+    deals, tickets, contacts = results["deals"], results["tickets"], results["contacts"]
+    print(f"🔹 Deals sincronizados: {deals['records']} con {deals['properties']} propiedades")
+    print(f"🎫 Tickets sincronizados: {tickets['records']} con {tickets['properties']} propiedades")
+    print(f"👥 Contactos sincronizados: {contacts['records']} con {contacts['properties']} propiedades")
+    print(f"👨‍💼 Owners sincronizados: {results['owners']['records']}")
+    print(f"📊 Pipelines de tickets: {results['tickets_pipelines']['records']} filas")
+    print(f"📊 Pipelines de deals: {results['deals_pipelines']['records']} filas")
+
+    # Estado y duración de cada pipeline
+    print("\n⏱️ ESTADO POR ENTIDAD:")
+    for name, _, _ in ENTITY_PIPELINES:
+        result = results[name]
+        status = "✅" if result["ok"] else "❌"
+        detail = f" - {result['error']}" if result["error"] else ""
+        print(f"   {status} {name:<18} {result['duration']:7.1f}s{detail}")
+
+    # Latencia acumulada por endpoint de HubSpot (transporte compartido)
+    display_request_stats()
+
+    # Rendimiento de carga en SQL Server por tabla y sink
+    display_load_timings()
+
+    failed = [name for name, result in results.items() if not result["ok"]]
+    if failed:
+        print(f"\n⚠️ Proceso completado con errores en: {', '.join(failed)}")
+    else:
+        print("\n🎉 ¡Proceso completado exitosamente!")
+
+
+# ==================== 🔀 PIPELINES POR ENTIDAD ====================
+
+
+def run_streaming_entity_pipeline(stream_fn, table_name, entity_type, modified_since, new_watermark, summary_fn=None):
+    """
+    Pipeline de entidad en streaming: extracción página a página + carga simultánea.
+
+    Parámetros:
+        stream_fn (callable): stream_*_from_hubspot(modified_since)
+        table_name (str): Tabla destino
+        entity_type (str): "deals", "tickets" o "contacts"
+        modified_since (int): Marca de agua vigente (None = extracción completa)
+        new_watermark (int): Marca a guardar si la carga termina correctamente
+        summary_fn (callable): Resumen a mostrar al terminar; sus estadísticas
+            se acumulan a medida que pasan las páginas (SYNC_SUMMARIES)
+
+    Retorna:
+        dict: {"records": int, "properties": int, "ok": bool}
+    """
+    properties_list, pages = stream_fn(modified_since)
+    stats = SummaryStats.for_entity(entity_type) if summary_fn and summaries_enabled() else None
+    if stats is not None:
+        pages = stats.observe(pages)
+    ok, records = stream_entities(pages, table_name, properties_list, entity_type, incremental=modified_since is not None)
+    if ok and stats:
+        summary_fn(stats)
+    if ok and (records or modified_since is not None):
+        save_watermark(entity_type, new_watermark, records)
+    return {"records": records, "properties": len(properties_list), "ok": ok}
+
+
+def run_deals_pipeline():
+    """
+    Pipeline de deals: extracción con análisis dinámico de propiedades + carga en hb_deals.
+
+    Retorna:
+        dict: {"records": int, "properties": int, "ok": bool}
+    """
     # ==================== 🔹 PROCESAMIENTO DE DEALS 🔹 ====================
-    # Extrae deals desde HubSpot API usando fetch_deals.py
     print("\n" + "=" * 50)
     print("🔹 PROCESANDO DEALS")
     print("=" * 50)
 
     # Obtiene lista completa de deals con análisis dinámico de propiedades
-    deals = fetch_deals_from_hubspot()
+    # Marca de agua: modified_since=None implica extracción completa
+    modified_since, new_watermark = begin_extraction("deals")
+    if streaming_enabled("hb_deals"):
+        # Páginas insertadas a medida que llegan (resumen acumulado página a página)
+        return run_streaming_entity_pipeline(
+            stream_deals_from_hubspot, "hb_deals", "deals", modified_since, new_watermark, summary_fn=display_extended_summary
+        )
+
+    deals = fetch_deals_from_hubspot(modified_since)
     # Obtiene lista de propiedades que realmente contienen datos útiles
     DEAL_PROPERTIES_DYNAMIC = get_all_deal_properties_list()
 
-    # Procesa deals si se encontraron datos
-    if deals:
-        # Muestra resumen estadístico detallado usando display_extended_summary()
+    if not deals:
+        if modified_since is not None:
+            print("✅ Sin deals modificados desde la última ejecución.")
+            save_watermark("deals", new_watermark, 0)
+        else:
+            print("⚠️ No se encontraron deals.")
+        return {"records": 0, "properties": 0, "ok": True}
+
+    # Muestra resumen estadístico detallado usando display_extended_summary()
+    if summaries_enabled():
         display_extended_summary(deals)
-        # Sincroniza datos directamente con tabla hb_deals en SQL Server
-        sync_entities_direct(deals, "hb_deals", DEAL_PROPERTIES_DYNAMIC, entity_type="deals")
-    else:
-        print("⚠️ No se encontraron deals.")
-        DEAL_PROPERTIES_DYNAMIC = []
+    # Sincroniza con hb_deals según SQL_LOAD_MODE (recreate/merge) y el modo de extracción
+    ok = load_entities(deals, "hb_deals", DEAL_PROPERTIES_DYNAMIC, "deals", incremental=modified_since is not None)
+    if ok:
+        save_watermark("deals", new_watermark, len(deals))
+    return {"records": len(deals), "properties": len(DEAL_PROPERTIES_DYNAMIC), "ok": ok}
+
+
+def run_tickets_pipeline():
+    """
+    Pipeline de tickets: extracción con análisis dinámico de propiedades + carga en hb_tickets.
 
+    Retorna:
+        dict: {"records": int, "properties": int, "ok": bool}
+    """
     # ==================== 🎫 PROCESAMIENTO DE TICKETS 🎫 ====================
-    # Extrae tickets desde HubSpot API usando fetch_tickets.py
     print("\n" + "=" * 50)
     print("🎫 PROCESANDO TICKETS")
     print("=" * 50)
 
     # Obtiene lista completa de tickets con análisis dinámico de propiedades
-    tickets = fetch_tickets_from_hubspot()
+    # Marca de agua: modified_since=None implica extracción completa
+    modified_since, new_watermark = begin_extraction("tickets")
+    if streaming_enabled("hb_tickets"):
+        # Páginas insertadas a medida que llegan (resumen acumulado página a página)
+        return run_streaming_entity_pipeline(
+            stream_tickets_from_hubspot, "hb_tickets", "tickets", modified_since, new_watermark, summary_fn=display_tickets_summary
+        )
+
+    tickets = fetch_tickets_from_hubspot(modified_since)
     # Obtiene propiedades específicas de tickets que contienen datos
     TICKETS_PROPERTIES_DYNAMIC = get_all_ticket_properties_list()
 
-    # Procesa tickets si se encontraron datos
-    if tickets:
-        # Muestra resumen estadístico usando display_tickets_summary()
+    if not tickets:
+        if modified_since is not None:
+            print("✅ Sin tickets modificados desde la última ejecución.")
+            save_watermark("tickets", new_watermark, 0)
+        else:
+            print("⚠️ No se encontraron tickets.")
+        return {"records": 0, "properties": 0, "ok": True}
+
+    # Muestra resumen estadístico usando display_tickets_summary()
+    if summaries_enabled():
         display_tickets_summary(tickets)
-        # Sincroniza datos directamente con tabla hb_tickets en SQL Server
-        sync_entities_direct(tickets, "hb_tickets", TICKETS_PROPERTIES_DYNAMIC, entity_type="tickets")
-    else:
-        print("⚠️ No se encontraron tickets.")
-        TICKETS_PROPERTIES_DYNAMIC = []
+    # Sincroniza con hb_tickets según SQL_LOAD_MODE (recreate/merge) y el modo de extracción
+    ok = load_entities(tickets, "hb_tickets", TICKETS_PROPERTIES_DYNAMIC, "tickets", incremental=modified_since is not None)
+    if ok:
+        save_watermark("tickets", new_watermark, len(tickets))
+    return {"records": len(tickets), "properties": len(TICKETS_PROPERTIES_DYNAMIC), "ok": ok}
+
+
+def run_contacts_pipeline():
+    """
+    Pipeline de contactos: extracción con análisis dinámico de propiedades + carga en hb_contacts.
 
+    Retorna:
+        dict: {"records": int, "properties": int, "ok": bool}
+    """
     # ==================== 👥 PROCESAMIENTO DE CONTACTOS 👥 ====================
-    # Extrae contactos desde HubSpot API usando fetch_contacts.py
     print("\n" + "=" * 50)
     print("👥 PROCESANDO CONTACTS")
     print("=" * 50)
 
     # Obtiene lista completa de contactos con análisis dinámico de propiedades
-    contacts = fetch_contacts_from_hubspot()
+    # Marca de agua: modified_since=None implica extracción completa
+    modified_since, new_watermark = begin_extraction("contacts")
+    if streaming_enabled("hb_contacts"):
+        # Páginas insertadas a medida que llegan (resumen acumulado página a página)
+        return run_streaming_entity_pipeline(
+            stream_contacts_from_hubspot, "hb_contacts", "contacts", modified_since, new_watermark, summary_fn=display_contacts_summary
+        )
+
+    contacts = fetch_contacts_from_hubspot(modified_since)
     # Obtiene propiedades específicas de contactos que contienen datos
     CONTACTS_PROPERTIES_DYNAMIC = get_all_contact_properties_list()
 
-    # Procesa contactos si se encontraron datos
-    if contacts:
-        # Nota: display_contacts_summary() disponible si se implementa en el futuro
-        # display_contacts_summary(contacts)
-        # Sincroniza datos directamente con tabla hb_contacts en SQL Server
-        sync_entities_direct(contacts, "hb_contacts", CONTACTS_PROPERTIES_DYNAMIC, entity_type="contacts")
-    else:
-        print("⚠️ No se encontraron contactos.")
-        CONTACTS_PROPERTIES_DYNAMIC = []
+    if not contacts:
+        if modified_since is not None:
+            print("✅ Sin contactos modificados desde la última ejecución.")
+            save_watermark("contacts", new_watermark, 0)
+        else:
+            print("⚠️ No se encontraron contactos.")
+        return {"records": 0, "properties": 0, "ok": True}
+
+    # Muestra resumen estadístico usando display_contacts_summary()
+    if summaries_enabled():
+        display_contacts_summary(contacts)
+    # Sincroniza con hb_contacts según SQL_LOAD_MODE (recreate/merge) y el modo de extracción
+    ok = load_entities(contacts, "hb_contacts", CONTACTS_PROPERTIES_DYNAMIC, "contacts", incremental=modified_since is not None)
+    if ok:
+        save_watermark("contacts", new_watermark, len(contacts))
+    return {"records": len(contacts), "properties": len(CONTACTS_PROPERTIES_DYNAMIC), "ok": ok}
+
+
+def run_owners_pipeline():
+    """
+    Pipeline de owners: extracción tabular + carga en hb_owners.
 
+    Retorna:
+        dict: {"records": int, "ok": bool}
+    """
     # ==================== 👨‍💼 PROCESAMIENTO DE OWNERS 👨‍💼 ====================
-    # Extrae owners (propietarios) desde HubSpot API usando fetch_owners.py
     print("\n" + "=" * 50)
     print("👨‍💼 PROCESANDO OWNERS")
     print("=" * 50)
 
     # Obtiene datos de owners ya formateados como tabla
     owners_data = fetch_owners_as_table()
-    if owners_data:
-        # Muestra resumen estadístico usando display_owners_summary()
-        display_owners_summary(owners_data)
-        # Sincroniza usando función específica para datos tabulares
-        sync_table_data(owners_data, "hb_owners")
-    else:
+    if not owners_data:
         print("⚠️ No se encontraron owners.")
+        return {"records": 0, "ok": True}
+
+    # Muestra resumen estadístico usando display_owners_summary()
+    display_owners_summary(owners_data)
+    # Sincroniza usando función específica para datos tabulares
+    ok = sync_table_data(owners_data, "hb_owners")
+    return {"records": len(owners_data), "ok": ok}
 
+
+def run_tickets_pipelines_pipeline():
+    """
+    Pipeline de pipelines de tickets: estructura de etapas + carga en hb_tickets_pipeline.
+
+    Retorna:
+        dict: {"records": int, "ok": bool}
+    """
     # ==================== 📊 PROCESAMIENTO DE PIPELINES 📊 ====================
-    # Extrae pipelines (etapas de procesos) desde HubSpot API
     print("\n" + "=" * 50)
     print("📊 PROCESANDO PIPELINES")
     print("=" * 50)
 
-    # Pipelines de tickets - usa fetch_tickets_pipelines.py
     print("\n🎫 Pipelines de tickets...")
     # Obtiene estructura de pipelines de tickets con sus etapas
     tickets_pipelines_data = fetch_ticket_pipelines_as_table()
-    if tickets_pipelines_data:
-        # Sincroniza con tabla hb_tickets_pipeline en SQL Server
-        sync_table_data(tickets_pipelines_data, "hb_tickets_pipeline")
-    else:
+    if not tickets_pipelines_data:
         print("⚠️ No se encontraron pipelines de tickets.")
+        return {"records": 0, "ok": True}
+
+    # Sincroniza con tabla hb_tickets_pipeline en SQL Server
+    ok = sync_table_data(tickets_pipelines_data, "hb_tickets_pipeline")
+    return {"records": len(tickets_pipelines_data), "ok": ok}
+
 
-    # Pipelines de deals - usa fetch_deals_pipelines.py
+def run_deals_pipelines_pipeline():
+    """
+    Pipeline de pipelines de deals: estructura de etapas + carga en hb_deals_pipeline.
+
+    Retorna:
+        dict: {"records": int, "ok": bool}
+    """
     print("\n🔹 Pipelines de deals...")
     # Obtiene estructura de pipelines de deals con sus etapas
     deals_pipelines_data = fetch_deal_pipelines_as_table()
-    if deals_pipelines_data:
-        # Sincroniza con tabla hb_deals_pipeline en SQL Server
-        sync_table_data(deals_pipelines_data, "hb_deals_pipeline")
-    else:
+    if not deals_pipelines_data:
         print("⚠️ No se encontraron pipelines de deals.")
+        return {"records": 0, "ok": True}
 
-    # ==================== ✅ RESUMEN FINAL DE SINCRONIZACIÓN ✅ ====================
-    # Muestra estadísticas consolidadas de todo el proceso
-    print("\n" + "=" * 70)
-    print("✅ SINCRONIZACIÓN COMPLETA")
-    print("=" * 70)
+    # Sincroniza con tabla hb_deals_pipeline en SQL Server
+    ok = sync_table_data(deals_pipelines_data, "hb_deals_pipeline")
+    return {"records": len(deals_pipelines_data), "ok": ok}
 
-    # Imprime contadores finales para verificación
-    print(f"🔹 Deals sincronizados: {len(deals)} con {len(DEAL_PROPERTIES_DYNAMIC)} propiedades")
-    print(f"🎫 Tickets sincronizados: {len(tickets)} con {len(TICKETS_PROPERTIES_DYNAMIC)} propiedades")
-    print(f"👥 Contactos sincronizados: {len(contacts)} con {len(CONTACTS_PROPERTIES_DYNAMIC)} propiedades")
-    print(f"👨‍💼 Owners sincronizados: {len(owners_data)}")
-    print(f"📊 Pipelines de tickets: {len(tickets_pipelines_data)} filas")
-    print(f"📊 Pipelines de deals: {len(deals_pipelines_data)} filas")
 
-    print("\n🎉 ¡Proceso completado exitosamente!")
+# Pipelines en orden serie: (nombre, prioridad en modo paralelo, función)
+# En paralelo se despacha primero contactos (la extracción más larga) y luego
+# las entidades pequeñas para que se solapen por completo con ella.
+ENTITY_PIPELINES = [
+    ("deals", 2, run_deals_pipeline),
+    ("tickets", 2, run_tickets_pipeline),
+    ("contacts", 0, run_contacts_pipeline),
+    ("owners", 1, run_owners_pipeline),
+    ("tickets_pipelines", 1, run_tickets_pipelines_pipeline),
+    ("deals_pipelines", 1, run_deals_pipelines_pipeline),
+]
+
+
+def get_pipeline_workers():
+    """
+    Número máximo de pipelines de entidad ejecutándose a la vez (SYNC_PIPELINE_WORKERS, mínimo 1)
+    """
+    try:
+        return max(1, int(os.getenv("SYNC_PIPELINE_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def _run_single_pipeline(name, pipeline_fn):
+    """
+    Ejecuta un pipeline capturando errores y midiendo su duración.
+
+    Retorna:
+        dict: Resultado normalizado con records, properties, ok, error y duration
+    """
+    start = time.perf_counter()
+    result = {"records": 0, "properties": 0, "ok": False, "error": None}
+    try:
+        result.update(pipeline_fn())
+        if not result["ok"]:
+            result["error"] = "falló la sincronización con SQL Server"
+    except Exception as e:
+        print(f"❌ Error en pipeline '{name}': {str(e)}")
+        result["error"] = str(e)
+    result["duration"] = time.perf_counter() - start
+    return result
+
+
+def run_entity_pipelines(pipelines, max_workers=1):
+    """
+    Ejecuta los pipelines de extracción + carga por entidad con paralelismo acotado.
+
+    Descripción:
+        Las entidades solo comparten el destino SQL Server (cada carga abre su
+        propia conexión), por lo que pueden procesarse de forma concurrente.
+        Con max_workers=1 se conserva el orden serie original.
+
+    Parámetros:
+        pipelines (list): Lista ENTITY_PIPELINES de tuplas (nombre, prioridad, función)
+        max_workers (int): Pipelines simultáneos
+
+    Retorna:
+        dict: Resultado por nombre de entidad (records, properties, ok, error, duration)
+    """
+    results = {}
+
+    if max_workers <= 1:
+        for name, _, pipeline_fn in pipelines:
+            results[name] = _run_single_pipeline(name, pipeline_fn)
+        return results
+
+    ordered = sorted(pipelines, key=lambda p: p[1])
+    print(f"\n⚡ Ejecutando {len(ordered)} pipelines con {max_workers} workers en paralelo...")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline") as executor:
+        futures = {executor.submit(_run_single_pipeline, name, fn): name for name, _, fn in ordered}
+        for future in as_completed(futures):
+            name = futures[future]
+            results[name] = future.result()
+            status = "✅" if results[name]["ok"] else "❌"
+            print(f"{status} Pipeline '{name}' terminado en {results[name]['duration']:.1f}s")
+
+    return results
 
 
 # ==================== 🛠 FUNCIONES DE CONFIGURACIÓN Y VALIDACIÓN ====================
@@ -370,23 +630,26 @@ def table_exists(cursor, table_name):
     return cursor.fetchone() is not None
 
 
-def create_table(cursor, table_name, columns):
+def create_table(cursor, table_name, columns, column_types=None):
     """
     Crea una nueva tabla con las columnas especificadas.
 
     Descripción:
-        Genera dinámicamente una tabla SQL Server con todas las columnas
-        como NVARCHAR(MAX) para máxima compatibilidad con datos HubSpot.
+        Genera dinámicamente una tabla SQL Server. Con column_types cada
+        columna usa el tipo derivado de la metadata de HubSpot; sin él todas
+        las columnas se crean como NVARCHAR(MAX).
         **SEGURIDAD:** Sanitiza nombres de tablas y columnas para prevenir SQL Injection.
 
     Parámetros:
         cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
         table_name (str): Nombre de la tabla a crear
         columns (list): Lista de nombres de columnas
+        column_types (dict): Tipo SQL por columna (opcional, ver hubspot/column_types.py)
 
     Tipo de Datos:
-        Todas las columnas se crean como NVARCHAR(MAX) para flexibilidad
-        máxima con datos variados de HubSpot API
+        - Entidades (deals, tickets, contacts): DECIMAL, DATETIME2, DATE, BIT,
+          BIGINT y NVARCHAR acotado según la metadata de propiedades
+        - Datos tabulares (owners, pipelines) o SQL_TYPED_COLUMNS=false: NVARCHAR(MAX)
 
     Uso:
         Llamada después de verificar que la tabla no existe
@@ -408,7 +671,8 @@ def create_table(cursor, table_name, columns):
         raise ValueError(f"Nombre de columna inválido: {str(e)}")
 
     # Generar definiciones de columnas con corchetes para nombres especiales
-    column_defs = ", ".join([f"[{col}] NVARCHAR(MAX)" for col in sanitized_columns])
+    column_types = column_types or {}
+    column_defs = ", ".join([f"[{col}] {column_types.get(col, SQL_TEXT_LEGACY)}" for col in sanitized_columns])
     cursor.execute(f"CREATE TABLE [{sanitized_table}] ({column_defs})")
 
 
@@ -446,174 +710,1715 @@ def drop_table(cursor, table_name):
     cursor.execute(f"DROP TABLE IF EXISTS [{sanitized_table}]")
 
 
-# ==================== 🔄 FUNCIONES DE SINCRONIZACIÓN PRINCIPAL ====================
+def get_table_columns(cursor, table_name):
+    """
+    Obtiene los nombres de columnas existentes de una tabla.
 
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Nombre de la tabla
 
-def sync_entities_direct(entities, table_name, properties_list, entity_type="entities"):
+    Retorna:
+        list: Nombres de columnas en orden de definición
     """
-    Sincronización principal para entidades HubSpot (deals, tickets, contacts).
+    cursor.execute(
+        """
+        SELECT COLUMN_NAME
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_NAME = ?
+        ORDER BY ORDINAL_POSITION
+    """,
+        (table_name,),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def add_missing_columns(cursor, table_name, columns, column_types=None):
+    """
+    Agrega a una tabla existente las columnas que aún no tiene.
 
     Descripción:
-        Función unificada que maneja la sincronización completa de cualquier
-        tipo de entidad desde HubSpot hacia SQL Server con fallback automático.
+        En modo incremental la tabla se conserva; si HubSpot empieza a
+        reportar datos en propiedades nuevas se agregan con el mismo tipo
+        que usaría create_table(). Las columnas NVARCHAR(n) existentes que
+        quedaron cortas (ej: una enumeración con una opción nueva más larga)
+        se amplían con widen_text_columns().
+        **SEGURIDAD:** Sanitiza nombres de tabla y columnas.
 
     Parámetros:
-        entities (list): Lista de entidades obtenidas desde HubSpot API
-        table_name (str): Nombre de la tabla SQL destino (ej: "hb_deals")
-        properties_list (list): Lista de propiedades útiles para filtrar
-        entity_type (str): Tipo de entidad para logs ("deals", "tickets", "contacts")
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Nombre de la tabla
+        columns (list): Columnas requeridas por los datos a cargar
+        column_types (dict): Tipo SQL por columna (opcional)
 
-    Flujo de Procesamiento:
-        1. Extracción de propiedades desde cada entidad
-        2. Análisis de columnas disponibles vs requeridas
-        3. Conexión y manejo de base de datos
-        4. Recreación completa de tabla (DROP + CREATE)
-        5. Inserción masiva optimizada
-        6. Fallback a sincronización manual en caso de error
+    Retorna:
+        list: Columnas agregadas
+    """
+    try:
+        sanitized_table = sanitize_sql_identifier(table_name)
+        sanitized_columns = sanitize_sql_identifiers(columns)
+    except Exception as e:
+        raise ValueError(f"Error de seguridad en nombres SQL: {str(e)}")
 
-    Origen de Datos:
-        - entities: Retornado por hubspot/fetch_*.py
-        - properties_list: Retornado por get_all_*_properties_list()
+    existing = {col.lower() for col in get_table_columns(cursor, sanitized_table)}
+    missing = [col for col in sanitized_columns if col.lower() not in existing]
 
-    Destino:
-        Tablas SQL Server: hb_deals, hb_tickets, hb_contacts
+    column_types = column_types or {}
+    for col in missing:
+        cursor.execute(f"ALTER TABLE [{sanitized_table}] ADD [{col}] {column_types.get(col, SQL_TEXT_LEGACY)} NULL")
 
-    Manejo de Errores:
-        Automáticamente invoca sync_entities_manual() como fallback
+    if missing:
+        print(f"➕ Columnas nuevas en '{table_name}': {len(missing)}")
 
-    Optimizaciones:
-        - Usa todas las propiedades encontradas para máxima completitud
-        - Inserción por lotes para mejor performance
-        - Transacciones para integridad de datos
+    widen_text_columns(cursor, sanitized_table, column_types)
+    return missing
+
+
+def widen_text_columns(cursor, table_name, column_types):
     """
-    if not entities:
-        print(f"⚠️ No se encontraron {entity_type} para {table_name}.")
-        return
+    Amplía las columnas NVARCHAR(n) existentes más cortas que el tipo requerido.
 
-    try:
-        print(f"\n🚀 SINCRONIZACIÓN DIRECTA DE {entity_type.upper()}")
-        print(f"📊 {entity_type.capitalize()}: {len(entities)}")
-        print(f"📊 Propiedades: {len(properties_list)}")
+    Descripción:
+        Las columnas nunca se reducen ni cambian de tipo; solo se amplía un
+        NVARCHAR(n) cuando la carga requiere un largo mayor (o MAX), para
+        que los valores nuevos no fallen por truncamiento.
 
-        # Extraer todas las propiedades disponibles de las entidades
-        entities_data = []
-        all_properties = set()
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Nombre de la tabla (sanitizado)
+        column_types (dict): Tipo SQL requerido por columna (sanitizadas)
 
-        for entity in entities:
-            props = entity.get("properties", {})
-            entities_data.append(props)
-            all_properties.update(props.keys())
+    Retorna:
+        list: Columnas ampliadas
+    """
+    if not column_types:
+        return []
 
-        # Priorizar propiedades encontradas sobre lista predefinida
-        columns = list(all_properties) if all_properties else properties_list
-        print(f"📊 Columnas finales: {len(columns)}")
+    cursor.execute(
+        """
+        SELECT COLUMN_NAME, CHARACTER_MAXIMUM_LENGTH
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_NAME = ? AND DATA_TYPE = 'nvarchar'
+    """,
+        (table_name,),
+    )
+    current_lengths = {row[0].lower(): row[1] for row in cursor.fetchall()}
 
-        # Establecer conexión y gestionar tabla
-        conn = get_sql_connection()
-        cursor = conn.cursor()
+    widened = []
+    for col, sql_type in column_types.items():
+        required = text_type_length(sql_type)
+        current = current_lengths.get(col.lower())
+        if required is None or current is None or current == -1:
+            continue
+        if required == -1 or required > current:
+            cursor.execute(f"ALTER TABLE [{table_name}] ALTER COLUMN [{col}] {sql_type} NULL")
+            widened.append(col)
 
-        # Recrear tabla completamente para sincronización completa
-        if table_exists(cursor, table_name):
-            print(f"🗑️ Borrando tabla existente '{table_name}'...")
-            drop_table(cursor, table_name)
+    if widened:
+        print(f"↔️ Columnas de texto ampliadas en '{table_name}': {', '.join(widened)}")
+    return widened
 
-        print(f"📦 Creando tabla '{table_name}'...")
-        create_table(cursor, table_name, columns)
 
-        print(f"⬇️ Insertando {len(entities_data)} registros...")
-        # Llamar función especializada para inserción de entidades
-        insert_entities_data(cursor, table_name, entities_data, columns, entity_type)
+def delete_rows_by_id(cursor, table_name, record_ids, chunk_size=1000):
+    """
+    Elimina las filas cuyo hs_object_id está en la lista (por bloques de parámetros).
 
-        # Cerrar conexión (el commit ya se maneja en insert_entities_data)
-        cursor.close()
-        conn.close()
-        print(f"✅ Sincronización directa completa para '{table_name}'.")
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Nombre de la tabla
+        record_ids (list): Valores de hs_object_id a eliminar
+        chunk_size (int): IDs por sentencia (SQL Server admite hasta 2100 parámetros)
 
-    except Exception as e:
-        print(f"❌ Error durante la sincronización: {str(e)}")
-        # Fallback automático a método manual
-        sync_entities_manual(entities, table_name, entity_type)
+    Retorna:
+        int: Filas eliminadas
+    """
+    sanitized_table = sanitize_sql_identifier(table_name)
+    deleted = 0
+    for i in range(0, len(record_ids), chunk_size):
+        chunk = record_ids[i : i + chunk_size]
+        placeholders = ", ".join(["?" for _ in chunk])
+        cursor.execute(f"DELETE FROM [{sanitized_table}] WHERE [hs_object_id] IN ({placeholders})", chunk)
+        deleted += max(cursor.rowcount, 0)
+    return deleted
 
 
-def sync_table_data(table_data, table_name):
+def shadow_table_name(table_name):
     """
-    Sincronización para datos ya estructurados como tabla (owners, pipelines).
+    Nombre de la tabla sombra donde se carga la nueva versión de una tabla
+    """
+    return f"{table_name}__shadow"
 
-    Descripción:
-        Maneja la sincronización de datos que ya vienen estructurados
-        como lista de diccionarios desde las funciones fetch_*_as_table().
+
+def previous_table_name(table_name):
+    """
+    Nombre de la versión anterior conservada tras el intercambio (rollback)
+    """
+    return f"{table_name}__old"
+
+
+def prepare_shadow_table(cursor, table_name, columns, column_types=None):
+    """
+    Crea (o recrea) la tabla sombra vacía para una carga completa.
 
     Parámetros:
-        table_data (list): Lista de diccionarios con datos estructurados
-        table_name (str): Nombre de la tabla SQL destino
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Tabla destino final
+        columns (list): Columnas de la carga
+        column_types (dict): Tipo SQL por columna (opcional)
 
-    Origen de Datos:
-        - fetch_owners_as_table(): Para tabla hb_owners
-        - fetch_*_pipelines_as_table(): Para tablas hb_*_pipeline
+    Retorna:
+        str: Nombre de la tabla sombra creada
+    """
+    shadow_table = shadow_table_name(table_name)
+    drop_table(cursor, shadow_table)
+    create_table(cursor, shadow_table, columns, column_types)
+    return shadow_table
 
-    Flujo de Procesamiento:
-        1. Extracción de columnas del primer registro
-        2. Conexión a base de datos
-        3. Recreación de tabla
-        4. Inserción de datos estructurados
 
-    Diferencias con sync_entities_direct():
-        - Los datos ya vienen estructurados como tabla
-        - No requiere extracción de propiedades
-        - Usa insert_table_data() en lugar de insert_entities_data()
+def swap_in_shadow_table(cursor, table_name):
+    """
+    Publica la tabla sombra como tabla destino en una única transacción corta.
 
-    Destinos:
-        Tablas SQL Server: hb_owners, hb_tickets_pipeline, hb_deals_pipeline
+    Descripción:
+        La tabla destino se renombra a {tabla}__old y la sombra toma su nombre
+        con sp_rename dentro de la misma transacción: los lectores ven la
+        versión anterior completa o la nueva completa, nunca una tabla
+        inexistente o a medio cargar. La versión anterior se conserva para
+        rollback (restore_previous_table) salvo SQL_KEEP_PREVIOUS_TABLE=false.
+        **SEGURIDAD:** Sanitiza los nombres de tabla.
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo (autocommit=False)
+        table_name (str): Tabla destino final
     """
-    if not table_data:
-        print(f"⚠️ No hay datos para {table_name}.")
-        return
+    sanitized_table = sanitize_sql_identifier(table_name)
+    shadow_table = sanitize_sql_identifier(shadow_table_name(sanitized_table))
+    old_table = sanitize_sql_identifier(previous_table_name(sanitized_table))
+
+    # Confirmar la carga de la sombra antes de abrir la transacción del intercambio
+    cursor.connection.commit()
 
     try:
-        print(f"\n📊 SINCRONIZANDO TABLA {table_name.upper()}")
-        print(f"📊 Registros: {len(table_data)}")
+        drop_table(cursor, old_table)
+        if table_exists(cursor, sanitized_table):
+            cursor.execute("EXEC sp_rename ?, ?", (sanitized_table, old_table))
+        cursor.execute("EXEC sp_rename ?, ?", (shadow_table, sanitized_table))
+        cursor.connection.commit()
+    except Exception:
+        cursor.connection.rollback()
+        raise
 
-        # Obtener estructura de columnas del primer registro
-        columns = list(table_data[0].keys()) if table_data else []
-        print(f"📊 Columnas: {len(columns)}")
+    if os.getenv("SQL_KEEP_PREVIOUS_TABLE", "true").strip().lower() == "false":
+        drop_table(cursor, old_table)
+        cursor.connection.commit()
+
+    print(f"🔄 Tabla '{table_name}' publicada (versión anterior en '{old_table}')")
 
-        # Establecer conexión y gestionar tabla
-        conn = get_sql_connection()
-        cursor = conn.cursor()
 
-        # Recrear tabla completamente
-        if table_exists(cursor, table_name):
-            print(f"🗑️ Borrando tabla existente '{table_name}'...")
-            drop_table(cursor, table_name)
+def restore_previous_table(table_name):
+    """
+    Revierte el último intercambio: {tabla}__old vuelve a ser la tabla destino.
 
-        print(f"📦 Creando tabla '{table_name}'...")
-        create_table(cursor, table_name, columns)
+    Descripción:
+        La versión descartada queda como {tabla}__shadow para inspección.
 
-        print(f"⬇️ Insertando {len(table_data)} registros...")
-        # Usar función especializada para datos tabulares
-        insert_table_data(cursor, table_name, table_data, columns)
+    Parámetros:
+        table_name (str): Tabla destino a revertir
+
+    Retorna:
+        bool: True si se restauró la versión anterior
+    """
+    sanitized_table = sanitize_sql_identifier(table_name)
+    shadow_table = sanitize_sql_identifier(shadow_table_name(sanitized_table))
+    old_table = sanitize_sql_identifier(previous_table_name(sanitized_table))
 
-        # Confirmar transacción y cerrar conexión
+    conn = get_sql_connection()
+    cursor = conn.cursor()
+    try:
+        if not table_exists(cursor, old_table):
+            print(f"⚠️ No hay versión anterior de '{table_name}' para restaurar.")
+            return False
+
+        drop_table(cursor, shadow_table)
+        if table_exists(cursor, sanitized_table):
+            cursor.execute("EXEC sp_rename ?, ?", (sanitized_table, shadow_table))
+        cursor.execute("EXEC sp_rename ?, ?", (old_table, sanitized_table))
         conn.commit()
+        print(f"⏪ '{table_name}' restaurada a la versión anterior.")
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error restaurando '{table_name}': {str(e)}")
+        return False
+    finally:
         cursor.close()
         conn.close()
-        print(f"✅ Sincronización completa para '{table_name}'.")
 
-    except Exception as e:
-        print(f"❌ Error en sincronización: {str(e)}")
+
+def release_connection(conn):
+    """
+    Revierte la transacción abierta (si la hay) y cierra la conexión sin propagar errores
+    """
+    try:
+        conn.rollback()
+    except pyodbc.Error:
+        pass
+    try:
+        conn.close()
+    except pyodbc.Error:
+        pass
 
 
-# ==================== 📥 FUNCIONES DE INSERCIÓN DE DATOS ====================
+# ==================== 🔄 FUNCIONES DE SINCRONIZACIÓN PRINCIPAL ====================
 
 
-def insert_entities_data(cursor, table_name, entities_data, columns, entity_type):
+def get_entity_column_types(entity_type, columns):
     """
-    Inserta datos de entidades HubSpot con procesamiento optimizado por lotes grandes.
+    Tipos SQL por columna para una entidad según la metadata de propiedades.
+
+    Parámetros:
+        entity_type (str): "deals", "tickets" o "contacts" (tipo de objeto HubSpot)
+        columns (list): Columnas de la carga
+
+    Retorna:
+        dict | None: {columna: tipo SQL}, o None con SQL_TYPED_COLUMNS=false
+    """
+    if not typed_columns_enabled():
+        return None
+    column_types = build_column_types(columns, get_loaded_property_definitions(entity_type))
+    # Los tipos declarados en el manifiesto de propiedades tienen prioridad
+    column_types.update({
+        col: sql_type for col, sql_type in get_manifest_column_types(entity_type).items()
+        if col in column_types
+    })
+    return column_types
+
+
+def resolve_entity_columns(entity_type, found_columns, properties_list):
+    """
+    Columnas de la carga de una entidad.
 
     Descripción:
-        Función especializada para insertar datos de entidades (deals, tickets, contacts)
-        con lógica específica de transformación según el tipo de entidad.
-        OPTIMIZADA: Usa lotes de 500 registros para máxima eficiencia con grandes volúmenes.
+        Con manifiesto de propiedades las columnas son exactamente las
+        declaradas, en su orden (mismo esquema en cada ejecución); sin él, las
+        propiedades encontradas en los registros o, si no hay, la lista de
+        propiedades extraídas.
+
+    Parámetros:
+        entity_type (str): "deals", "tickets" o "contacts"
+        found_columns (list): Propiedades presentes en los registros extraídos
+        properties_list (list): Propiedades solicitadas a HubSpot
+
+    Retorna:
+        list: Columnas en el orden del INSERT
+    """
+    manifest_properties = get_manifest_properties(entity_type)
+    if manifest_properties:
+        return manifest_properties
+    return list(found_columns) if found_columns else list(properties_list)
+
+
+def get_load_mode():
+    """
+    Modo de carga de entidades en SQL Server (SQL_LOAD_MODE): "recreate" (default) o "merge"
+    """
+    mode = os.getenv("SQL_LOAD_MODE", "recreate").strip().lower()
+    return mode if mode in ("recreate", "merge") else "recreate"
+
+
+def load_entities(entities, table_name, properties_list, entity_type, incremental=False):
+    """
+    Despacha la carga de entidades según SQL_LOAD_MODE y el modo de extracción.
+
+    Descripción:
+        - merge: staging + MERGE por hs_object_id; en extracciones completas
+          además elimina las filas que ya no existen en HubSpot
+        - recreate + completa: carga en tabla sombra + intercambio atómico (sync_entities_direct)
+        - recreate + incremental: reemplazo por hs_object_id (sync_entities_incremental)
+
+    Parámetros:
+        entities (list): Entidades extraídas de HubSpot
+        table_name (str): Tabla destino (hb_deals, hb_tickets, hb_contacts)
+        properties_list (list): Propiedades útiles
+        entity_type (str): Tipo de entidad ("deals", "tickets", "contacts")
+        incremental (bool): True si la extracción fue por marca de agua
+
+    Retorna:
+        bool: True si la carga terminó correctamente
+    """
+    if get_load_mode() == "merge":
+        return sync_entities_merge(entities, table_name, properties_list, entity_type, delete_missing=not incremental)
+    if incremental:
+        return sync_entities_incremental(entities, table_name, properties_list, entity_type)
+    return sync_entities_direct(entities, table_name, properties_list, entity_type)
+
+
+def collect_entities_data(entities):
+    """
+    Propiedades por registro y columnas encontradas en una extracción.
+
+    Descripción:
+        Con un RecordStore las columnas ya se conocen y cada fila es una vista
+        de solo lectura sobre el almacén columnar, sin copiar los registros;
+        con una lista de registros de la API se recorren como antes.
+
+    Parámetros:
+        entities (RecordStore | list): Registros extraídos de HubSpot
+
+    Retorna:
+        tuple: (lista de propiedades por registro, lista de columnas)
+    """
+    if isinstance(entities, RecordStore):
+        return entities.views(), entities.columns
+
+    entities_data = []
+    all_properties = set()
+    for entity in entities:
+        props = entity.get("properties", {})
+        entities_data.append(props)
+        all_properties.update(props.keys())
+    return entities_data, list(all_properties)
+
+
+def sync_entities_direct(entities, table_name, properties_list, entity_type="entities"):
+    """
+    Sincronización principal para entidades HubSpot (deals, tickets, contacts).
+
+    Descripción:
+        Función unificada que maneja la sincronización completa de cualquier
+        tipo de entidad desde HubSpot hacia SQL Server con fallback automático.
+
+    Parámetros:
+        entities (list): Lista de entidades obtenidas desde HubSpot API
+        table_name (str): Nombre de la tabla SQL destino (ej: "hb_deals")
+        properties_list (list): Lista de propiedades útiles para filtrar
+        entity_type (str): Tipo de entidad para logs ("deals", "tickets", "contacts")
+
+    Flujo de Procesamiento:
+        1. Extracción de propiedades desde cada entidad
+        2. Análisis de columnas disponibles vs requeridas
+        3. Conexión y manejo de base de datos
+        4. Creación de tabla sombra ({tabla}__shadow)
+        5. Inserción masiva optimizada en la sombra
+        6. Intercambio atómico con sp_rename (versión anterior en {tabla}__old)
+        7. Fallback a sincronización manual en caso de error
+
+    Origen de Datos:
+        - entities: Retornado por hubspot/fetch_*.py
+        - properties_list: Retornado por get_all_*_properties_list()
+
+    Destino:
+        Tablas SQL Server: hb_deals, hb_tickets, hb_contacts
+
+    Manejo de Errores:
+        Automáticamente invoca sync_entities_manual() como fallback
+
+    Retorna:
+        bool: True si la carga (directa o por fallback) terminó correctamente
+
+    Optimizaciones:
+        - Usa todas las propiedades encontradas para máxima completitud
+        - Inserción por lotes para mejor performance
+        - Transacciones para integridad de datos
+    """
+    if not entities:
+        print(f"⚠️ No se encontraron {entity_type} para {table_name}.")
+        return True
+
+    conn = None
+    try:
+        print(f"\n🚀 SINCRONIZACIÓN DIRECTA DE {entity_type.upper()}")
+        print(f"📊 {entity_type.capitalize()}: {len(entities)}")
+        print(f"📊 Propiedades: {len(properties_list)}")
+
+        # Extraer todas las propiedades disponibles de las entidades
+        entities_data, found_columns = collect_entities_data(entities)
+
+        # Priorizar propiedades encontradas sobre lista predefinida
+        columns = resolve_entity_columns(entity_type, found_columns, properties_list)
+        column_types = get_entity_column_types(entity_type, columns)
+        print(f"📊 Columnas finales: {len(columns)}")
+
+        # Establecer conexión y gestionar tabla
+        conn = get_sql_connection()
+        cursor = conn.cursor()
+
+        # Cargar la nueva versión en la tabla sombra; la tabla actual sigue disponible
+        print(f"📦 Creando tabla sombra para '{table_name}'...")
+        shadow_table = prepare_shadow_table(cursor, table_name, columns, column_types)
+        conn.commit()
+
+        print(f"⬇️ Insertando {len(entities_data)} registros...")
+        # Llamar función especializada para inserción de entidades
+        insert_entities_data(cursor, shadow_table, entities_data, columns, entity_type, column_types)
+
+        # Intercambio atómico sombra → tabla destino
+        swap_in_shadow_table(cursor, table_name)
+
+        cursor.close()
+        conn.close()
+        print(f"✅ Sincronización directa completa para '{table_name}'.")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error durante la sincronización: {str(e)}")
+        # Liberar la conexión fallida antes de que el fallback abra una nueva
+        if conn is not None:
+            release_connection(conn)
+        # Fallback automático a método manual
+        return sync_entities_manual(entities, table_name, entity_type)
+
+
+def sync_entities_incremental(entities, table_name, properties_list, entity_type="entities"):
+    """
+    Sincronización incremental: reemplaza solo los registros modificados.
+
+    Descripción:
+        Conserva la tabla existente; elimina las filas cuyos hs_object_id
+        vienen en la extracción incremental y las vuelve a insertar con los
+        valores actuales, lote a lote y en la misma transacción (siempre con
+        executemany). Si la tabla aún no existe, hace una carga completa con
+        sync_entities_direct().
+
+    Parámetros:
+        entities (list): Entidades modificadas desde la marca de agua
+        table_name (str): Nombre de la tabla SQL destino
+        properties_list (list): Lista de propiedades útiles
+        entity_type (str): Tipo de entidad para logs
+
+    Limitaciones:
+        Los registros eliminados/archivados en HubSpot no se detectan en modo
+        incremental; una ejecución completa periódica los depura.
+
+    Retorna:
+        bool: True si la carga terminó correctamente
+    """
+    if not entities:
+        return True
+
+    conn = None
+    try:
+        print(f"\n🔁 SINCRONIZACIÓN INCREMENTAL DE {entity_type.upper()}")
+        print(f"📊 {entity_type.capitalize()} modificados: {len(entities)}")
+
+        entities_data, found_columns = collect_entities_data(entities)
+
+        columns = resolve_entity_columns(entity_type, found_columns, properties_list)
+        if "hs_object_id" not in columns:
+            columns.append("hs_object_id")
+        column_types = get_entity_column_types(entity_type, columns)
+
+        conn = get_sql_connection()
+        cursor = conn.cursor()
+
+        if not table_exists(cursor, table_name):
+            release_connection(conn)
+            conn = None
+            print(f"⚠️ La tabla '{table_name}' no existe; se realiza carga completa.")
+            return sync_entities_direct(entities, table_name, properties_list, entity_type)
+
+        add_missing_columns(cursor, table_name, columns, column_types)
+        conn.commit()
+
+        # Cada lote elimina sus versiones anteriores y se inserta en una sola
+        # transacción: la tabla nunca queda sin las filas de un lote fallido
+        total_records = len(entities_data)
+        started = time.perf_counter()
+        batches = (
+            entities_data[i : i + ENTITY_BATCH_SIZE] for i in range(0, total_records, ENTITY_BATCH_SIZE)
+        )
+        loaded = insert_entity_batches(
+            cursor, table_name, batches, columns, entity_type, column_types,
+            total_records=total_records, replace_existing=True
+        )
+        record_load_timing(table_name, SINK_EXECUTEMANY, loaded, time.perf_counter() - started)
+
+        print(f"✅ Sincronización incremental completa para '{table_name}'.")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error durante la sincronización incremental: {str(e)}")
+        return False
+
+    finally:
+        # Revertir lo no confirmado y liberar la conexión (y sus bloqueos)
+        if conn is not None:
+            release_connection(conn)
+
+
+def build_merge_statement(table_name, staging_table, columns, delete_missing, keep_table=None):
+    """
+    Construye el MERGE set-based de la tabla de staging hacia la tabla destino.
+
+    Descripción:
+        Solo actualiza filas cuyo contenido cambió (EXISTS ... EXCEPT compara
+        todas las columnas tratando NULL = NULL), inserta las nuevas y, si
+        delete_missing es True, elimina las que no vienen en el staging salvo
+        las listadas en keep_table (registros rechazados en la carga).
+
+    Parámetros:
+        table_name (str): Tabla destino ya sanitizada
+        staging_table (str): Tabla de staging ya sanitizada
+        columns (list): Columnas sanitizadas cargadas en staging (incluye hs_object_id)
+        delete_missing (bool): Eliminar filas ausentes (solo en extracción completa)
+        keep_table (str): Tabla con los hs_object_id que no se eliminan (opcional)
+
+    Retorna:
+        str: Lote SQL con el MERGE y un SELECT de conteos por acción
+    """
+    data_columns = [col for col in columns if col != "hs_object_id"]
+    source_cols = ", ".join(f"s.[{col}]" for col in data_columns)
+    target_cols = ", ".join(f"t.[{col}]" for col in data_columns)
+    update_set = ", ".join(f"t.[{col}] = s.[{col}]" for col in data_columns)
+    insert_cols = ", ".join(f"[{col}]" for col in columns)
+    insert_vals = ", ".join(f"s.[{col}]" for col in columns)
+
+    statement = (
+        "SET NOCOUNT ON; DECLARE @merge_actions TABLE ([action] NVARCHAR(10)); "
+        f"MERGE [{table_name}] AS t USING [{staging_table}] AS s ON t.[hs_object_id] = s.[hs_object_id]"
+    )
+    if data_columns:
+        statement += (
+            f" WHEN MATCHED AND EXISTS (SELECT {source_cols} EXCEPT SELECT {target_cols})"
+            f" THEN UPDATE SET {update_set}"
+        )
+    statement += f" WHEN NOT MATCHED BY TARGET THEN INSERT ({insert_cols}) VALUES ({insert_vals})"
+    if delete_missing and keep_table:
+        statement += (
+            " WHEN NOT MATCHED BY SOURCE AND NOT EXISTS"
+            f" (SELECT 1 FROM [{keep_table}] AS k WHERE k.[hs_object_id] = t.[hs_object_id]) THEN DELETE"
+        )
+    elif delete_missing:
+        statement += " WHEN NOT MATCHED BY SOURCE THEN DELETE"
+    # Conteo por acción sin devolver una fila por registro afectado
+    statement += (
+        " OUTPUT $action INTO @merge_actions;"
+        " SELECT [action], COUNT(*) FROM @merge_actions GROUP BY [action];"
+    )
+    return statement
+
+
+def apply_merge(cursor, table_name, staging_table, columns, delete_missing, keep_table=None):
+    """
+    Aplica el MERGE del staging sobre la tabla destino y retorna los conteos por acción.
+
+    Descripción:
+        MERGE exige una fila de origen por destino: el staging debe llegar
+        con un solo registro por hs_object_id (deduplicado en memoria o con
+        remove_duplicate_object_ids()).
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Tabla destino ya sanitizada
+        staging_table (str): Tabla de staging ya sanitizada
+        columns (list): Columnas sanitizadas cargadas en staging
+        delete_missing (bool): Eliminar filas ausentes (solo en extracción completa)
+        keep_table (str): Tabla de hs_object_id rechazados que no se eliminan
+            (create_keep_table())
+
+    Retorna:
+        dict: {"INSERT": n, "UPDATE": n, "DELETE": n}
+    """
+    cursor.execute(build_merge_statement(table_name, staging_table, columns, delete_missing, keep_table))
+    actions = {"INSERT": 0, "UPDATE": 0, "DELETE": 0}
+    for action, count in cursor.fetchall():
+        actions[action] = count
+    return actions
+
+
+# Columna IDENTITY con el orden de carga de las tablas cargadas en streaming
+LOAD_SEQUENCE_COLUMN = "_load_seq"
+
+
+def add_load_sequence(cursor, table_name):
+    """
+    Agrega a una tabla recién creada la columna IDENTITY LOAD_SEQUENCE_COLUMN.
+
+    Descripción:
+        Los INSERT listan sus columnas, por lo que la columna se numera sola
+        en el orden en que llegan las filas; remove_duplicate_object_ids()
+        la usa para conservar la última versión de cada registro.
+    """
+    cursor.execute(f"ALTER TABLE [{table_name}] ADD [{LOAD_SEQUENCE_COLUMN}] BIGINT IDENTITY(1, 1) NOT NULL")
+
+
+def remove_duplicate_object_ids(cursor, table_name, drop_sequence=False):
+    """
+    Deja una fila por hs_object_id: la última cargada según LOAD_SEQUENCE_COLUMN.
+
+    Descripción:
+        Una paginación puede entregar el mismo registro dos veces si cambia
+        durante la extracción; en streaming las versiones pueden quedar en
+        lotes distintos. Se conserva la más reciente (mayor secuencia).
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Tabla ya sanitizada creada con add_load_sequence()
+        drop_sequence (bool): Eliminar después la columna de secuencia (tabla
+            sombra que pasará a ser la tabla destino)
+
+    Retorna:
+        int: Filas repetidas eliminadas
+    """
+    cursor.execute(
+        f";WITH ranked AS (SELECT ROW_NUMBER() OVER (PARTITION BY [hs_object_id]"
+        f" ORDER BY [{LOAD_SEQUENCE_COLUMN}] DESC) AS rn FROM [{table_name}]) DELETE FROM ranked WHERE rn > 1"
+    )
+    removed = cursor.rowcount
+    if drop_sequence:
+        cursor.execute(f"ALTER TABLE [{table_name}] DROP COLUMN [{LOAD_SEQUENCE_COLUMN}]")
+    if removed and removed > 0:
+        print(f"   🔁 {removed} versiones anteriores de registros repetidos eliminadas de '{table_name}'")
+    return max(removed, 0)
+
+
+def create_keep_table(cursor, table_name, columns, column_types, state):
+    """
+    Crea {tabla}__keep con los hs_object_id de los registros rechazados en la carga.
+
+    Descripción:
+        Un registro rechazado (valor no convertible o error de SQL Server) no
+        llega al staging; sin esta tabla el MERGE con delete_missing borraría
+        su versión vigente en la tabla destino. Los IDs se convierten al tipo
+        de la columna hs_object_id; los que no son convertibles no pueden
+        coincidir con ninguna fila y se omiten.
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Tabla destino (sin sanitizar)
+        columns (list): Columnas sanitizadas de la carga (orden de los rechazados)
+        column_types (dict): Tipo SQL por columna (None sin columnas tipadas)
+        state (dict): Estado de la carga (new_load_state())
+
+    Retorna:
+        str | None: Nombre de la tabla creada, o None si no hubo rechazados con ID
+    """
+    id_index = columns.index("hs_object_id")
+    id_type = (column_types or {}).get("hs_object_id", SQL_TEXT_LEGACY)
+    rejected_ids = set()
+    for _, values, _ in state["rejects"]:
+        try:
+            value = convert_value(values[id_index], id_type)
+        except ValueConversionError:
+            continue
+        if value is not None and str(value).strip():
+            rejected_ids.add(str(value) if id_type.startswith("NVARCHAR") else value)
+    if not rejected_ids:
+        return None
+
+    keep_table = sanitize_sql_identifier(f"{table_name}__keep")
+    drop_table(cursor, keep_table)
+    create_table(cursor, keep_table, ["hs_object_id"], {"hs_object_id": id_type})
+    cursor.executemany(f"INSERT INTO [{keep_table}] ([hs_object_id]) VALUES (?)", [(v,) for v in rejected_ids])
+    print(f"   🛡️ {len(rejected_ids)} registros rechazados se conservan en '{table_name}' (no se eliminan)")
+    return keep_table
+
+
+def sync_entities_merge(entities, table_name, properties_list, entity_type="entities", delete_missing=True):
+    """
+    Sincronización por MERGE: conserva la tabla y aplica solo las diferencias.
+
+    Descripción:
+        Carga las entidades en una tabla de staging ({tabla}__staging) y
+        ejecuta un único MERGE por hs_object_id en una transacción. La tabla
+        destino nunca desaparece durante la carga y las filas sin cambios no
+        se reescriben. Si la tabla aún no existe se crea con carga completa.
+
+    Parámetros:
+        entities (list): Entidades extraídas de HubSpot
+        table_name (str): Tabla destino
+        properties_list (list): Propiedades útiles (fallback de columnas)
+        entity_type (str): Tipo de entidad para logs
+        delete_missing (bool): Eliminar filas que ya no existen en HubSpot
+            (True en extracción completa, False en incremental); los
+            registros rechazados en la carga nunca se eliminan
+
+    Retorna:
+        bool: True si la carga terminó correctamente
+    """
+    if not entities:
+        return True
+
+    conn = None
+    try:
+        print(f"\n🔀 SINCRONIZACIÓN MERGE DE {entity_type.upper()}")
+
+        # Deduplicar por hs_object_id (MERGE exige una fila de origen por destino)
+        by_id = {}
+        all_properties = set()
+        for entity in entities:
+            props = entity.get("properties", {})
+            if props.get("hs_object_id"):
+                by_id[props["hs_object_id"]] = props
+                all_properties.update(props.keys())
+        entities_data = list(by_id.values())
+
+        columns = resolve_entity_columns(entity_type, list(all_properties), properties_list)
+        if "hs_object_id" not in columns:
+            columns.append("hs_object_id")
+        print(f"📊 {entity_type.capitalize()}: {len(entities_data)} | Columnas: {len(columns)}")
+
+        sanitized_table = sanitize_sql_identifier(table_name)
+        staging_table = sanitize_sql_identifier(f"{table_name}__staging")
+        sanitized_columns = sanitize_sql_identifiers(columns)
+        column_types = get_entity_column_types(entity_type, sanitized_columns)
+
+        conn = get_sql_connection()
+        cursor = conn.cursor()
+
+        if not table_exists(cursor, sanitized_table):
+            release_connection(conn)
+            conn = None
+            print(f"⚠️ La tabla '{table_name}' no existe; se realiza carga completa.")
+            return sync_entities_direct(entities, table_name, properties_list, entity_type)
+
+        add_missing_columns(cursor, sanitized_table, sanitized_columns, column_types)
+
+        # Staging con el mismo esquema de columnas de la carga
+        drop_table(cursor, staging_table)
+        create_table(cursor, staging_table, sanitized_columns, column_types)
+        conn.commit()
+
+        print(f"⬇️ Cargando {len(entities_data)} registros en staging '{staging_table}'...")
+        state = new_load_state()
+        insert_entities_data(
+            cursor, staging_table, entities_data, sanitized_columns, entity_type, column_types, state=state
+        )
+
+        print(f"🔀 Aplicando MERGE sobre '{table_name}'...")
+        keep_table = (
+            create_keep_table(cursor, table_name, sanitized_columns, column_types, state) if delete_missing else None
+        )
+        actions = apply_merge(cursor, sanitized_table, staging_table, sanitized_columns, delete_missing, keep_table)
+
+        drop_table(cursor, staging_table)
+        if keep_table:
+            drop_table(cursor, keep_table)
+        conn.commit()
+
+        unchanged = len(entities_data) - actions["INSERT"] - actions["UPDATE"]
+        print(
+            f"✅ MERGE completo para '{table_name}': {actions['INSERT']} nuevos, "
+            f"{actions['UPDATE']} actualizados, {actions['DELETE']} eliminados, {unchanged} sin cambios"
+        )
+        return True
+
+    except Exception as e:
+        print(f"❌ Error durante la sincronización MERGE: {str(e)}")
+        return False
+
+    finally:
+        # Revertir lo no confirmado y liberar la conexión (y sus bloqueos)
+        if conn is not None:
+            release_connection(conn)
+
+
+def streaming_enabled(table_name):
+    """
+    True si la entidad se carga en streaming (SYNC_STREAMING=true, default false).
+
+    Los sinks tvp y bulk_file necesitan el conjunto completo de filas, por lo
+    que las tablas configuradas con ellos usan la extracción completa.
+    """
+    if os.getenv("SYNC_STREAMING", "false").strip().lower() != "true":
+        return False
+    return get_load_sink(table_name) == SINK_EXECUTEMANY
+
+
+def get_stream_queue_pages():
+    """
+    Páginas de HubSpot que pueden esperar en la cola hacia SQL Server (mínimo 1)
+    """
+    try:
+        return max(1, int(os.getenv("SYNC_STREAM_QUEUE_PAGES", "8")))
+    except ValueError:
+        return 8
+
+
+def prefetch_pages(pages, max_pages):
+    """
+    Consume un iterador de páginas en un hilo productor y lo entrega por una cola acotada.
+
+    Descripción:
+        Mientras el consumidor inserta en SQL Server, el productor sigue
+        descargando; si la cola se llena, la descarga espera, de modo que
+        nunca hay más de max_pages páginas en memoria. Un error del
+        productor se relanza en el consumidor; si el consumidor se detiene,
+        el productor deja de descargar y cierra el iterador original.
+
+    Parámetros:
+        pages (iterator): Páginas de HubSpot (ej: iter_deal_pages())
+        max_pages (int): Capacidad de la cola
+
+    Genera:
+        list: Páginas en el mismo orden del iterador original
+    """
+    page_queue = queue.Queue(maxsize=max_pages)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                page_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer():
+        try:
+            for page in pages:
+                if not put(("page", page)):
+                    return
+            put(("done", None))
+        except Exception as e:
+            put(("error", e))
+        finally:
+            # Detener la iteración HTTP si el consumidor terminó antes de agotarla
+            close = getattr(pages, "close", None)
+            if close:
+                close()
+
+    thread = threading.Thread(target=producer, name="hubspot-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            kind, item = page_queue.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def rebatch_pages(pages, batch_size):
+    """
+    Reagrupa páginas de HubSpot (100 registros) en lotes de INSERT de ~batch_size propiedades
+
+    Un hs_object_id repetido dentro del lote en curso reemplaza a su versión
+    anterior (gana la última). Los repetidos de lotes ya entregados se
+    cuentan y los resuelve la carga (remove_duplicate_object_ids() o el
+    reemplazo por lote de la carga incremental).
+    """
+    batch = {}
+    seen = set()
+    repeated = 0
+    without_id = 0
+    for page in pages:
+        for record in page:
+            props = record.get("properties", {})
+            object_id = props.get("hs_object_id")
+            if object_id in batch or object_id in seen:
+                repeated += 1
+            if not object_id:
+                # Los registros sin ID no se deduplican
+                without_id += 1
+                object_id = ("", without_id)
+            batch[object_id] = props
+        if len(batch) >= batch_size:
+            seen.update(key for key in batch if not isinstance(key, tuple))
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+    if repeated:
+        print(f"   🔁 {repeated} registros repetidos en la paginación (se conserva la última versión)")
+
+
+def stream_entities(pages, table_name, properties_list, entity_type, incremental=False):
+    """
+    Carga en streaming: las páginas se insertan mientras las siguientes se descargan.
+
+    Descripción:
+        Las páginas llegan por una cola acotada (prefetch_pages()) y se
+        insertan en lotes de ENTITY_BATCH_SIZE sin acumular la extracción
+        completa, por lo que la memoria no crece con el número de registros
+        y el tiempo de red se solapa con el de base de datos. Las columnas se
+        fijan al inicio: propiedades útiles + propiedades de la primera página.
+        Respeta SQL_LOAD_MODE igual que load_entities():
+        - recreate + completa: tabla sombra + intercambio atómico
+        - recreate + incremental: eliminación por hs_object_id + inserción, lote a lote
+        - merge: staging en streaming + MERGE (los rechazados no se eliminan)
+        Un registro repetido en la paginación se carga una sola vez, con su
+        última versión (rebatch_pages() y remove_duplicate_object_ids()).
+
+    Parámetros:
+        pages (iterator): Páginas de HubSpot (stream_*_from_hubspot())
+        table_name (str): Tabla destino (hb_deals, hb_tickets, hb_contacts)
+        properties_list (list): Propiedades útiles
+        entity_type (str): Tipo de entidad ("deals", "tickets", "contacts")
+        incremental (bool): True si la extracción es por marca de agua
+
+    Retorna:
+        tuple: (True si la carga terminó correctamente, registros cargados)
+    """
+    pages = prefetch_pages(pages, get_stream_queue_pages())
+    conn = None
+    try:
+        print(f"\n🌊 SINCRONIZACIÓN EN STREAMING DE {entity_type.upper()}")
+
+        # Primera página con datos: define las columnas de la carga
+        first_page = next((page for page in pages if page), None)
+        if first_page is None:
+            if incremental:
+                print(f"✅ Sin {entity_type} modificados desde la última ejecución.")
+            else:
+                print(f"⚠️ No se encontraron {entity_type} para {table_name}.")
+            return True, 0
+
+        columns = resolve_entity_columns(entity_type, list(dict.fromkeys(
+            list(properties_list) + [key for record in first_page for key in record.get("properties", {})]
+        )), properties_list)
+        if "hs_object_id" not in columns:
+            columns.append("hs_object_id")
+        columns = sanitize_sql_identifiers(columns)
+        column_types = get_entity_column_types(entity_type, columns)
+        print(f"📊 Columnas: {len(columns)} | Cola de páginas: {get_stream_queue_pages()}")
+
+        batches = rebatch_pages(chain([first_page], pages), ENTITY_BATCH_SIZE)
+        sanitized_table = sanitize_sql_identifier(table_name)
+
+        conn = get_sql_connection()
+        cursor = conn.cursor()
+        target_exists = table_exists(cursor, sanitized_table)
+        started = time.perf_counter()
+
+        if get_load_mode() == "merge" and target_exists:
+            staging_table = sanitize_sql_identifier(f"{table_name}__staging")
+            add_missing_columns(cursor, sanitized_table, columns, column_types)
+            drop_table(cursor, staging_table)
+            create_table(cursor, staging_table, columns, column_types)
+            add_load_sequence(cursor, staging_table)
+            conn.commit()
+
+            print(f"⬇️ Cargando {entity_type} en staging '{staging_table}' a medida que llegan...")
+            state = new_load_state()
+            loaded = insert_entity_batches(
+                cursor, staging_table, batches, columns, entity_type, column_types, state=state
+            )
+            record_load_timing(table_name, "stream", loaded, time.perf_counter() - started)
+
+            print(f"🔀 Aplicando MERGE sobre '{table_name}'...")
+            remove_duplicate_object_ids(cursor, staging_table)
+            keep_table = (
+                None if incremental else create_keep_table(cursor, table_name, columns, column_types, state)
+            )
+            actions = apply_merge(
+                cursor, sanitized_table, staging_table, columns, delete_missing=not incremental, keep_table=keep_table
+            )
+            drop_table(cursor, staging_table)
+            if keep_table:
+                drop_table(cursor, keep_table)
+            conn.commit()
+            print(
+                f"✅ MERGE completo para '{table_name}': {actions['INSERT']} nuevos, "
+                f"{actions['UPDATE']} actualizados, {actions['DELETE']} eliminados"
+            )
+
+        elif incremental and target_exists:
+            add_missing_columns(cursor, sanitized_table, columns, column_types)
+            conn.commit()
+
+            print(f"⬇️ Reemplazando {entity_type} modificados a medida que llegan...")
+            loaded = insert_entity_batches(
+                cursor, sanitized_table, batches, columns, entity_type, column_types, replace_existing=True
+            )
+            record_load_timing(table_name, "stream", loaded, time.perf_counter() - started)
+            print(f"✅ Sincronización incremental completa para '{table_name}'.")
+
+        else:
+            print(f"📦 Creando tabla sombra para '{table_name}'...")
+            shadow_table = prepare_shadow_table(cursor, sanitized_table, columns, column_types)
+            add_load_sequence(cursor, shadow_table)
+            conn.commit()
+
+            print(f"⬇️ Insertando {entity_type} a medida que llegan...")
+            loaded = insert_entity_batches(cursor, shadow_table, batches, columns, entity_type, column_types)
+            loaded -= remove_duplicate_object_ids(cursor, shadow_table, drop_sequence=True)
+            record_load_timing(table_name, "stream", loaded, time.perf_counter() - started)
+
+            swap_in_shadow_table(cursor, sanitized_table)
+            print(f"✅ Sincronización completa para '{table_name}'.")
+
+        return True, loaded
+
+    except Exception as e:
+        print(f"❌ Error durante la sincronización en streaming: {str(e)}")
+        return False, 0
+
+    finally:
+        pages.close()
+        # Revertir lo no confirmado y liberar la conexión (y sus bloqueos)
+        if conn is not None:
+            release_connection(conn)
+
+
+def sync_table_data(table_data, table_name):
+    """
+    Sincronización para datos ya estructurados como tabla (owners, pipelines).
+
+    Descripción:
+        Maneja la sincronización de datos que ya vienen estructurados
+        como lista de diccionarios desde las funciones fetch_*_as_table().
+
+    Parámetros:
+        table_data (list): Lista de diccionarios con datos estructurados
+        table_name (str): Nombre de la tabla SQL destino
+
+    Origen de Datos:
+        - fetch_owners_as_table(): Para tabla hb_owners
+        - fetch_*_pipelines_as_table(): Para tablas hb_*_pipeline
+
+    Flujo de Procesamiento:
+        1. Extracción de columnas del primer registro
+        2. Conexión a base de datos
+        3. Carga en tabla sombra ({tabla}__shadow)
+        4. Intercambio atómico con la tabla destino
+
+    Diferencias con sync_entities_direct():
+        - Los datos ya vienen estructurados como tabla
+        - No requiere extracción de propiedades
+        - Usa insert_table_data() en lugar de insert_entities_data()
+
+    Destinos:
+        Tablas SQL Server: hb_owners, hb_tickets_pipeline, hb_deals_pipeline
+
+    Retorna:
+        bool: True si la tabla quedó cargada correctamente
+    """
+    if not table_data:
+        print(f"⚠️ No hay datos para {table_name}.")
+        return True
+
+    try:
+        print(f"\n📊 SINCRONIZANDO TABLA {table_name.upper()}")
+        print(f"📊 Registros: {len(table_data)}")
+
+        # Obtener estructura de columnas del primer registro
+        columns = list(table_data[0].keys()) if table_data else []
+        print(f"📊 Columnas: {len(columns)}")
+
+        # Establecer conexión y gestionar tabla
+        conn = get_sql_connection()
+        cursor = conn.cursor()
+
+        # Cargar en tabla sombra y publicar con intercambio atómico
+        print(f"📦 Creando tabla sombra para '{table_name}'...")
+        shadow_table = prepare_shadow_table(cursor, table_name, columns)
+
+        print(f"⬇️ Insertando {len(table_data)} registros...")
+        # Usar función especializada para datos tabulares
+        insert_table_data(cursor, shadow_table, table_data, columns)
+
+        swap_in_shadow_table(cursor, table_name)
+        cursor.close()
+        conn.close()
+        print(f"✅ Sincronización completa para '{table_name}'.")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error en sincronización: {str(e)}")
+        return False
+
+
+# ==================== 📥 FUNCIONES DE INSERCIÓN DE DATOS ====================
+
+# Tamaños de parámetro fijos por tipo de columna (tipo ODBC, tamaño, decimales)
+FIXED_INPUT_SIZES = {
+    SQL_BIGINT: (pyodbc.SQL_BIGINT, 0, 0),
+    SQL_DECIMAL: (pyodbc.SQL_DECIMAL, 38, 10),
+    SQL_DATETIME: (pyodbc.SQL_TYPE_TIMESTAMP, 23, 3),
+    SQL_DATE: (pyodbc.SQL_TYPE_DATE, 10, 0),
+    SQL_BIT: (pyodbc.SQL_BIT, 0, 0),
+}
+
+# Máximo de caracteres UTF-16 enlazables como NVARCHAR(n); más largo se envía como MAX
+MAX_BOUND_TEXT_LENGTH = 4000
+
+
+# Sinks de carga para tablas de entidades (SQL_LOAD_SINK / SQL_LOAD_SINK_<TABLA>)
+SINK_EXECUTEMANY = "executemany"
+SINK_TVP = "tvp"
+SINK_BULK_FILE = "bulk_file"
+
+# Filas por INSERT ... SELECT FROM <TVP>
+TVP_BATCH_SIZE = int(os.getenv("SQL_TVP_BATCH_SIZE", "5000"))
+
+# Separadores del archivo de BULK INSERT: sanitize_string() elimina estos caracteres de control
+BULK_FIELD_TERMINATOR = "\x1f"
+BULK_ROW_TERMINATOR = "\x1e"
+
+# Tiempos de carga por tabla y sink (se muestran en el resumen final)
+_load_timings = []
+_load_timings_lock = threading.Lock()
+
+# Valores no convertibles al tipo de su columna por tabla (filas rechazadas)
+_unconvertible_values = {}
+
+
+def get_load_sink(table_name):
+    """
+    Sink de carga para una tabla de entidades.
+
+    Descripción:
+        SQL_LOAD_SINK_<TABLA> (ej: SQL_LOAD_SINK_HB_CONTACTS) tiene prioridad
+        sobre SQL_LOAD_SINK. Las tablas sombra/staging ({tabla}__shadow,
+        {tabla}__staging) usan la configuración de su tabla destino.
+
+    Parámetros:
+        table_name (str): Tabla donde se insertan las filas
+
+    Retorna:
+        str: "executemany" (default), "tvp" o "bulk_file"
+    """
+    base_table = table_name.split("__")[0]
+    sink = os.getenv(f"SQL_LOAD_SINK_{base_table.upper()}") or os.getenv("SQL_LOAD_SINK", SINK_EXECUTEMANY)
+    sink = sink.strip().lower()
+    if sink not in (SINK_EXECUTEMANY, SINK_TVP, SINK_BULK_FILE):
+        print(f"⚠️ SQL_LOAD_SINK '{sink}' no válido para {base_table}, usando '{SINK_EXECUTEMANY}'")
+        return SINK_EXECUTEMANY
+    return sink
+
+
+def record_load_timing(table_name, sink, records, elapsed):
+    """
+    Registra e imprime el rendimiento de una carga (filas por segundo)
+    """
+    rate = records / elapsed if elapsed > 0 else 0
+    with _load_timings_lock:
+        _load_timings.append((table_name, sink, records, elapsed))
+    print(f"   ⏱️ Sink {sink}: {records:,} registros en {elapsed:.1f}s ({rate:,.0f} registros/s)")
+
+
+def display_load_timings():
+    """
+    Muestra el rendimiento de carga por tabla y sink registrado en la ejecución
+    """
+    with _load_timings_lock:
+        timings = list(_load_timings)
+        unconvertible = {table: Counter(counts) for table, counts in _unconvertible_values.items()}
+    if not timings:
+        return
+
+    print("\n📥 CARGA EN SQL SERVER POR SINK:")
+    for table_name, sink, records, elapsed in timings:
+        rate = records / elapsed if elapsed > 0 else 0
+        print(f"   {table_name:<24} {sink:<12} {records:>9,} registros {elapsed:7.1f}s {rate:>10,.0f}/s")
+
+    if unconvertible:
+        print("\n⚠️ VALORES NO CONVERTIBLES AL TIPO DE SU COLUMNA (filas rechazadas):")
+        for table_name, counts in unconvertible.items():
+            detail = ", ".join(f"{col}={count:,}" for col, count in counts.most_common())
+            print(f"   {table_name:<24} {detail}")
+
+
+def build_entity_row(props, columns, types_in_order, entity_type):
+    """
+    Convierte las propiedades de una entidad en la tupla de valores del INSERT.
+
+    Parámetros:
+        props (dict): Propiedades de la entidad
+        columns (list): Columnas en el orden del INSERT
+        types_in_order (list): Tipo SQL de cada columna
+        entity_type (str): Tipo de entidad para transformaciones específicas
+
+    Retorna:
+        tuple: Valores convertidos y sanitizados
+
+    Excepciones:
+        ValueConversionError: Si algún valor no es convertible al tipo de su
+            columna (columns del error lista todas las columnas afectadas)
+    """
+    values = []
+    failures = []
+    for col, sql_type in zip(columns, types_in_order):
+        val = props.get(col)
+
+        # Aplicar transformaciones específicas por tipo de entidad
+        # (las columnas DATETIME2/DATE reciben el epoch original)
+        if (
+            entity_type == "tickets" and val and "time" in col and str(val).isdigit()
+            and sql_type not in (SQL_DATETIME, SQL_DATE)
+        ):
+            try:
+                # Convertir timestamps de HubSpot (milisegundos) a segundos
+                val = int(val) / 1000
+            except (ValueError, TypeError):
+                # Mantener valor original si la conversión falla
+                pass
+
+        # Columnas tipadas: conversión única al tipo de la columna
+        if not sql_type.startswith("NVARCHAR"):
+            try:
+                values.append(convert_value(val, sql_type))
+            except ValueConversionError as e:
+                failures.append((col, str(e)))
+                values.append(None)
+        # SEGURIDAD: Sanitizar valor antes de inserción SQL
+        elif val is not None:
+            sanitized_val = sanitize_string(val, max_length=4000)  # NVARCHAR(MAX) pero limitamos para seguridad
+            # NVARCHAR(n) cuenta unidades UTF-16: un emoji ocupa dos
+            if sanitized_val and len(sanitized_val) > 2000 and not sql_type.endswith("(MAX)"):
+                sanitized_val = truncate_utf16(sanitized_val, 4000)
+            values.append(sanitized_val)
+        else:
+            values.append(None)
+
+    if failures:
+        raise ValueConversionError(
+            "; ".join(f"[{col}] {error}" for col, error in failures), [col for col, _ in failures]
+        )
+    return tuple(values)
+
+
+def build_entity_rows(batch, columns, types_in_order, entity_type, state, first_row):
+    """
+    Convierte un lote de entidades en filas; las no convertibles van a los rechazados.
+
+    Descripción:
+        Una fila con un valor no convertible al tipo de su columna no se carga
+        con NULL: se agrega a state["rejects"] con sus valores originales (y
+        termina en el archivo de rechazados) y se cuenta por columna en
+        state["unconvertible"].
+
+    Parámetros:
+        batch (list): Diccionarios de propiedades
+        columns (list): Columnas en el orden del INSERT
+        types_in_order (list): Tipo SQL de cada columna
+        entity_type (str): Tipo de entidad para transformaciones específicas
+        state (dict): Estado de la carga (new_load_state())
+        first_row (int): Número (base 1) de la primera fila del lote en la carga
+
+    Retorna:
+        tuple: (filas convertidas, número de cada fila en la carga, propiedades
+            de esas filas), las tres listas en el mismo orden
+    """
+    rows = []
+    row_numbers = []
+    kept = []
+    for row_number, props in enumerate(batch, first_row):
+        try:
+            rows.append(build_entity_row(props, columns, types_in_order, entity_type))
+        except ValueConversionError as e:
+            state["unconvertible"].update(e.columns)
+            state["rejects"].append((row_number, tuple(props.get(col) for col in columns), str(e)))
+            continue
+        row_numbers.append(row_number)
+        kept.append(props)
+    return rows, row_numbers, kept
+
+
+def new_load_state():
+    """
+    Estado compartido por una carga de entidades (bisección y rechazados)
+    """
+    return {"use_fast": fast_executemany_enabled(), "rejects": [], "replace": None, "unconvertible": Counter()}
+
+
+def report_rejects(table_name, columns, state):
+    """
+    Informa los valores no convertibles por columna y escribe el archivo de rechazados
+    """
+    if state["unconvertible"]:
+        with _load_timings_lock:
+            _unconvertible_values.setdefault(table_name.split("__")[0], Counter()).update(state["unconvertible"])
+        detail = ", ".join(f"{col}={count:,}" for col, count in state["unconvertible"].most_common())
+        print(f"   ⚠️ Valores no convertibles por columna: {detail}")
+
+    if state["rejects"]:
+        reject_path = write_reject_file(table_name, columns, state["rejects"])
+        print(f"   ⚠️ {len(state['rejects'])} registros rechazados" + (f" → {reject_path}" if reject_path else ""))
+
+
+def insert_rows_tvp(cursor, table_name, columns, types_in_order, rows):
+    """
+    Carga filas como table-valued parameter: un INSERT ... SELECT por bloque.
+
+    Descripción:
+        Crea un tipo de tabla temporal ({tabla}__tvp) con el esquema de la
+        carga y envía bloques de TVP_BATCH_SIZE filas como un solo parámetro;
+        el servidor inserta cada bloque en una única sentencia con TABLOCK.
+        Cada bloque se confirma al terminar, de modo que ante un error el
+        llamador puede continuar desde la última fila cargada.
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Tabla destino (sanitizada)
+        columns (list): Columnas sanitizadas en el orden de las filas
+        types_in_order (list): Tipo SQL de cada columna
+        rows (list): Tuplas de valores
+
+    Genera:
+        int: Filas insertadas en cada bloque confirmado
+    """
+    type_name = f"{table_name}__tvp"
+    columns_str = ", ".join([f"[{col}]" for col in columns])
+    column_defs = ", ".join([f"[{col}] {sql_type}" for col, sql_type in zip(columns, types_in_order)])
+
+    cursor.execute(f"DROP TYPE IF EXISTS dbo.[{type_name}]")
+    cursor.execute(f"CREATE TYPE dbo.[{type_name}] AS TABLE ({column_defs})")
+    cursor.connection.commit()
+
+    query = f"INSERT INTO [{table_name}] WITH (TABLOCK) ({columns_str}) SELECT {columns_str} FROM ?"
+    try:
+        for i in range(0, len(rows), TVP_BATCH_SIZE):
+            chunk = rows[i : i + TVP_BATCH_SIZE]
+            # Nombre y esquema del tipo como primeros elementos del TVP (pyodbc >= 4.0.32)
+            cursor.execute(query, ([type_name, "dbo"] + chunk,))
+            cursor.connection.commit()
+            yield len(chunk)
+    finally:
+        try:
+            cursor.execute(f"DROP TYPE IF EXISTS dbo.[{type_name}]")
+            cursor.connection.commit()
+        except pyodbc.Error:
+            pass
+
+
+def _format_bulk_value(value):
+    """
+    Representación de un valor en el archivo de BULK INSERT (vacío = NULL)
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="milliseconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return str(value)
+
+
+def insert_rows_bulk_file(cursor, table_name, columns, types_in_order, rows):
+    """
+    Carga filas con BULK INSERT desde un archivo delimitado (carga mínimamente registrada).
+
+    Descripción:
+        Escribe las filas en un archivo UTF-16 (DATAFILETYPE = 'widechar') en
+        SQL_BULK_DIR y ejecuta BULK INSERT ... WITH (TABLOCK) usando la ruta
+        que ve el servidor (SQL_BULK_SERVER_DIR, por defecto la misma). Con
+        modelo de recuperación SIMPLE o BULK_LOGGED y una tabla vacía (tabla
+        sombra o staging) la carga se registra mínimamente en el log.
+
+    Requisitos:
+        - SQL_BULK_DIR accesible por el servidor (carpeta local o compartida)
+        - Permiso ADMINISTER BULK OPERATIONS para el usuario SQL
+        - Columnas de la tabla en el mismo orden que las filas
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Tabla destino (sanitizada)
+        columns (list): Columnas sanitizadas en el orden de las filas
+        types_in_order (list): Tipo SQL de cada columna (no se usa; el archivo es texto)
+        rows (list): Tuplas de valores
+
+    Genera:
+        int: Filas insertadas (un único bloque, la sentencia es atómica)
+    """
+    local_dir = os.getenv("SQL_BULK_DIR")
+    if not local_dir:
+        raise ValueError("SQL_BULK_DIR no está configurado para el sink bulk_file")
+    server_dir = os.getenv("SQL_BULK_SERVER_DIR") or local_dir
+
+    if get_table_columns(cursor, table_name) != list(columns):
+        raise ValueError(f"El orden de columnas de '{table_name}' no coincide con el archivo de carga")
+
+    file_name = f"{table_name}_{uuid.uuid4().hex}.dat"
+    local_path = Path(local_dir) / file_name
+    server_path = server_dir.rstrip("\\/") + ("\\" if "\\" in server_dir else "/") + file_name
+
+    try:
+        with open(local_path, "w", encoding="utf-16", newline="") as f:
+            for row in rows:
+                f.write(BULK_FIELD_TERMINATOR.join(_format_bulk_value(v) for v in row))
+                f.write(BULK_ROW_TERMINATOR)
+
+        escaped_path = server_path.replace("'", "''")
+        cursor.execute(
+            f"BULK INSERT [{table_name}] FROM '{escaped_path}' WITH ("
+            "DATAFILETYPE = 'widechar', FIELDTERMINATOR = '0x1f', ROWTERMINATOR = '0x1e', "
+            "KEEPNULLS, TABLOCK)"
+        )
+        cursor.connection.commit()
+        yield len(rows)
+    finally:
+        try:
+            local_path.unlink()
+        except OSError:
+            pass
+
+
+SINK_LOADERS = {
+    SINK_TVP: insert_rows_tvp,
+    SINK_BULK_FILE: insert_rows_bulk_file,
+}
+
+# Registros por lote de INSERT (optimizado para tablas con cientos de columnas)
+ENTITY_BATCH_SIZE = 500
+
+# Carpeta de archivos CSV con registros rechazados por SQL Server
+REJECT_DIR = Path(os.getenv("SQL_REJECT_DIR", str(Path(__file__).resolve().parent / "rejects")))
+
+
+def insert_attempt(cursor, query, rows, types_in_order, state, use_fast):
+    """
+    Un intento de inserción dentro de la transacción abierta (sin confirmar).
+
+    Descripción:
+        Con state["replace"] = (tabla, índice de hs_object_id) primero elimina
+        las versiones anteriores de las filas del intento, de modo que la
+        eliminación y la inserción se confirman o se revierten juntas y una
+        fila rechazada conserva su versión anterior en la tabla.
+    """
+    if state.get("replace"):
+        table_name, id_index = state["replace"]
+        record_ids = [row[id_index] for row in rows if row[id_index] is not None]
+        # Parámetros del DELETE sin los tamaños fijados para el INSERT
+        cursor.setinputsizes(None)
+        delete_rows_by_id(cursor, table_name, record_ids)
+    executemany_batch(cursor, query, rows, types_in_order, use_fast)
+
+
+def insert_batch_bisecting(cursor, query, rows, types_in_order, state, row_numbers):
+    """
+    Inserta un lote y, si falla, lo divide a la mitad hasta aislar las filas inválidas.
+
+    Descripción:
+        Cada intento exitoso se confirma y cada intento fallido se revierte
+        (junto con la eliminación de versiones anteriores, si la hay), por lo
+        que un lote con una fila inválida cuesta ~2·log2(n) ejecuciones
+        en lugar de n inserciones individuales. Una fila que falla sola se
+        reintenta sin fast_executemany antes de rechazarla: si entra, el
+        problema era el enlace de parámetros y el resto de la carga continúa
+        con executemany clásico.
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        query (str): INSERT parametrizado
+        rows (list): Tuplas de valores
+        types_in_order (list): Tipo SQL de cada columna
+        state (dict): {"use_fast": bool, "rejects": list, "replace": tuple | None} compartido por la carga
+        row_numbers (list): Número (base 1) de cada fila en la carga
+
+    Retorna:
+        int: Filas insertadas
+    """
+    try:
+        insert_attempt(cursor, query, rows, types_in_order, state, state["use_fast"])
+        cursor.connection.commit()
+        return len(rows)
+    except Exception as e:
+        cursor.connection.rollback()
+        error = e
+
+    if len(rows) > 1:
+        middle = len(rows) // 2
+        return (
+            insert_batch_bisecting(cursor, query, rows[:middle], types_in_order, state, row_numbers[:middle])
+            + insert_batch_bisecting(cursor, query, rows[middle:], types_in_order, state, row_numbers[middle:])
+        )
+
+    if state["use_fast"]:
+        try:
+            insert_attempt(cursor, query, rows, types_in_order, state, False)
+            cursor.connection.commit()
+            print("   ⚠️ fast_executemany no pudo enlazar el lote, continuando con executemany clásico")
+            state["use_fast"] = False
+            return 1
+        except Exception as e:
+            cursor.connection.rollback()
+            error = e
+
+    state["rejects"].append((row_numbers[0], rows[0], str(error)))
+    print(f"     ⚠️ Registro {row_numbers[0]} rechazado: {str(error)[:100]}...")
+    return 0
+
+
+def write_reject_file(table_name, columns, rejects):
+    """
+    Guarda los registros rechazados en un CSV junto con el error de SQL Server.
+
+    Parámetros:
+        table_name (str): Tabla destino de la carga
+        columns (list): Columnas en el orden de las filas
+        rejects (list): Tuplas (número de fila, valores, error)
+
+    Retorna:
+        Path | None: Archivo generado, o None si no se pudo escribir
+    """
+    path = REJECT_DIR / f"{table_name}_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    try:
+        REJECT_DIR.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["row_number", "sql_error"] + list(columns))
+            for row_number, values, error in rejects:
+                writer.writerow([row_number, error] + [_format_bulk_value(v) for v in values])
+        return path
+    except OSError as e:
+        print(f"   ⚠️ No se pudo escribir el archivo de rechazados: {str(e)}")
+        return None
+
+
+def fast_executemany_enabled():
+    """
+    True salvo SQL_FAST_EXECUTEMANY=false
+    """
+    return os.getenv("SQL_FAST_EXECUTEMANY", "true").strip().lower() != "false"
+
+
+def build_input_sizes(types_in_order, rows):
+    """
+    Tamaños de parámetro para setinputsizes() de un lote.
+
+    Descripción:
+        Los tipos fijos (BIGINT, DECIMAL, DATETIME2, DATE, BIT) se enlazan con
+        su tipo ODBC exacto. Las columnas de texto se enlazan como NVARCHAR
+        del largo máximo observado en el lote: fast_executemany reserva un
+        buffer de filas × tamaño por columna, por lo que usar el tamaño
+        declarado (4000) en cientos de columnas agotaría la memoria. Un texto
+        de más de 4000 caracteres UTF-16 se enlaza como NVARCHAR(MAX) (tamaño 0).
+
+    Parámetros:
+        types_in_order (list): Tipo SQL de cada columna en el orden del INSERT
+        rows (list): Tuplas de valores del lote
+
+    Retorna:
+        list: Tuplas (tipo ODBC, tamaño, decimales) por columna
+    """
+    sizes = []
+    for index, sql_type in enumerate(types_in_order):
+        fixed = FIXED_INPUT_SIZES.get(sql_type)
+        if fixed:
+            sizes.append(fixed)
+            continue
+
+        longest = max(
+            (len(str(row[index]).encode("utf-16-le")) // 2 for row in rows if row[index] is not None),
+            default=1,
+        )
+        sizes.append((pyodbc.SQL_WVARCHAR, 0 if longest > MAX_BOUND_TEXT_LENGTH else max(longest, 1), 0))
+    return sizes
+
+
+def executemany_batch(cursor, query, rows, types_in_order, use_fast):
+    """
+    Ejecuta un lote de INSERT con arreglos de parámetros o con executemany clásico.
+
+    Descripción:
+        Con use_fast=True activa fast_executemany de pyodbc y fija tamaños
+        explícitos de parámetros: el lote completo viaja en un solo round
+        trip en lugar de una ida y vuelta por fila. Con use_fast=False
+        restablece el cursor al comportamiento original.
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        query (str): INSERT parametrizado
+        rows (list): Tuplas de valores del lote
+        types_in_order (list): Tipo SQL de cada columna en el orden del INSERT
+        use_fast (bool): Usar fast_executemany + setinputsizes
+    """
+    if use_fast:
+        cursor.fast_executemany = True
+        cursor.setinputsizes(build_input_sizes(types_in_order, rows))
+    else:
+        cursor.fast_executemany = False
+        cursor.setinputsizes(None)
+    cursor.executemany(query, rows)
+
+
+def insert_entity_batches(
+    cursor, table_name, batches, columns, entity_type, column_types=None,
+    total_records=None, replace_existing=False, first_row=1, state=None
+):
+    """
+    Inserta lotes de entidades con executemany, bisección de errores y archivo de rechazados.
+
+    Descripción:
+        Recibe cualquier iterable de lotes (lista troceada o páginas que
+        llegan desde HubSpot en streaming) y los inserta a medida que se
+        consumen; la memoria usada no depende del total de registros.
+
+    Parámetros:
+        cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
+        table_name (str): Tabla destino
+        batches (iterable): Lotes (listas) de diccionarios de propiedades
+        columns (list): Columnas en el orden del INSERT
+        entity_type (str): Tipo de entidad para transformaciones específicas
+        column_types (dict): Tipo SQL por columna (opcional)
+        total_records (int): Total esperado para el progreso (None si se desconoce)
+        replace_existing (bool): Eliminar las versiones anteriores (por
+            hs_object_id) de cada lote en la misma transacción que su inserción
+            (carga incremental)
+        first_row (int): Número de la primera fila (para el archivo de rechazados)
+        state (dict): Estado de la carga (new_load_state()) con rechazos previos
+            de un sink alternativo; None crea uno nuevo
+
+    Retorna:
+        int: Registros insertados
+    """
+    # SEGURIDAD: Sanitizar nombre de tabla y columnas
+    try:
+        sanitized_table = sanitize_sql_identifier(table_name)
+        sanitized_columns = sanitize_sql_identifiers(columns)
+    except Exception as e:
+        raise ValueError(f"Error de seguridad en nombres SQL: {str(e)}")
+
+    placeholders = ", ".join(["?" for _ in sanitized_columns])
+    columns_str = ", ".join([f"[{col}]" for col in sanitized_columns])
+    query = f"INSERT INTO [{sanitized_table}] ({columns_str}) VALUES ({placeholders})"
+    types_in_order = [(column_types or {}).get(col, SQL_TEXT_LEGACY) for col in columns]
+
+    state = state or new_load_state()
+    if replace_existing:
+        state["replace"] = (sanitized_table, sanitized_columns.index("hs_object_id"))
+    records_seen = 0
+    records_processed = 0
+
+    for batch_num, batch in enumerate(batches, 1):
+        # Procesar cada entidad en el lote (filas no convertibles → rechazadas)
+        rejected_before = len(state["rejects"])
+        batch_values, row_numbers, _ = build_entity_rows(
+            batch, columns, types_in_order, entity_type, state, first_row + records_seen
+        )
+
+        # Ejecutar inserción del lote completo (bisección si falla)
+        inserted = 0
+        if batch_values:
+            inserted = insert_batch_bisecting(cursor, query, batch_values, types_in_order, state, row_numbers)
+        records_seen += len(batch)
+        records_processed += inserted
+
+        # Progress tracking detallado
+        rejected = len(state["rejects"]) - rejected_before
+        detail = f" | ❌ {rejected} rechazados" if rejected else ""
+        if total_records:
+            total_batches = (total_records + ENTITY_BATCH_SIZE - 1) // ENTITY_BATCH_SIZE
+            progress_pct = (records_seen / total_records) * 100
+            print(
+                f"   ✅ Lote {batch_num}/{total_batches}: {inserted} registros{detail} | "
+                f"Total: {records_processed:,}/{total_records:,} ({progress_pct:.1f}%)"
+            )
+        else:
+            print(f"   ✅ Lote {batch_num}: {inserted} registros{detail} | Total: {records_processed:,}")
+
+    report_rejects(table_name, sanitized_columns, state)
+    return records_processed
+
+
+def insert_entities_data(cursor, table_name, entities_data, columns, entity_type, column_types=None, state=None):
+    """
+    Inserta datos de entidades HubSpot con procesamiento optimizado por lotes grandes.
+
+    Descripción:
+        Función especializada para insertar datos de entidades (deals, tickets, contacts)
+        con lógica específica de transformación según el tipo de entidad.
+        OPTIMIZADA: Usa lotes de 500 registros para máxima eficiencia con grandes volúmenes.
 
     Parámetros:
         cursor (pyodbc.Cursor): Cursor activo de conexión SQL Server
@@ -621,21 +2426,40 @@ def insert_entities_data(cursor, table_name, entities_data, columns, entity_type
         entities_data (list): Lista de diccionarios con propiedades de entidades
         columns (list): Lista ordenada de nombres de columnas
         entity_type (str): Tipo de entidad para aplicar transformaciones específicas
+        column_types (dict): Tipo SQL por columna; los valores se convierten una
+            sola vez en Python (Decimal, datetime, date, bool) con convert_value()
+        state (dict): Estado de la carga (new_load_state()); el llamador lo pasa
+            para consultar los rechazados después. None crea uno nuevo
 
     Transformaciones Específicas:
         - tickets: Convierte timestamps de milisegundos a segundos en campos "*time*"
+          (excepto columnas DATETIME2/DATE, que reciben la fecha convertida)
         - deals/contacts: Inserción directa sin transformaciones especiales
 
+    Sinks de Carga (get_load_sink()):
+        - executemany (default): lotes de 500 con fast_executemany (flujo siguiente)
+        - tvp: bloques enviados como table-valued parameter (insert_rows_tvp())
+        - bulk_file: archivo delimitado + BULK INSERT con TABLOCK (insert_rows_bulk_file())
+        Si un sink alternativo falla, las filas pendientes se cargan con executemany.
+
     Flujo de Inserción:
         1. Construcción dinámica de query INSERT con placeholders
         2. Procesamiento por lotes de 500 registros (optimizado para 262 columnas)
         3. Extracción y transformación de valores según tipo
-        4. Ejecución de INSERT por lotes usando executemany() optimizado
-        5. Commits intermedios cada 1000 registros para liberar memoria
+        4. Ejecución de INSERT por lotes con fast_executemany + setinputsizes
+           (un round trip por lote; ver executemany_batch())
+        5. Commit por lote (el llamador confirma antes la tabla sombra o
+           staging creada); un lote fallido se divide a la mitad hasta aislar
+           las filas inválidas (insert_batch_bisecting())
+        6. Filas rechazadas → CSV en SQL_REJECT_DIR con el error de SQL Server
+        (pasos 2-6 en insert_entity_batches(), compartido con la carga en streaming)
 
     Manejo de Valores:
         - None: Se mantiene como NULL en SQL
-        - Otros: Se convierten a string para compatibilidad NVARCHAR(MAX)
+        - Columnas tipadas: valor convertido; una fila con un valor no
+          convertible se rechaza (archivo de rechazados + conteo por columna)
+        - Texto: Se sanitiza como string (máx. 4000 caracteres; en columnas
+          NVARCHAR(n), 4000 unidades UTF-16)
 
     Performance:
         Optimizada específicamente para 5000+ registros con 262 columnas (1.3M+ valores)
@@ -647,85 +2471,51 @@ def insert_entities_data(cursor, table_name, entities_data, columns, entity_type
     except Exception as e:
         raise ValueError(f"Error de seguridad en nombres SQL: {str(e)}")
 
-    # Construir query de inserción con placeholders seguros
-    placeholders = ", ".join(["?" for _ in sanitized_columns])
-    columns_str = ", ".join([f"[{col}]" for col in sanitized_columns])
-    query = f"INSERT INTO [{sanitized_table}] ({columns_str}) VALUES ({placeholders})"
+    # Tipo SQL por columna en el orden del INSERT (NVARCHAR(MAX) sin tipado)
+    types_in_order = [(column_types or {}).get(col, SQL_TEXT_LEGACY) for col in columns]
+
+    sink = get_load_sink(table_name)
+    started = time.perf_counter()
+    preloaded = 0  # Filas ya cargadas por un sink alternativo antes de un error
+    state = state or new_load_state()
+    first_row = 1
+
+    if sink != SINK_EXECUTEMANY:
+        print(f"   🚚 Sink de carga: {sink}")
+        rows, row_numbers, kept = build_entity_rows(entities_data, columns, types_in_order, entity_type, state, 1)
+        loaded = 0
+        try:
+            for count in SINK_LOADERS[sink](cursor, sanitized_table, sanitized_columns, types_in_order, rows):
+                loaded += count
+                print(f"   ✅ {loaded:,}/{len(rows):,} registros cargados con {sink}")
+            record_load_timing(table_name, sink, loaded, time.perf_counter() - started)
+            report_rejects(table_name, sanitized_columns, state)
+            print(f"   🎉 Inserción completada: {loaded:,} registros procesados exitosamente")
+            return
+        except Exception as e:
+            print(f"   ❌ Error en sink {sink}: {str(e)[:200]}")
+            print(f"   🔄 Continuando con executemany desde el registro {loaded + 1:,}")
+            # Solo filas convertibles: las rechazadas ya están en state
+            entities_data = kept[loaded:]
+            first_row = row_numbers[loaded] if loaded < len(row_numbers) else len(row_numbers) + 1
+            preloaded = loaded
+            sink = f"{sink}+{SINK_EXECUTEMANY}"
 
     # Configuración optimizada para grandes volúmenes
-    batch_size = 500  # Aumentado para mejor throughput con muchas columnas
-    commit_interval = 1000  # Commit cada 1000 registros para liberar memoria
+    batch_size = ENTITY_BATCH_SIZE
     total_records = len(entities_data)
     total_batches = (total_records + batch_size - 1) // batch_size
-    records_processed = 0
 
     print(f"   📦 Procesando {total_records:,} registros en {total_batches} lotes de {batch_size}")
     print(f"   📊 Total de valores a insertar: {total_records * len(columns):,}")
 
-    for i in range(0, total_records, batch_size):
-        batch = entities_data[i : i + batch_size]
-        batch_values = []
-
-        # Procesar cada entidad en el lote
-        for props in batch:
-            values = []
-            for col in columns:
-                val = props.get(col)
-
-                # Aplicar transformaciones específicas por tipo de entidad
-                if entity_type == "tickets" and val and "time" in col and str(val).isdigit():
-                    try:
-                        # Convertir timestamps de HubSpot (milisegundos) a segundos
-                        val = int(val) / 1000
-                    except (ValueError, TypeError):
-                        # Mantener valor original si la conversión falla
-                        pass
-
-                # SEGURIDAD: Sanitizar valor antes de inserción SQL
-                if val is not None:
-                    sanitized_val = sanitize_string(val, max_length=4000)  # NVARCHAR(MAX) pero limitamos para seguridad
-                    values.append(sanitized_val)
-                else:
-                    values.append(None)
-
-            batch_values.append(tuple(values))
-
-        # Ejecutar inserción del lote completo
-        try:
-            cursor.executemany(query, batch_values)
-            records_processed += len(batch)
-
-            # Progress tracking detallado
-            batch_num = i // batch_size + 1
-            progress_pct = (records_processed / total_records) * 100
-            print(
-                f"   ✅ Lote {batch_num}/{total_batches}: {len(batch)} registros | "
-                f"Total: {records_processed:,}/{total_records:,} ({progress_pct:.1f}%)"
-            )
-
-            # Commit intermedio para liberar memoria y locks
-            if records_processed % commit_interval == 0:
-                cursor.connection.commit()
-                print(f"   💾 Commit intermedio en {records_processed:,} registros")
+    batches = (entities_data[i : i + batch_size] for i in range(0, total_records, batch_size))
+    records_processed = insert_entity_batches(
+        cursor, table_name, batches, columns, entity_type, column_types,
+        total_records=total_records, first_row=first_row, state=state
+    )
 
-        except Exception as e:
-            print(f"   ❌ Error en lote {batch_num}: {str(e)}")
-            print("   🔄 Intentando inserción individual para el lote...")
-
-            # Fallback: inserción individual para este lote
-            individual_success = 0
-            for j, values in enumerate(batch_values):
-                try:
-                    cursor.execute(query, values)
-                    individual_success += 1
-                except Exception as individual_error:
-                    print(f"     ⚠️ Error en registro {i + j + 1}: {str(individual_error)[:100]}...")
-
-            records_processed += individual_success
-            print(f"   ✅ Lote {batch_num} completado individualmente: {individual_success}/{len(batch)} registros")
-
-    # Commit final
-    cursor.connection.commit()
+    record_load_timing(table_name, sink, preloaded + records_processed, time.perf_counter() - started)
     print(f"   🎉 Inserción completada: {records_processed:,} registros procesados exitosamente")
 
 
@@ -752,7 +2542,8 @@ def insert_table_data(cursor, table_name, table_data, columns):
         1. Construcción de query INSERT con placeholders
         2. Procesamiento por lotes de 200 registros
         3. Extracción directa de valores según columnas
-        4. Ejecución de INSERT por lotes usando executemany()
+        4. Ejecución de INSERT por lotes con fast_executemany; si pyodbc no
+           puede enlazar el lote así, se repite con executemany() clásico
 
     Origen de Datos:
         - fetch_owners_as_table()
@@ -777,6 +2568,20 @@ def insert_table_data(cursor, table_name, table_data, columns):
     batch_size = 200  # Tamaño apropiado para datos estructurados
     total_records = len(table_data)
     total_batches = (total_records + batch_size - 1) // batch_size
+    types_in_order = [SQL_TEXT_LEGACY] * len(columns)
+    use_fast = fast_executemany_enabled()
+
+    def insert_batch(batch_values):
+        nonlocal use_fast
+        try:
+            executemany_batch(cursor, query, batch_values, types_in_order, use_fast)
+        except pyodbc.Error as e:
+            if not use_fast:
+                raise
+            # Un fallo de datos se repite en modo clásico y aborta la carga en la tabla sombra
+            print(f"   ⚠️ fast_executemany no disponible ({str(e)[:100]}), usando executemany clásico")
+            use_fast = False
+            executemany_batch(cursor, query, batch_values, types_in_order, use_fast)
 
     if total_records <= batch_size:
         # Dataset pequeño - inserción directa
@@ -785,7 +2590,7 @@ def insert_table_data(cursor, table_name, table_data, columns):
             values = [str(row.get(col)) if row.get(col) is not None else None for col in columns]
             batch_values.append(tuple(values))
 
-        cursor.executemany(query, batch_values)
+        insert_batch(batch_values)
         print(f"   ✅ {total_records} registros insertados en lote único")
     else:
         # Dataset grande - inserción por lotes
@@ -799,7 +2604,7 @@ def insert_table_data(cursor, table_name, table_data, columns):
                 values = [str(row.get(col)) if row.get(col) is not None else None for col in columns]
                 batch_values.append(tuple(values))
 
-            cursor.executemany(query, batch_values)
+            insert_batch(batch_values)
             batch_num = i // batch_size + 1
             progress_pct = ((i + len(batch)) / total_records) * 100
             print(f"   ✅ Lote {batch_num}/{total_batches}: {len(batch)} registros ({progress_pct:.1f}%)")
@@ -831,51 +2636,47 @@ def sync_entities_manual(entities, table_name, entity_type):
     Flujo de Recuperación:
         1. Re-análisis de propiedades disponibles
         2. Nueva conexión a base de datos
-        3. Recreación de tabla
+        3. Carga en tabla sombra e intercambio atómico
         4. Inserción con manejo de errores más robusto
 
     Robustez:
         - Manejo de excepciones más granular
         - Validaciones adicionales de datos
         - Logs detallados para debugging
+
+    Retorna:
+        bool: True si la recuperación manual terminó correctamente
     """
     if not entities:
-        return
+        return True
 
     try:
         print(f"🔧 Iniciando sincronización manual para {entity_type}...")
 
         # Re-analizar propiedades disponibles
-        all_properties = set()
-        entities_data = []
-
-        for entity in entities:
-            props = entity.get("properties", {})
-            entities_data.append(props)
-            all_properties.update(props.keys())
-
-        columns = list(all_properties)
+        entities_data, found_columns = collect_entities_data(entities)
+        columns = resolve_entity_columns(entity_type, found_columns, found_columns)
 
         # Establecer nueva conexión para el fallback
         conn = get_sql_connection()
         cursor = conn.cursor()
 
-        # Recrear tabla completamente
-        if table_exists(cursor, table_name):
-            drop_table(cursor, table_name)
-
-        create_table(cursor, table_name, columns)
+        # Cargar en tabla sombra y publicar con intercambio atómico
+        column_types = get_entity_column_types(entity_type, columns)
+        shadow_table = prepare_shadow_table(cursor, table_name, columns, column_types)
+        conn.commit()
         # Usar función de inserción estándar para entidades
-        insert_entities_data(cursor, table_name, entities_data, columns, entity_type)
+        insert_entities_data(cursor, shadow_table, entities_data, columns, entity_type, column_types)
 
-        # Confirmar y cerrar
-        conn.commit()
+        swap_in_shadow_table(cursor, table_name)
         cursor.close()
         conn.close()
         print(f"✅ Sincronización manual completa para '{table_name}'.")
+        return True
 
     except Exception as e:
         print(f"❌ Error en sincronización manual: {str(e)}")
+        return False
 
 
 # ==================== 🏁 PUNTO DE ENTRADA DEL PROGRAMA ====================